@@ -1,111 +1,400 @@
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session
 from roster_manager import RosterManager, RosterValidationError
+from league_registry import LeagueError, LeagueRegistry
 from data_import.playoff_roster_generator import PlayoffRosterGenerator
+from response_cache import CachedFragment, CachedResponse, ResponseCache, make_etag, placeholder
+from roster_serialization import DEFAULT_LEAGUE, join_payloads
+from roster_export import ExportError, export_filename, export_mimetype, export_rosters
+from event_hub import EventHub
+from scoring import LiveScores, ScoringError
+from player_search import PlayerSearchIndex
+from profiling import RequestProfiler, phase
+from logging_setup import configure_logging
 from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, Optional
+import hmac
 import os
+import threading
+import time
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev')
+# Server-Timing on every response; profiles per PROFILE_SAMPLE_RATE or a signed X-Profile-Token
+profiler = RequestProfiler.from_env(app)
 
-roster_manager = RosterManager()
-playoff_generator = PlayoffRosterGenerator()
+# Stored rosters never change, so shared CDNs can hold them for a long time
+ROSTER_CACHE_CONTROL = 'public, max-age=3600, s-maxage=86400'
+ROSTER_PAGE_CACHE_CONTROL = 'public, max-age=60'
+
+DATA_DIR = os.environ.get('DATA_DIR', 'data')
+
+_manager_options = {
+    'allow_duplicate_lineups': os.environ.get('ALLOW_DUPLICATE_LINEUPS', '1') == '1',
+    'league_format': os.environ.get('LEAGUE_FORMAT', 'standard'),
+    'scoring': os.environ.get('SCORING_SETTINGS', 'standard')
+}
+# Other leagues load on first request and are dropped after this long idle
+leagues = LeagueRegistry(
+    DATA_DIR,
+    idle_timeout=float(os.environ.get('LEAGUE_IDLE_SECONDS', 900)),
+    **_manager_options
+)
+roster_manager = RosterManager(
+    DATA_DIR,
+    catalog=leagues.catalog,
+    seasons=leagues.seasons,
+    **_manager_options
+)
+playoff_generator = PlayoffRosterGenerator(DATA_DIR)
+response_cache = ResponseCache(max_entries=int(os.environ.get('ROSTER_CACHE_SIZE', 4096)))
+fragment_cache = ResponseCache(max_entries=int(os.environ.get('FRAGMENT_CACHE_SIZE', 1024)))
+event_hub = EventHub(tick=float(os.environ.get('STREAM_TICK_SECONDS', 1.0)))
+
+def _league_manager(league_id: Optional[str] = None) -> RosterManager:
+    """Get the roster manager of the requested league (?league=), the default one if unset"""
+    league_id = league_id or request.args.get('league')
+    if not league_id or league_id == DEFAULT_LEAGUE:
+        return roster_manager
+    return leagues.get(league_id)
+
+@app.errorhandler(LeagueError)
+def league_not_found(e):
+    return jsonify({'error': str(e)}), 404
+
+def _roster_json_entry(manager: RosterManager, roster_id: str) -> Optional[CachedResponse]:
+    """Get the serialized API body and ETag for a roster, building it on a cache miss"""
+    # Stored rosters embed their players as submitted, so catalog updates never stale them
+    key = ('json', manager.league_id, roster_id)
+    entry = response_cache.get(key)
+    if entry is not None:
+        return entry
+
+    with phase('storage'):
+        payload = manager.get_roster_payload(roster_id)
+    if payload is None:
+        return None
+
+    entry = CachedResponse(etag=make_etag(payload), body=payload)
+    response_cache.set(key, entry)
+    return entry
+
+def _roster_page_etag(manager: RosterManager, roster_id: str) -> Optional[str]:
+    """Get the ETag for a rendered roster page
+
+    The page footer carries a per-request timestamp, so the tag is weak: the
+    roster content is identical even when the bytes are not.
+    """
+    key = ('page', manager.league_id, roster_id)
+    entry = response_cache.get(key)
+    if entry is None:
+        payload = manager.get_roster_payload(roster_id)
+        if payload is None:
+            return None
+        entry = CachedResponse(etag=make_etag(payload))
+        response_cache.set(key, entry)
+    return entry.etag
+
+# Only the current season and the odd historical lookup need an index
+search_indexes = ResponseCache(max_entries=2)
+_search_index_lock = threading.Lock()
+
+def _patched_search_index(season: int, catalog, version: str) -> Optional[PlayerSearchIndex]:
+    """Update a cached index of an earlier catalog version with the logged changes"""
+    if season != roster_manager.season:
+        return None
+    player_ids = []
+    target = version
+    for change in reversed(roster_manager.change_log.entries()):
+        if change.to_version != target:
+            continue
+        player_ids.extend(change.player_ids)
+        previous = search_indexes.get((season, change.from_version))
+        if previous is not None:
+            return previous.with_changes(catalog, player_ids, version)
+        target = change.from_version
+    return None
+
+def _get_search_index(season: int) -> PlayerSearchIndex:
+    """Get a season's player search index, built once per catalog version
+
+    A new catalog version patches the previous index when the change log
+    links the two, instead of indexing every player again.
+    """
+    catalog = roster_manager.catalog_for(season)
+    key = (season, roster_manager.catalog_version_for(season))
+    index = search_indexes.get(key)
+    if index is None:
+        with _search_index_lock:
+            index = search_indexes.get(key)
+            if index is None:
+                index = _patched_search_index(season, catalog, key[1])
+                if index is None:
+                    index = PlayerSearchIndex(catalog, key[1])
+                search_indexes.set(key, index)
+    return index
+
+def _last_updated() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+def _render_cached(key, template: str, build_context: Callable[[], Optional[Dict]]) -> Optional[str]:
+    """Render a template once per key, filling in last_updated per request
+
+    build_context is only called on a cache miss and may return None when
+    there is nothing to render. Keys include the catalog version, so
+    publishing a new catalog makes the old fragments unreachable and the LRU
+    evicts them.
+    """
+    fragment = fragment_cache.get(key)
+    if fragment is None:
+        context = build_context()
+        if context is None:
+            return None
+        with phase('render'):
+            html = render_template(template, last_updated=placeholder('last_updated'), **context)
+        fragment = CachedFragment.from_rendered(html)
+        fragment_cache.set(key, fragment)
+    return fragment.fill(last_updated=_last_updated())
+
+def _not_modified(etag: str, weak: bool = False) -> bool:
+    """Check the request's If-None-Match header against an ETag"""
+    if weak:
+        return request.if_none_match.contains_weak(etag)
+    return request.if_none_match.contains(etag)
+
+def _cacheable_response(response, etag: str, cache_control: str, weak: bool = False):
+    response.set_etag(etag, weak=weak)
+    response.headers['Cache-Control'] = cache_control
+    return response
 
 @app.route('/')
 def home():
-    return render_template('base.html', last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    return render_template('base.html', last_updated=_last_updated())
 
 @app.route('/create-roster')
 def create_roster():
-    # Get available players from the playoff generator
-    players_df = playoff_generator.generate_playoff_rosters()
-    
-    # Convert DataFrame to list of dictionaries
-    players = players_df.to_dict('records')
-    
-    return render_template(
+    # Get available players from the catalog published by the pipeline
+    manager = _league_manager()
+    if not manager.players_file.exists():
+        playoff_generator.run_full_update()
+    with phase('catalog'):
+        catalog = manager.load_catalog()
+    return _render_cached(
+        ('create_roster', manager.format.name, manager.season, manager.catalog_version),
         'create_roster.html',
-        players=players,
-        last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        lambda: {
+            'players': list(catalog),
+            'season': manager.season,
+            'league_format': manager.format
+        }
     )
 
 @app.route('/api/rosters', methods=['GET'])
 def get_all_rosters():
-    """Get all rosters with their players"""
+    """Get all rosters of a league with their players"""
+    manager = _league_manager()
     try:
-        # Get all rosters from the data directory
-        rosters = []
-        for roster_file in roster_manager.rosters_dir.glob("*.json"):
-            roster = roster_manager.get_roster(roster_file.stem)
-            if roster:
-                rosters.append({
-                    'id': roster.id,
-                    'user_id': roster.user_id,
-                    'team_id': roster.user_id,  # You might want to add a separate team_id field
-                    'created_at': roster.created_at.isoformat(),
-                    'players': {
-                        'qb': roster_manager._player_to_dict(roster.qb),
-                        'rb1': roster_manager._player_to_dict(roster.rb1),
-                        'rb2': roster_manager._player_to_dict(roster.rb2),
-                        'wr1': roster_manager._player_to_dict(roster.wr1),
-                        'wr2': roster_manager._player_to_dict(roster.wr2),
-                        'wr3': roster_manager._player_to_dict(roster.wr3),
-                        'te': roster_manager._player_to_dict(roster.te),
-                        'superflex': roster_manager._player_to_dict(roster.superflex),
-                        'flex': roster_manager._player_to_dict(roster.flex),
-                        'kicker': roster_manager._player_to_dict(roster.kicker),
-                        'defense': roster_manager._player_to_dict(roster.defense)
-                    }
-                })
-        
-        return jsonify(rosters)
+        with phase('storage'):
+            payloads = list(manager.iter_roster_payloads())
+        with phase('serialize'):
+            body = join_payloads(payloads)
+        return app.response_class(body, mimetype='application/json')
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/export/rosters', methods=['GET'])
+def export_all_rosters():
+    """Download every roster of a league, one flattened row per roster
+
+    Query parameters: format (csv, ndjson or parquet; csv by default),
+    season, and gzip=0 to send CSV or NDJSON uncompressed. The body is
+    streamed as it is encoded, so large leagues never sit in memory.
+    """
+    manager = _league_manager()
+    fmt = request.args.get('format', 'csv')
+    compress = request.args.get('gzip', '1') != '0'
+    try:
+        body = export_rosters(manager, fmt, season=request.args.get('season', type=int), compress=compress)
+    except ExportError as e:
+        return jsonify({'error': str(e)}), 400
+    filename = export_filename(manager.league_id, fmt, compress)
+    return Response(
+        body,
+        mimetype=export_mimetype(fmt, compress),
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'Cache-Control': 'no-store',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
 @app.route('/api/roster/<roster_id>', methods=['GET'])
 def get_single_roster(roster_id):
     """Get a single roster by ID"""
+    manager = _league_manager()
     try:
-        roster = roster_manager.get_roster(roster_id)
-        if not roster:
+        entry = _roster_json_entry(manager, roster_id)
+        if entry is None:
             return jsonify({'error': 'Roster not found'}), 404
 
-        return jsonify({
-            'id': roster.id,
-            'user_id': roster.user_id,
-            'team_id': roster.user_id,
-            'created_at': roster.created_at.isoformat(),
-            'players': {
-                'qb': roster_manager._player_to_dict(roster.qb),
-                'rb1': roster_manager._player_to_dict(roster.rb1),
-                'rb2': roster_manager._player_to_dict(roster.rb2),
-                'wr1': roster_manager._player_to_dict(roster.wr1),
-                'wr2': roster_manager._player_to_dict(roster.wr2),
-                'wr3': roster_manager._player_to_dict(roster.wr3),
-                'te': roster_manager._player_to_dict(roster.te),
-                'superflex': roster_manager._player_to_dict(roster.superflex),
-                'flex': roster_manager._player_to_dict(roster.flex),
-                'kicker': roster_manager._player_to_dict(roster.kicker),
-                'defense': roster_manager._player_to_dict(roster.defense)
-            }
-        })
+        if _not_modified(entry.etag):
+            response = app.response_class(status=304)
+        else:
+            response = app.response_class(entry.body, mimetype='application/json')
+        return _cacheable_response(response, entry.etag, ROSTER_CACHE_CONTROL)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/players/search', methods=['GET'])
+def search_players():
+    """Autocomplete players by name
+
+    Query parameters: q, position (a position or a slot of the league's
+    format, e.g. FLEX or flex2), team, exclude_teams (comma separated),
+    limit, season (the current season by default) and league.
+    """
+    start = time.perf_counter()
+    try:
+        limit = min(int(request.args.get('limit', 20)), 100)
+        season = int(request.args.get('season', roster_manager.season))
+    except ValueError:
+        return jsonify({'error': 'limit and season must be integers'}), 400
+
+    index = _get_search_index(season)
+    exclude_teams = [t for t in request.args.get('exclude_teams', '').split(',') if t]
+    results = index.search(
+        request.args.get('q', ''),
+        position=request.args.get('position'),
+        team=request.args.get('team'),
+        exclude_teams=exclude_teams,
+        limit=limit,
+        league_format=_league_manager().format
+    )
+    return jsonify({
+        'results': [
+            {
+                'id': player.id,
+                'name': player.name,
+                'position': player.position,
+                'team': player.team,
+                'projected_points': player.projected_points,
+                'score': round(score, 3)
+            }
+            for player, score in results
+        ],
+        'season': season,
+        'catalog_version': index.version,
+        'took_ms': round((time.perf_counter() - start) * 1000, 3)
+    })
+
+@app.route('/api/roster/options', methods=['POST'])
+def get_roster_options():
+    """List, for every open slot of a partial roster, the players that keep it completable
+
+    The body has the same shape as /api/submit-roster with empty values for
+    slots not picked yet.
+    """
+    manager = _league_manager()
+    try:
+        return jsonify(manager.roster_options(request.json or {}))
+    except RosterValidationError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/analytics/ownership', methods=['GET'])
+def get_ownership():
+    """Get player, team and QB/SUPERFLEX ownership across a league's rosters"""
+    return jsonify(_league_manager().ownership.snapshot())
+
+@app.route('/api/stream', methods=['GET'])
+def stream_updates():
+    """Push score changes and rank moves over Server-Sent Events
+
+    Updates are for one league, ?league= or the default one. Pass
+    ?rosters=id1,id2 to receive updates for those rosters only.
+    """
+    league_id = request.args.get('league') or DEFAULT_LEAGUE
+    if not leagues.exists(league_id):
+        raise LeagueError(f'Unknown league: {league_id}')
+    roster_ids = [r for r in request.args.get('rosters', '').split(',') if r]
+    subscription = event_hub.subscribe(roster_ids or None, league_id=league_id)
+    return Response(
+        event_hub.stream(subscription),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+# Stat feeds post here; when set, updates must carry this key in X-Stats-Key
+STATS_API_KEY = os.environ.get('STATS_API_KEY') or None
+_live_scores: Dict[str, LiveScores] = {}
+_live_scores_lock = threading.Lock()
+
+def _league_live_scores(manager: RosterManager) -> LiveScores:
+    with _live_scores_lock:
+        live = _live_scores.get(manager.league_id)
+        if live is None or live.manager is not manager:
+            # A league reloaded after eviction keeps the week's stats
+            previous = live
+            live = _live_scores[manager.league_id] = LiveScores(
+                manager, partial(event_hub.publish_scores, league_id=manager.league_id)
+            )
+            if previous is not None:
+                live.stats = previous.stats
+        return live
+
+@app.route('/api/stats', methods=['POST'])
+def post_stats():
+    """Apply live stats or stat corrections and push the changed roster scores
+
+    The body is {"stats": [{"player_id": ..., <category>: value, ...}]};
+    each record replaces the categories it names. Changed totals and rank
+    moves reach /api/stream subscribers on the next tick.
+    """
+    if not STATS_API_KEY:
+        return jsonify({'error': 'Stats posts are disabled; set STATS_API_KEY'}), 403
+    if not hmac.compare_digest(request.headers.get('X-Stats-Key', ''), STATS_API_KEY):
+        return jsonify({'error': 'Invalid stats key'}), 403
+    records = (request.get_json(silent=True) or {}).get('stats')
+    if not isinstance(records, list) or not all(
+        isinstance(record, dict) and isinstance(record.get('player_id'), str) for record in records
+    ):
+        return jsonify({'error': 'Expected {"stats": [{"player_id": ..., ...}]}'}), 400
+    manager = _league_manager()
+    try:
+        changed = _league_live_scores(manager).update(records)
+    except ScoringError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'league_id': manager.league_id, 'changed': len(changed)})
+
 @app.route('/api/submit-roster', methods=['POST'])
 def submit_roster():
     try:
         # Get user ID from session (in production, this would come from authentication)
         user_id = session.get('user_id', 'test_user')
         
-        # Create roster
-        roster = roster_manager.create_roster(user_id, request.json)
+        # Create roster in the league named by ?league= or the body's league_id
+        roster_data = dict(request.json)
+        manager = _league_manager(roster_data.pop('league_id', None))
+        roster = manager.create_roster(user_id, roster_data)
+        event_hub.publish('roster_created', {'roster_id': roster.id}, roster_id=roster.id,
+                          league_id=manager.league_id)
+        live = _live_scores.get(manager.league_id)
+        if live is not None:
+            live.invalidate()
         
         return jsonify({
             'success': True,
-            'roster_id': roster.id
+            'roster_id': roster.id,
+            'league_id': roster.league_id,
+            'identical_lineups': manager.lineups.count(manager.lineup_hash(roster))
         })
         
+    except LeagueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 404
+
     except RosterValidationError as e:
         return jsonify({
             'success': False,
@@ -120,15 +409,30 @@ def submit_roster():
 
 @app.route('/roster/<roster_id>')
 def view_roster(roster_id):
-    roster = roster_manager.get_roster(roster_id)
-    if not roster:
+    manager = _league_manager()
+    etag = _roster_page_etag(manager, roster_id)
+    if etag is None:
         return 'Roster not found', 404
-    
-    return render_template(
+
+    if _not_modified(etag, weak=True):
+        response = app.response_class(status=304)
+        return _cacheable_response(response, etag, ROSTER_PAGE_CACHE_CONTROL, weak=True)
+
+    def build_context():
+        roster = manager.get_roster(roster_id)
+        return {'roster': roster} if roster else None
+
+    html = _render_cached(
+        ('view_roster', manager.league_id, roster_id),
         'view_roster.html',
-        roster=roster,
-        last_updated=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        build_context
     )
+    if html is None:
+        return 'Roster not found', 404
+
+    response = app.make_response(html)
+    return _cacheable_response(response, etag, ROSTER_PAGE_CACHE_CONTROL, weak=True)
 
 if __name__ == '__main__':
+    configure_logging()
     app.run(debug=True)
\ No newline at end of file
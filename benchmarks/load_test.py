@@ -0,0 +1,327 @@
+"""End-to-end load test for the Flask endpoints.
+
+Seeds a throwaway data directory, starts the app in a separate process and
+drives each endpoint with a pool of concurrent clients, reporting throughput
+and latency percentiles. Results are written as JSON so runs on different
+commits can be compared:
+
+    python -m benchmarks.load_test --rosters 5000 --concurrency 32
+    python -m benchmarks.load_test --baseline benchmarks/results/main.json
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / 'benchmarks' / 'results'
+
+TEAM_CODES = [
+    'BAL', 'BUF', 'KC', 'HOU', 'CLE', 'MIA', 'PIT',
+    'SF', 'DAL', 'DET', 'TB', 'PHI', 'LAR', 'GB'
+]
+# Every team gets one of each position first, then depth in this order
+BASE_POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'K', 'DEF']
+DEPTH_POSITIONS = ['WR', 'RB', 'QB', 'TE', 'WR', 'RB', 'WR']
+
+SLOT_ELIGIBILITY = [
+    ('qb', ('QB',)), ('rb1', ('RB',)), ('rb2', ('RB',)),
+    ('wr1', ('WR',)), ('wr2', ('WR',)), ('wr3', ('WR',)), ('te', ('TE',)),
+    ('superflex', ('QB', 'RB', 'WR', 'TE')), ('flex', ('RB', 'WR', 'TE')),
+    ('kicker', ('K',)), ('defense', ('DEF',))
+]
+
+ENDPOINTS = ['submit_roster', 'get_roster', 'get_rosters', 'create_roster']
+
+def generate_players(n_players: int, teams: Sequence[str] = TEAM_CODES) -> Dict[str, Dict]:
+    """Build an init_db-style players dict spread evenly across teams"""
+    players = {}
+    per_team = max(len(BASE_POSITIONS), -(-n_players // len(teams)))
+    for team in teams:
+        for i in range(per_team):
+            if i < len(BASE_POSITIONS):
+                position = BASE_POSITIONS[i]
+            else:
+                position = DEPTH_POSITIONS[i % len(DEPTH_POSITIONS)]
+            player_id = f'{team}_{position}{i}'
+            players[player_id] = {
+                'id': player_id,
+                'name': f'{position} {i} {team}',
+                'position': position,
+                'team': team,
+                'projected_points': round(5 + (i * 7) % 20, 1)
+            }
+    return players
+
+def random_roster(players: Dict[str, Dict], rng: random.Random) -> Dict[str, str]:
+    """Pick a valid roster: eligible positions and one player per team"""
+    by_team_position = {}
+    for player in players.values():
+        by_team_position.setdefault((player['team'], player['position']), []).append(player['id'])
+    teams = sorted({player['team'] for player in players.values()})
+    rng.shuffle(teams)
+
+    roster = {}
+    for (slot, positions), team in zip(SLOT_ELIGIBILITY, teams):
+        candidates = [
+            player_id
+            for position in positions
+            for player_id in by_team_position.get((team, position), ())
+        ]
+        roster[slot] = rng.choice(candidates)
+    return roster
+
+def seed_store(data_dir: Path, n_players: int, n_rosters: int, seed: int = 0) -> Tuple[Dict, List[str]]:
+    """Write players.json and create rosters directly through RosterManager"""
+    from roster_manager import RosterManager
+
+    data_dir.mkdir(parents=True, exist_ok=True)
+    players = generate_players(n_players)
+    with open(data_dir / 'players.json', 'w') as f:
+        json.dump(players, f)
+
+    rng = random.Random(seed)
+    manager = RosterManager(str(data_dir), durable=False)
+    roster_ids = [
+        manager.create_roster(f'user_{i}', random_roster(players, rng)).id
+        for i in range(n_rosters)
+    ]
+    return players, roster_ids
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_server(data_dir: Path, port: int, timeout: float = 30.0) -> subprocess.Popen:
+    """Start the app in a child process and wait until it accepts requests"""
+    env = dict(os.environ, DATA_DIR=str(data_dir))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.load_test', 'serve', '--port', str(port)],
+        cwd=str(REPO_ROOT),
+        env=env
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('Server exited during startup')
+        try:
+            status, _ = request('127.0.0.1', port, 'GET', '/api/roster/__ping__')
+            if status == 404:
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError('Server did not start in time')
+
+def serve(port: int):
+    """Run the app with a threaded server (entry point of the child process)"""
+    import logging
+    from werkzeug.serving import make_server
+    from app import app
+
+    # Per-request access logs would dominate the measurement
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    make_server('127.0.0.1', port, app, threaded=True).serve_forever()
+
+def request(host: str, port: int, method: str, path: str,
+            body: Optional[Dict] = None) -> Tuple[int, int]:
+    """Issue one request and return (status, response size)"""
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        headers = {}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body)
+            headers['Content-Type'] = 'application/json'
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        return response.status, len(response.read())
+    finally:
+        connection.close()
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict:
+    """Throughput and latency statistics for one endpoint (latencies in seconds)"""
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        'requests': count,
+        'errors': errors,
+        'throughput_rps': round(count / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(ordered, 50) * 1000, 3),
+        'p95_ms': round(percentile(ordered, 95) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3) if ordered else 0.0
+    }
+
+def drive(make_request: Callable[[random.Random], Tuple[int, int]],
+          concurrency: int, duration: float, seed: int = 0) -> Dict:
+    """Run make_request from concurrency workers for duration seconds"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(worker_id: int):
+        rng = random.Random(seed * 1000 + worker_id)
+        local_latencies = []
+        local_errors = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status, _ = make_request(rng)
+            except OSError:
+                status = 0
+            local_latencies.append(time.perf_counter() - start)
+            if not 200 <= status < 400:
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return summarize(latencies, errors[0], time.perf_counter() - start)
+
+def build_requests(port: int, players: Dict, roster_ids: List[str]) -> Dict[str, Callable]:
+    host = '127.0.0.1'
+    return {
+        'submit_roster': lambda rng: request(
+            host, port, 'POST', '/api/submit-roster', random_roster(players, rng)
+        ),
+        'get_roster': lambda rng: request(
+            host, port, 'GET', f'/api/roster/{rng.choice(roster_ids)}'
+        ),
+        'get_rosters': lambda rng: request(host, port, 'GET', '/api/rosters'),
+        'create_roster': lambda rng: request(host, port, 'GET', '/create-roster')
+    }
+
+def find_regressions(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """List endpoints whose throughput dropped or p95 rose by more than threshold"""
+    regressions = []
+    for endpoint, stats in current['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(endpoint)
+        if not previous:
+            continue
+        if previous['throughput_rps'] and \
+                stats['throughput_rps'] < previous['throughput_rps'] * (1 - threshold):
+            regressions.append(
+                f"{endpoint}: throughput {stats['throughput_rps']} rps "
+                f"vs baseline {previous['throughput_rps']} rps"
+            )
+        if previous['p95_ms'] and stats['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+            regressions.append(
+                f"{endpoint}: p95 {stats['p95_ms']} ms vs baseline {previous['p95_ms']} ms"
+            )
+    return regressions
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=str(REPO_ROOT), text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(args) -> Dict:
+    data_dir = Path(args.data_dir) if args.data_dir else Path(tempfile.mkdtemp(prefix='loadtest-'))
+    print(f'Seeding {args.players} players and {args.rosters} rosters in {data_dir}')
+    players, roster_ids = seed_store(data_dir, args.players, args.rosters, args.seed)
+
+    port = args.port or _free_port()
+    server = start_server(data_dir, port)
+    try:
+        requests_by_endpoint = build_requests(port, players, roster_ids)
+        results = {}
+        for endpoint in args.endpoints:
+            print(f'Driving {endpoint} with {args.concurrency} clients for {args.duration}s')
+            results[endpoint] = drive(
+                requests_by_endpoint[endpoint], args.concurrency, args.duration, args.seed
+            )
+            print(f'  {json.dumps(results[endpoint])}')
+    finally:
+        server.terminate()
+        server.wait()
+        if not args.data_dir and not args.keep_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'revision': _git_revision(),
+            'python': sys.version.split()[0],
+            'players': args.players,
+            'rosters': args.rosters,
+            'concurrency': args.concurrency,
+            'duration': args.duration
+        },
+        'endpoints': results
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command')
+    serve_parser = subparsers.add_parser('serve', help='run the app server (used internally)')
+    serve_parser.add_argument('--port', type=int, required=True)
+
+    parser.add_argument('--players', type=int, default=700)
+    parser.add_argument('--rosters', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per endpoint')
+    parser.add_argument('--endpoints', nargs='+', choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--data-dir', help='seed into this directory instead of a temp dir')
+    parser.add_argument('--keep-data', action='store_true')
+    parser.add_argument('--output', help='results file (default: benchmarks/results/load-<time>.json)')
+    parser.add_argument('--baseline', help='results file to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.2,
+                        help='allowed fractional throughput drop / p95 increase')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        serve(args.port)
+        return 0
+
+    report = run(args)
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"load-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Results saved to {output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(baseline, report, args.max_regression)
+        if regressions:
+            print('Regressions beyond threshold:')
+            for regression in regressions:
+                print(f'- {regression}')
+            return 1
+        print('No regressions beyond threshold')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
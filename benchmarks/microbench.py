@@ -0,0 +1,401 @@
+"""Microbenchmarks for hot paths that run locally without network access.
+
+Each case is warmed up, then timed over several repeats; per-call statistics
+and tracemalloc allocation figures are reported and compared against the
+baseline committed in benchmarks/baselines/microbench.json:
+
+    python -m benchmarks.microbench
+    python -m benchmarks.microbench --filter validator --repeat 20
+    python -m benchmarks.microbench --update-baseline
+    python -m benchmarks.microbench --importtime app
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_FILE = REPO_ROOT / 'benchmarks' / 'baselines' / 'microbench.json'
+
+# name -> setup function returning (callable under test, calls per repeat)
+BENCHMARKS: Dict[str, Callable] = {}
+
+def benchmark(name: str):
+    """Register a setup function; setup time is excluded from measurements"""
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def measure(fn: Callable, number: int, repeat: int = 7, warmup: int = 1) -> Dict:
+    """Time fn and record its allocations; times are per call"""
+    for _ in range(warmup):
+        for _ in range(number):
+            fn()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min_us': round(min(timings) * 1e6, 3),
+        'median_us': round(statistics.median(timings) * 1e6, 3),
+        'mean_us': round(statistics.mean(timings) * 1e6, 3),
+        'stdev_us': round(statistics.stdev(timings) * 1e6, 3) if repeat > 1 else 0.0,
+        'retained_bytes': max(after - before, 0),
+        'peak_bytes': max(peak - before, 0)
+    }
+
+_CLEANUP: List[Path] = []
+
+def _temp_dir() -> Path:
+    path = Path(tempfile.mkdtemp(prefix='microbench-'))
+    _CLEANUP.append(path)
+    return path
+
+def _seeded_manager():
+    from benchmarks.load_test import generate_players, random_roster
+    from roster_manager import RosterManager
+
+    data_dir = _temp_dir()
+    players = generate_players(700)
+    with open(data_dir / 'players.json', 'w') as f:
+        json.dump(players, f)
+    manager = RosterManager(str(data_dir), durable=False)
+    roster = manager.create_roster('bench', random_roster(players, random.Random(0)))
+    return manager, players, roster
+
+@benchmark('validator.validate_player_position')
+def _bench_validate_position():
+    from roster_manager import RosterValidator
+    _, _, roster = _seeded_manager()
+    checks = [
+        (roster.qb, 'QB'), (roster.rb1, 'RB'), (roster.rb2, 'RB'),
+        (roster.wr1, 'WR'), (roster.wr2, 'WR'), (roster.wr3, 'WR'),
+        (roster.te, 'TE'), (roster.superflex, 'SUPERFLEX'), (roster.flex, 'FLEX'),
+        (roster.kicker, 'K'), (roster.defense, 'DEF')
+    ]
+    validate = RosterValidator.validate_player_position
+
+    def run():
+        for player, position in checks:
+            validate(player, position)
+    return run, 2000
+
+@benchmark('validator.validate_unique_teams')
+def _bench_validate_unique_teams():
+    from roster_manager import RosterValidator
+    _, _, roster = _seeded_manager()
+    players = roster.lineup()
+    return (lambda: RosterValidator.validate_unique_teams(players)), 5000
+
+@benchmark('league_rules.LeagueFormat.validate')
+def _bench_format_validate():
+    manager, _, roster = _seeded_manager()
+    lineup = roster.lineup()
+    return (lambda: manager.format.validate(lineup)), 5000
+
+@benchmark('roster_manager._player_to_dict')
+def _bench_player_to_dict():
+    manager, _, roster = _seeded_manager()
+    players = roster.players
+
+    def run():
+        for player in players:
+            manager._player_to_dict(player)
+    return run, 2000
+
+@benchmark('roster_manager._dict_to_roster')
+def _bench_dict_to_roster():
+    import roster_serialization
+    manager, _, roster = _seeded_manager()
+    data = roster_serialization.loads(manager.get_roster_bytes(roster.id))
+    return (lambda: manager._dict_to_roster(data)), 2000
+
+@benchmark('roster_serialization.encode_roster')
+def _bench_encode_roster():
+    import roster_serialization
+    _, _, roster = _seeded_manager()
+    return (lambda: roster_serialization.encode_roster(roster)), 2000
+
+@benchmark('cache.NFLDataCache.get')
+def _bench_cache_get():
+    from data_import.api.cache import NFLDataCache
+    cache = NFLDataCache(str(_temp_dir()))
+    cache.set('roster_1', [{'id': str(i), 'name': f'Player {i}'} for i in range(60)])
+    return (lambda: cache.get('roster_1')), 500
+
+@benchmark('cache.NFLDataCache.set')
+def _bench_cache_set():
+    from data_import.api.cache import NFLDataCache
+    cache = NFLDataCache(str(_temp_dir()))
+    content = [{'id': str(i), 'name': f'Player {i}'} for i in range(60)]
+    return (lambda: cache.set('roster_1', content)), 500
+
+@benchmark('rate_limiter.RateLimiter.wait')
+def _bench_rate_limiter():
+    from data_import.api.rate_limiter import RateLimiter
+    # A limit this high never sleeps, so only the bookkeeping is measured
+    limiter = RateLimiter(requests_per_minute=10 ** 9)
+    return limiter.wait, 20000
+
+@benchmark('validation.validate_player_data[2000]')
+def _bench_validate_player_data():
+    from data_import.api.validation import validate_player_data
+    positions = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
+    records = [
+        {
+            'id': str(i), 'fullName': f'Player {i}', 'position': positions[i % 6].lower(),
+            'teamId': str(i % 32), 'jerseyNumber': i % 99, 'height': 72, 'weight': 210,
+            'age': 25, 'experience': 3
+        }
+        for i in range(2000)
+    ]
+    return (lambda: [validate_player_data(record) for record in records]), 5
+
+@benchmark('validation.validate_players[2000]')
+def _bench_validate_players():
+    from data_import.api.validation import validate_players
+    positions = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
+    records = [
+        {
+            'id': str(i), 'fullName': f'Player {i}', 'position': positions[i % 6].lower(),
+            'teamId': str(i % 32), 'jerseyNumber': i % 99, 'height': 72, 'weight': 210,
+            'age': 25, 'experience': 3
+        }
+        for i in range(2000)
+    ]
+    return (lambda: validate_players(records, columnar=True)), 5
+
+@benchmark('scoring.rescore[100000]')
+def _bench_rescore():
+    import numpy as np
+    from player_catalog import PlayerCatalog, RosterTable
+    from scoring import STAT_CATEGORIES, RosterScorer, StatMatrix, get_scoring
+
+    rng = np.random.default_rng(0)
+    catalog = PlayerCatalog()
+    for i in range(700):
+        catalog.index_of(f'p{i}')
+    table = RosterTable(catalog)
+    table._rows.extend(rng.integers(0, 700, size=100000 * table.width).tolist())
+    table.roster_ids.extend(f'r{i}' for i in range(100000))
+    stats = StatMatrix(catalog, rng.integers(0, 100, size=(700, len(STAT_CATEGORIES))).astype(float))
+    scorer = RosterScorer(table, get_scoring('ppr'))
+    scorer.score(stats)
+    return (lambda: scorer.apply_correction(stats, {'p7': {'rec': 9}})), 5
+
+@benchmark('projections.project[20000]')
+def _bench_project():
+    import numpy as np
+    import pandas as pd
+    from data_import.projections import ProjectionModel
+    from scoring import STAT_CATEGORIES, get_scoring
+
+    rng = np.random.default_rng(0)
+    positions = np.array(['QB', 'RB', 'WR', 'TE', 'K', 'DEF'])
+    teams = np.array([f'T{i}' for i in range(32)])
+    players = rng.integers(0, 1200, size=20000)
+    logs = pd.DataFrame(rng.integers(0, 30, size=(20000, len(STAT_CATEGORIES))), columns=STAT_CATEGORIES)
+    logs.insert(0, 'player_id', [f'p{i}' for i in players])
+    logs.insert(1, 'position', positions[players % 6])
+    logs.insert(2, 'team', teams[players % 32])
+    logs.insert(3, 'opponent', teams[rng.integers(0, 32, size=20000)])
+    logs.insert(4, 'season', 2024)
+    logs.insert(5, 'week', rng.integers(1, 19, size=20000))
+    model = ProjectionModel(get_scoring('ppr'))
+    return (lambda: model.project(logs)), 3
+
+@benchmark('generator._generate_sample_players')
+def _bench_generate_sample_players():
+    from data_import.playoff_roster_generator import PlayoffRosterGenerator
+    generator = PlayoffRosterGenerator(str(_temp_dir()))
+    return generator._generate_sample_players, 200
+
+@benchmark('catalog.read_snapshot[700]')
+def _bench_read_snapshot():
+    from benchmarks.load_test import generate_players
+    from player_catalog import read_snapshot, write_snapshot
+    path = _temp_dir() / 'catalog.snapshot.json'
+    write_snapshot(generate_players(700), path, source_version='bench')
+    return (lambda: read_snapshot(path, source_version='bench')), 50
+
+@benchmark('player_search.search[700]')
+def _bench_player_search():
+    from benchmarks.load_test import generate_players
+    from player_catalog import Player
+    from player_search import PlayerSearchIndex
+    index = PlayerSearchIndex([Player(**p) for p in generate_players(700).values()])
+    return (lambda: index.search('wr 1', position='FLEX', exclude_teams=['BUF'])), 500
+
+@benchmark('roster_options.options[700]')
+def _bench_roster_options():
+    from benchmarks.load_test import generate_players, random_roster
+    from league_rules import get_format
+    from player_catalog import Player
+    from roster_options import RosterOptionsIndex
+    players = generate_players(700)
+    index = RosterOptionsIndex(get_format(), [Player(**p) for p in players.values()])
+    roster = random_roster(players, random.Random(0))
+    partial = {slot: roster[slot] for slot in ('qb', 'rb1', 'wr1')}
+
+    def run():
+        # Measure the matching itself, not the per-state cache
+        index._allowed.clear()
+        index.options(partial)
+    return run, 100
+
+def _import_command(module: str, *flags: str) -> List[str]:
+    return [sys.executable, *flags, '-c', f'import {module}']
+
+def _import_env() -> Dict[str, str]:
+    # Importing app creates its data directory, so keep that out of the repo
+    return dict(os.environ, DATA_DIR=str(_temp_dir()))
+
+@benchmark('startup.import_app')
+def _bench_import_app():
+    command = _import_command('app')
+    env = _import_env()
+    return (lambda: subprocess.run(command, cwd=str(REPO_ROOT), env=env, check=True)), 1
+
+def profile_imports(module: str, top: int = 15) -> List[Dict]:
+    """Run `python -X importtime -c "import module"` and list the slowest imports"""
+    process = subprocess.run(
+        _import_command(module, '-X', 'importtime'),
+        cwd=str(REPO_ROOT), env=_import_env(), capture_output=True, text=True, check=True
+    )
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        rows.append({
+            'module': name.strip(),
+            'self_us': int(self_us),
+            'cumulative_us': int(cumulative_us)
+        })
+    rows.sort(key=lambda row: row['cumulative_us'], reverse=True)
+    return rows[:top]
+
+def run_benchmarks(pattern: Optional[str] = None, repeat: int = 7) -> Dict[str, Dict]:
+    results = {}
+    try:
+        for name, setup in BENCHMARKS.items():
+            if pattern and pattern not in name:
+                continue
+            fn, number = setup()
+            results[name] = measure(fn, number, repeat=repeat)
+            stats = results[name]
+            print(f"{name:45s} median {stats['median_us']:>12.3f} us  "
+                  f"stdev {stats['stdev_us']:>10.3f}  peak {stats['peak_bytes']:>10d} B")
+    finally:
+        for path in _CLEANUP:
+            shutil.rmtree(path, ignore_errors=True)
+        _CLEANUP.clear()
+    return results
+
+def find_regressions(baseline: Dict, results: Dict, threshold: float) -> List[str]:
+    """List cases whose median time or peak memory grew by more than threshold"""
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            continue
+        if stats['median_us'] > previous['median_us'] * (1 + threshold):
+            regressions.append(
+                f"{name}: median {stats['median_us']} us vs baseline {previous['median_us']} us"
+            )
+        if stats['peak_bytes'] > previous['peak_bytes'] * (1 + threshold) + 1024:
+            regressions.append(
+                f"{name}: peak memory {stats['peak_bytes']} B vs baseline {previous['peak_bytes']} B"
+            )
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filter', help='only run cases whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--baseline', default=str(BASELINE_FILE))
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write these results as the new baseline')
+    parser.add_argument('--max-regression', type=float, default=0.5,
+                        help='allowed fractional slowdown before failing')
+    parser.add_argument('--output', help='also write results to this file')
+    parser.add_argument('--importtime', metavar='MODULE',
+                        help='print the slowest imports of MODULE and exit')
+    args = parser.parse_args(argv)
+
+    if args.importtime:
+        try:
+            for row in profile_imports(args.importtime):
+                print(f"{row['cumulative_us'] / 1000:>10.1f} ms cumulative "
+                      f"{row['self_us'] / 1000:>8.1f} ms self  {row['module']}")
+        finally:
+            for path in _CLEANUP:
+                shutil.rmtree(path, ignore_errors=True)
+        return 0
+
+    results = run_benchmarks(args.filter, args.repeat)
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'platform': sys.platform
+        },
+        'benchmarks': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    baseline_file = Path(args.baseline)
+    if args.update_baseline:
+        if baseline_file.exists():
+            with open(baseline_file) as f:
+                previous = json.load(f)
+            # Keep cases that were filtered out of this run
+            report['benchmarks'] = {**previous.get('benchmarks', {}), **results}
+        baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_file, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f'Baseline written to {baseline_file}')
+        return 0
+
+    if baseline_file.exists():
+        with open(baseline_file) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(baseline, results, args.max_regression)
+        if regressions:
+            print('Regressions beyond threshold:')
+            for regression in regressions:
+                print(f'- {regression}')
+            return 1
+        print('No regressions beyond threshold')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Time full pipeline runs against recorded upstream traffic.
+
+Record a game-day archive once, with network access:
+
+    API_TRAFFIC_MODE=record API_TRAFFIC_ARCHIVE=gameday.ndjson.gz python run_pipeline.py
+
+then replay it offline, as often as needed, in a throwaway working directory:
+
+    python -m benchmarks.replay_pipeline gameday.ndjson.gz --runs 5
+    python -m benchmarks.replay_pipeline gameday.ndjson.gz --realtime
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+def replay_runs(archive: str, runs: int, realtime: bool = False) -> Dict:
+    """Run NFLPipeline.execute_pipeline runs times against archive; durations in seconds"""
+    archive = str(Path(archive).resolve())
+    os.environ['API_TRAFFIC_MODE'] = 'replay'
+    os.environ['API_TRAFFIC_ARCHIVE'] = archive
+    os.environ['API_REPLAY_LATENCY'] = '1' if realtime else '0'
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from data_import.api.recording import traffic_session
+    from run_pipeline import NFLPipeline
+
+    durations: List[float] = []
+    failures = 0
+    cwd = os.getcwd()
+    for _ in range(runs):
+        traffic_session().rewind()
+        work_dir = tempfile.mkdtemp(prefix='replay-pipeline-')
+        os.chdir(work_dir)
+        try:
+            start = time.perf_counter()
+            results = NFLPipeline().execute_pipeline()
+            durations.append(time.perf_counter() - start)
+            failures += not results['success']
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        'archive': archive,
+        'realtime': realtime,
+        'runs': runs,
+        'failures': failures,
+        'median_s': round(statistics.median(durations), 4),
+        'max_s': round(max(durations), 4)
+    }
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('archive', help='traffic archive written in record mode')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--realtime', action='store_true',
+                        help='delay each response by its recorded latency')
+    args = parser.parse_args(argv)
+
+    report = replay_runs(args.archive, args.runs, args.realtime)
+    print(json.dumps(report, indent=2))
+    return 1 if report['failures'] else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
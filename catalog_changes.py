@@ -0,0 +1,125 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import roster_serialization
+from player_catalog import file_version
+
+@dataclass(frozen=True)
+class CatalogChange:
+    """The per-player difference between two published catalog versions
+
+    changed maps each player id to only the fields that differ, as
+    [old, new] pairs; added holds complete new records.
+    """
+    from_version: str
+    to_version: str
+    added: Dict[str, Dict] = field(default_factory=dict)
+    removed: Tuple[str, ...] = ()
+    changed: Dict[str, Dict[str, list]] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    @property
+    def player_ids(self) -> List[str]:
+        """Every player id the change touches"""
+        return [*self.added, *self.removed, *self.changed]
+
+    def to_dict(self) -> Dict:
+        return {
+            'from_version': self.from_version,
+            'to_version': self.to_version,
+            'added': self.added,
+            'removed': list(self.removed),
+            'changed': self.changed
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CatalogChange':
+        return cls(
+            from_version=data['from_version'],
+            to_version=data['to_version'],
+            added=data.get('added', {}),
+            removed=tuple(data.get('removed', ())),
+            changed=data.get('changed', {})
+        )
+
+def diff_players(old: Dict[str, Dict], new: Dict[str, Dict]) -> Tuple[Dict, Tuple, Dict]:
+    """Compare two players dicts record by record: (added, removed, changed)"""
+    added = {player_id: info for player_id, info in new.items() if player_id not in old}
+    removed = tuple(player_id for player_id in old if player_id not in new)
+    changed = {}
+    for player_id, info in new.items():
+        before = old.get(player_id)
+        if before is None or before == info:
+            continue
+        fields = {
+            key: [before.get(key), info.get(key)]
+            for key in sorted(before.keys() | info.keys())
+            if before.get(key) != info.get(key)
+        }
+        changed[player_id] = fields
+    return added, removed, changed
+
+class ChangeLog:
+    """Append-only log of catalog changes, one compact JSON line each
+
+    Consumers holding a derived structure for one catalog version ask for
+    the changes leading to the current version and apply just those. Only
+    the most recent entries are kept; a consumer further behind than that
+    gets None and rebuilds from the full catalog.
+    """
+
+    def __init__(self, path, max_entries: int = 256):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._cache: Optional[Tuple[str, List[CatalogChange]]] = None
+
+    def entries(self) -> List[CatalogChange]:
+        """Every retained change, oldest first"""
+        version = file_version(self.path)
+        cached = self._cache
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            with open(self.path, 'rb') as f:
+                entries = [
+                    CatalogChange.from_dict(roster_serialization.loads(line))
+                    for line in f if line.strip()
+                ]
+        except FileNotFoundError:
+            entries = []
+        self._cache = (version, entries)
+        return entries
+
+    def append(self, change: CatalogChange):
+        """Record a change, trimming the log to the newest max_entries"""
+        with self._lock:
+            entries = self.entries()
+            if len(entries) >= self.max_entries:
+                kept = entries[-(self.max_entries // 2):] + [change]
+                tmp_file = self.path.with_name(f'.{self.path.name}.{os.getpid()}.tmp')
+                with open(tmp_file, 'wb') as f:
+                    for entry in kept:
+                        f.write(roster_serialization.dumps(entry.to_dict()) + b'\n')
+                os.replace(tmp_file, self.path)
+            else:
+                with open(self.path, 'ab') as f:
+                    f.write(roster_serialization.dumps(change.to_dict()) + b'\n')
+
+    def between(self, from_version: Optional[str], to_version: str) -> Optional[List[CatalogChange]]:
+        """The chain of changes from one catalog version to another, or None if not logged"""
+        if from_version == to_version:
+            return []
+        chain = []
+        for entry in reversed(self.entries()):
+            if entry.to_version != (chain[-1].from_version if chain else to_version):
+                continue
+            chain.append(entry)
+            if entry.from_version == from_version:
+                chain.reverse()
+                return chain
+        return None
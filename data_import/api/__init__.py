@@ -1,5 +1,9 @@
 from .nfl_api_client import NFLApiClient, ApiConfig
 from .cache import NFLDataCache
-from .validation import ValidationError
+from .providers import HedgedFetcher, ProviderError
+from .validation import ValidationError, ValidationReport, validate_players, validate_teams
 
-__all__ = ['NFLApiClient', 'ApiConfig', 'NFLDataCache', 'ValidationError']
\ No newline at end of file
+__all__ = [
+    'NFLApiClient', 'ApiConfig', 'NFLDataCache', 'ValidationError', 'HedgedFetcher', 'ProviderError',
+    'ValidationReport', 'validate_players', 'validate_teams'
+]
\ No newline at end of file
@@ -4,9 +4,11 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import logging
 from dataclasses import dataclass
-from .validation import validate_player_data, validate_team_data
+from .validation import ValidationReport, validate_players, validate_teams
 from .cache import NFLDataCache
 from .rate_limiter import RateLimiter
+from logging_setup import configure_logging
+from .recording import traffic_session
 
 @dataclass
 class ApiConfig:
@@ -16,20 +18,19 @@ class ApiConfig:
     timeout: int = 10
 
 class NFLApiClient:
-    def __init__(self, config: ApiConfig, cache: NFLDataCache):
+    def __init__(self, config: ApiConfig, cache: NFLDataCache,
+                 session: Optional[requests.Session] = None):
         self.config = config
         self.cache = cache
+        # Recording or replaying when API_TRAFFIC_MODE is set
+        self.session = session or traffic_session()
         self.rate_limiter = RateLimiter(config.requests_per_minute)
         self._setup_logging()
     
     def _setup_logging(self):
+        # Handlers are process-wide (logs/nfl_api.log); constructing clients adds none
+        configure_logging()
         self.logger = logging.getLogger('NFLApiClient')
-        handler = logging.FileHandler('nfl_api.log')
-        handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        ))
-        self.logger.addHandler(handler)
-        self.logger.setLevel(logging.INFO)
     
     def _make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """Make API request with rate limiting and error handling"""
@@ -40,7 +41,7 @@ class NFLApiClient:
             headers['Authorization'] = f'Bearer {self.config.api_key}'
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 url,
                 params=params,
                 headers=headers,
@@ -52,6 +53,13 @@ class NFLApiClient:
             self.logger.error(f"API request failed: {str(e)}")
             raise
     
+    def _log_rejected(self, endpoint: str, report: ValidationReport):
+        """Log the records a batch validator dropped; the valid ones are still used"""
+        for error in report.errors:
+            self.logger.warning(
+                f"Skipped invalid record {error.record_id!r} (#{error.index}) from {endpoint}: {error.message}"
+            )
+    
     def get_playoff_teams(self) -> List[Dict]:
         """Get current playoff teams with validation"""
         cache_key = 'playoff_teams'
@@ -60,9 +68,10 @@ class NFLApiClient:
             return cached_data
         
         data = self._make_request('teams', {'filter': 'playoff'})
-        teams = [validate_team_data(team) for team in data.get('teams', [])]
-        self.cache.set(cache_key, teams)
-        return teams
+        report = validate_teams(data.get('teams', []))
+        self._log_rejected('teams', report)
+        self.cache.set(cache_key, report.records)
+        return report.records
     
     def get_team_roster(self, team_id: str) -> List[Dict]:
         """Get team roster with player validation"""
@@ -72,9 +81,10 @@ class NFLApiClient:
             return cached_data
         
         data = self._make_request(f'teams/{team_id}/roster')
-        players = [validate_player_data(player) for player in data.get('players', [])]
-        self.cache.set(cache_key, players)
-        return players
+        report = validate_players(data.get('players', []))
+        self._log_rejected(f'teams/{team_id}/roster', report)
+        self.cache.set(cache_key, report.records)
+        return report.records
     
     def get_player_status(self, player_id: str) -> Dict:
         """Get player active/inactive status"""
@@ -0,0 +1,408 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+import requests
+from .rate_limiter import RateLimiter
+from .recording import traffic_session
+from .validation import VALID_POSITIONS, ValidationReport, validate_players, validate_teams
+
+CONFIG_FILE = Path(__file__).resolve().parents[2] / 'config.yml'
+
+class ProviderError(Exception):
+    pass
+
+class RequestCancelled(ProviderError):
+    pass
+
+@dataclass
+class ProviderConfig:
+    name: str
+    base_url: str
+    rate_limit: int = 60
+    timeout: float = 10
+    max_in_flight: int = 4
+
+class Cancellation:
+    """Cancel flag for one request; setting it closes the response being read"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._response = None
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def set(self):
+        with self._lock:
+            self._event.set()
+            response, self._response = self._response, None
+        if response is not None:
+            response.close()
+
+    def attach(self, response):
+        """Close response if the request is cancelled while it is being read"""
+        with self._lock:
+            if not self._event.is_set():
+                self._response = response
+                return
+        response.close()
+
+    def detach(self):
+        with self._lock:
+            self._response = None
+
+class ProviderStats:
+    """Latency and outcome counters for one provider, kept over a sliding window"""
+
+    def __init__(self, window: int = 200):
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.wins = 0
+        self.cancelled = 0
+        self.skipped = 0
+
+    def record(self, latency: float, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            if error:
+                self.errors += 1
+            else:
+                self._latencies.append(latency)
+
+    def record_win(self):
+        with self._lock:
+            self.wins += 1
+
+    def record_cancel(self):
+        with self._lock:
+            self.requests += 1
+            self.cancelled += 1
+
+    def record_skip(self):
+        with self._lock:
+            self.skipped += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency below which this fraction of recent successes finished"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    @property
+    def samples(self) -> int:
+        return len(self._latencies)
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'wins': self.wins,
+            'cancelled': self.cancelled,
+            'skipped': self.skipped,
+            'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+            'p95_ms': round(p95 * 1000, 1) if p95 is not None else None
+        }
+
+class Provider(ABC):
+    """One upstream API, mapped onto the records validate_teams/validate_players expect
+
+    Rosters are requested by team abbreviation, the one team key both
+    upstreams share.
+    """
+
+    def __init__(self, config: ProviderConfig, session: Optional[requests.Session] = None):
+        self.config = config
+        self.name = config.name
+        self.stats = ProviderStats()
+        self.rate_limiter = RateLimiter(config.rate_limit)
+        self._session = session or traffic_session()
+
+    @abstractmethod
+    def teams_path(self) -> str:
+        """Path of the playoff teams document, relative to base_url"""
+
+    @abstractmethod
+    def roster_path(self, abbreviation: str) -> str:
+        """Path of one team's roster document, relative to base_url"""
+
+    @abstractmethod
+    def parse_teams(self, raw: Dict) -> List[Dict]:
+        """Map the teams document onto validate_teams records"""
+
+    @abstractmethod
+    def parse_roster(self, raw: Dict, abbreviation: str) -> List[Dict]:
+        """Map a roster document onto validate_players records"""
+
+    def get(self, path: str, cancelled: Optional[Cancellation] = None) -> Dict:
+        """GET a JSON document, abandoning it once cancelled is set"""
+        self.rate_limiter.wait()
+        start = time.perf_counter()
+        try:
+            # Stream so a request that lost the race is dropped once its headers arrive,
+            # and closing the response aborts a body still being read
+            with self._session.get(
+                f'{self.config.base_url}/{path}', stream=True, timeout=self.config.timeout
+            ) as response:
+                if cancelled is not None:
+                    cancelled.attach(response)
+                try:
+                    if cancelled is not None and cancelled.is_set():
+                        raise RequestCancelled(f'{self.name}: {path} cancelled')
+                    response.raise_for_status()
+                    data = response.json()
+                finally:
+                    if cancelled is not None:
+                        cancelled.detach()
+        except RequestCancelled:
+            self.stats.record_cancel()
+            raise
+        except Exception as e:
+            if cancelled is not None and cancelled.is_set():
+                # Reading a response closed under us fails in assorted ways
+                self.stats.record_cancel()
+                raise RequestCancelled(f'{self.name}: {path} cancelled') from e
+            if not isinstance(e, (requests.RequestException, ValueError)):
+                raise
+            self.stats.record(time.perf_counter() - start, error=True)
+            raise ProviderError(f'{self.name}: {path} failed: {e}') from e
+        if cancelled is not None and cancelled.is_set():
+            self.stats.record_cancel()
+            raise RequestCancelled(f'{self.name}: {path} cancelled')
+        self.stats.record(time.perf_counter() - start)
+        return data
+
+    def fetch_teams(self, cancelled: Optional[Cancellation] = None) -> ValidationReport:
+        return validate_teams(self.parse_teams(self.get(self.teams_path(), cancelled)))
+
+    def fetch_roster(self, abbreviation: str, cancelled: Optional[Cancellation] = None) -> ValidationReport:
+        raw = self.get(self.roster_path(abbreviation), cancelled)
+        return validate_players(self.parse_roster(raw, abbreviation))
+
+class ESPNProvider(Provider):
+    # ESPN calls kickers PK
+    POSITIONS = {'PK': 'K'}
+
+    def teams_path(self) -> str:
+        return 'teams'
+
+    def roster_path(self, abbreviation: str) -> str:
+        return f'teams/{abbreviation.lower()}/roster'
+
+    def parse_teams(self, raw: Dict) -> List[Dict]:
+        try:
+            entries = raw['sports'][0]['leagues'][0]['teams']
+        except (KeyError, IndexError, TypeError) as e:
+            raise ProviderError(f'{self.name}: unexpected teams response: {e}')
+        teams = []
+        for entry in entries:
+            team = entry.get('team', entry)
+            teams.append({
+                'id': team.get('id'),
+                'name': team.get('displayName', team.get('name')),
+                'abbreviation': team.get('abbreviation'),
+                'venue': team.get('venue'),
+                'record': team.get('record')
+            })
+        return teams
+
+    def parse_roster(self, raw: Dict, abbreviation: str) -> List[Dict]:
+        players = []
+        for group in raw.get('athletes', []):
+            for athlete in group.get('items', []):
+                position = (athlete.get('position') or {}).get('abbreviation', '')
+                position = self.POSITIONS.get(position, position)
+                # Linemen and defenders are not fantasy players
+                if position not in VALID_POSITIONS:
+                    continue
+                jersey = athlete.get('jersey')
+                players.append({
+                    'id': athlete.get('id'),
+                    'fullName': athlete.get('fullName'),
+                    'position': position,
+                    'teamId': abbreviation,
+                    'jerseyNumber': int(jersey) if str(jersey or '').isdigit() else None,
+                    'status': ((athlete.get('status') or {}).get('type') or 'active').upper(),
+                    'height': athlete.get('height'),
+                    'weight': athlete.get('weight'),
+                    'age': athlete.get('age'),
+                    'experience': (athlete.get('experience') or {}).get('years')
+                })
+        return players
+
+class NFLProvider(Provider):
+    """The NFL API already uses the field names the validators expect"""
+
+    def teams_path(self) -> str:
+        return 'teams?filter=playoff'
+
+    def roster_path(self, abbreviation: str) -> str:
+        return f'teams/{abbreviation}/roster'
+
+    def parse_teams(self, raw: Dict) -> List[Dict]:
+        return raw.get('teams', [])
+
+    def parse_roster(self, raw: Dict, abbreviation: str) -> List[Dict]:
+        players = []
+        for player in raw.get('players', []):
+            if isinstance(player, dict):
+                player = {**player, 'teamId': abbreviation}
+            players.append(player)
+        return players
+
+PROVIDER_TYPES = {'espn': ESPNProvider, 'nfl': NFLProvider}
+
+class HedgedFetcher:
+    """Fetch from the first provider, hedging to the next one when it runs slow
+
+    The primary gets a head start equal to its recent latency percentile
+    (hedge_percentile). If it has not answered by then, or fails, the next
+    provider is asked too and the first good answer wins; the other request
+    is cancelled and its response closed. A provider with too few samples
+    gets default_hedge_delay.
+
+    Each provider has its own pool of max_in_flight workers. A hedge is never
+    queued behind a full pool: a provider with no free worker is skipped, so
+    one hung upstream cannot starve requests to the others.
+    """
+
+    def __init__(self, providers: Sequence[Provider], hedge_percentile: float = 0.95,
+                 default_hedge_delay: float = 1.0, min_hedge_delay: float = 0.02,
+                 min_samples: int = 5):
+        if not providers:
+            raise ProviderError('No API providers configured')
+        self.providers = list(providers)
+        self.hedge_percentile = hedge_percentile
+        self.default_hedge_delay = default_hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._in_flight = {provider.name: 0 for provider in self.providers}
+        self._executors = {
+            provider.name: ThreadPoolExecutor(
+                max_workers=provider.config.max_in_flight,
+                thread_name_prefix=f'hedged-fetch-{provider.name}'
+            )
+            for provider in self.providers
+        }
+
+    @classmethod
+    def from_config(cls, path=CONFIG_FILE, **options) -> 'HedgedFetcher':
+        """Build providers from the api section of config.yml, in file order"""
+        import yaml
+        with open(path, 'r') as f:
+            config = yaml.safe_load(f) or {}
+        providers = []
+        for name, spec in (config.get('api') or {}).items():
+            provider_type = PROVIDER_TYPES.get(name)
+            if provider_type is None:
+                continue
+            providers.append(provider_type(ProviderConfig(
+                name=name,
+                base_url=spec['base_url'].rstrip('/'),
+                rate_limit=spec.get('rate_limit', 60),
+                timeout=spec.get('timeout', 10),
+                max_in_flight=spec.get('max_in_flight', 4)
+            )))
+        updates = config.get('updates') or {}
+        options.setdefault('hedge_percentile', updates.get('hedge_percentile', 0.95))
+        return cls(providers, **options)
+
+    def hedge_delay(self, provider: Provider) -> float:
+        """How long to wait on a provider before asking the next one"""
+        if provider.stats.samples < self.min_samples:
+            return self.default_hedge_delay
+        return max(self.min_hedge_delay, provider.stats.percentile(self.hedge_percentile))
+
+    def _submit(self, provider: Provider, call: Callable, cancelled: Cancellation, queue: bool = False):
+        """Start call on provider's pool, or return None if it is full and queue is not set"""
+        with self._lock:
+            if not queue and self._in_flight[provider.name] >= provider.config.max_in_flight:
+                return None
+            self._in_flight[provider.name] += 1
+        future = self._executors[provider.name].submit(call, provider, cancelled)
+        future.add_done_callback(lambda _: self._release(provider))
+        return future
+
+    def _release(self, provider: Provider):
+        with self._lock:
+            self._in_flight[provider.name] -= 1
+
+    def fetch(self, call: Callable[[Provider, Cancellation], Any]) -> Any:
+        """Run call against the providers, hedged, and return the first success"""
+        cancelled = {}
+        pending = {}
+        errors = []
+        remaining = list(self.providers)
+        busy = []
+
+        def launch(queue: bool = False) -> Optional[Provider]:
+            while remaining:
+                provider = remaining.pop(0)
+                token = Cancellation()
+                future = self._submit(provider, call, token, queue)
+                if future is None:
+                    provider.stats.record_skip()
+                    busy.append(provider)
+                    continue
+                cancelled[provider.name] = token
+                pending[future] = provider
+                return provider
+            return None
+
+        latest = launch()
+        if latest is None:
+            # Every provider is saturated: wait in line for the primary
+            remaining.append(busy.pop(0))
+            latest = launch(queue=True)
+        while pending:
+            timeout = self.hedge_delay(latest) if remaining else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # The newest request is slower than usual: hedge, if a provider has room
+                latest = launch() or latest
+                continue
+            for future in done:
+                provider = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    errors.append(f'{provider.name}: {e}' if not isinstance(e, ProviderError) else str(e))
+                    continue
+                provider.stats.record_win()
+                for loser_future, loser in pending.items():
+                    cancelled[loser.name].set()
+                    if loser_future.cancel():
+                        loser.stats.record_cancel()
+                return result
+            if not pending:
+                # Failures are not hedges, so a busy provider is worth waiting for now
+                latest = launch()
+                if latest is None and busy:
+                    remaining.append(busy.pop(0))
+                    latest = launch(queue=True)
+        raise ProviderError('All providers failed: ' + '; '.join(errors))
+
+    def fetch_teams(self) -> ValidationReport:
+        return self.fetch(lambda provider, cancelled: provider.fetch_teams(cancelled))
+
+    def fetch_roster(self, abbreviation: str) -> ValidationReport:
+        return self.fetch(lambda provider, cancelled: provider.fetch_roster(abbreviation, cancelled))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider latency and error counters"""
+        return {provider.name: provider.stats.snapshot() for provider in self.providers}
+
+    def close(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,152 @@
+"""Record upstream API traffic to a compressed archive and serve it back offline.
+
+Set API_TRAFFIC_MODE=record (or replay) and API_TRAFFIC_ARCHIVE=<path> and
+every provider and NFLApiClient request goes through the matching session:
+
+    API_TRAFFIC_MODE=record API_TRAFFIC_ARCHIVE=gameday.ndjson.gz python run_pipeline.py
+    API_TRAFFIC_MODE=replay API_TRAFFIC_ARCHIVE=gameday.ndjson.gz python run_pipeline.py
+
+Replays answer instantly unless API_REPLAY_LATENCY=1, in which case each
+response is delayed by its recorded latency.
+"""
+import atexit
+import base64
+import gzip
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+import requests
+
+ARCHIVE_FORMAT = 1
+
+def _request_key(method: str, url: str, params=None) -> str:
+    if params:
+        query = urlencode(sorted(params.items()) if isinstance(params, dict) else params)
+        url = f"{url}{'&' if '?' in url else '?'}{query}"
+    return f'{method.upper()} {url}'
+
+class RecordingSession(requests.Session):
+    """A requests session that also appends every exchange to a gzip NDJSON archive
+
+    Each line holds the request key, status, content type, latency and body.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        self._archive = gzip.open(path, 'wt', encoding='utf-8')
+        self._archive.write(json.dumps({'format': ARCHIVE_FORMAT}) + '\n')
+        atexit.register(self.close)
+
+    def request(self, method, url, params=None, **kwargs):
+        start = time.perf_counter()
+        response = super().request(method, url, params=params, **kwargs)
+        # Reading the body here means a cancelled hedge still downloads it while recording
+        body = response.content
+        entry = {
+            'key': _request_key(method, url, params),
+            'status': response.status_code,
+            'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+            'latency': round(time.perf_counter() - start, 6)
+        }
+        try:
+            # JSON payloads stay text, which gzip packs far better than base64
+            entry['text'] = body.decode('utf-8')
+        except UnicodeDecodeError:
+            entry['body'] = base64.b64encode(body).decode('ascii')
+        with self._lock:
+            if self._archive is not None:
+                self._archive.write(json.dumps(entry, separators=(',', ':')) + '\n')
+        return response
+
+    def close(self):
+        with self._lock:
+            if self._archive is not None:
+                self._archive.close()
+                self._archive = None
+        super().close()
+
+class ReplaySession(requests.Session):
+    """A requests session that answers from a recorded archive, never the network
+
+    Repeated requests get the recorded responses in order, and the last one
+    once those run out. Unrecorded requests raise requests.ConnectionError,
+    just as an unreachable upstream would.
+    """
+
+    def __init__(self, path, realtime: bool = False):
+        super().__init__()
+        self.realtime = realtime
+        self._lock = threading.Lock()
+        self._responses: Dict[str, List[Dict]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline() or '{}')
+            if header.get('format') != ARCHIVE_FORMAT:
+                raise ValueError(f'Unsupported traffic archive: {path}')
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._responses[entry['key']].append(entry)
+
+    def _next(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entries = self._responses.get(key)
+            if not entries:
+                return None
+            served = self._served[key]
+            self._served[key] = served + 1
+            return entries[min(served, len(entries) - 1)]
+
+    def rewind(self):
+        """Start serving every request's recorded responses from the first again"""
+        with self._lock:
+            self._served.clear()
+
+    def request(self, method, url, params=None, **kwargs):
+        key = _request_key(method, url, params)
+        entry = self._next(key)
+        if entry is None:
+            raise requests.ConnectionError(f'No recorded response for {key}')
+        if self.realtime:
+            time.sleep(entry['latency'])
+
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers.update(entry['headers'])
+        response.url = key.split(' ', 1)[1]
+        response.encoding = 'utf-8'
+        if 'text' in entry:
+            response._content = entry['text'].encode('utf-8')
+        else:
+            response._content = base64.b64decode(entry['body'])
+        response._content_consumed = True
+        return response
+
+_shared: Dict[Tuple[str, str], requests.Session] = {}
+_shared_lock = threading.Lock()
+
+def traffic_session() -> requests.Session:
+    """Get the session the API_TRAFFIC_* settings ask for; a plain one by default
+
+    Record and replay sessions are shared per archive, so every provider
+    writes to, or reads from, the same file.
+    """
+    mode = os.environ.get('API_TRAFFIC_MODE', '').lower()
+    if mode not in ('record', 'replay'):
+        return requests.Session()
+    path = os.environ.get('API_TRAFFIC_ARCHIVE', 'api_traffic.ndjson.gz')
+    with _shared_lock:
+        session = _shared.get((mode, path))
+        if session is None:
+            if mode == 'record':
+                session = RecordingSession(path)
+            else:
+                session = ReplaySession(path, realtime=os.environ.get('API_REPLAY_LATENCY') == '1')
+            _shared[(mode, path)] = session
+        return session
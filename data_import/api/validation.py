@@ -1,25 +1,82 @@
-from typing import Dict, Any
-from dataclasses import dataclass
+from typing import Dict, Any, Callable, Iterable, List, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 
+VALID_POSITIONS = frozenset(['QB', 'RB', 'WR', 'TE', 'K', 'DEF'])
+PLAYER_REQUIRED_FIELDS = ('id', 'fullName', 'position')
+TEAM_REQUIRED_FIELDS = ('id', 'name', 'abbreviation')
+
+# pandas dtypes for the columnar batch results; nullable ints keep missing values
+PLAYER_DTYPES = {
+    'id': 'string', 'name': 'string', 'position': 'category', 'team_id': 'string',
+    'jersey_number': 'Int64', 'status': 'category', 'height': 'Int64',
+    'weight': 'Int64', 'age': 'Int64', 'experience': 'Int64', 'last_updated': 'string'
+}
+TEAM_DTYPES = {
+    'id': 'string', 'name': 'string', 'abbreviation': 'string', 'conference': 'category',
+    'division': 'category', 'venue': 'string', 'head_coach': 'string',
+    'wins': 'Int64', 'losses': 'Int64', 'ties': 'Int64', 'last_updated': 'string'
+}
+
 @dataclass
 class ValidationError(Exception):
     field: str
     message: str
 
-def validate_player_data(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate and normalize player data"""
-    required_fields = ['id', 'fullName', 'position']
-    for field in required_fields:
-        if field not in data:
-            raise ValidationError(field, f'Missing required field: {field}')
-    
+@dataclass
+class RecordError:
+    index: int
+    record_id: Any
+    field: str
+    message: str
+
+@dataclass
+class ValidationReport:
+    """Normalized records of one batch, plus the records that failed and why"""
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[RecordError] = field(default_factory=list)
+    columns: Optional[Dict[str, list]] = None
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    flatten: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = field(default=None, repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_frame(self):
+        """The batch as a typed DataFrame, built from the columns when collected"""
+        import pandas as pd
+        columns = self.columns
+        if columns is None:
+            rows = [self.flatten(r) for r in self.records] if self.flatten else self.records
+            columns = {name: [row.get(name) for row in rows] for name in self.dtypes}
+        return pd.DataFrame({
+            name: pd.Series(values, dtype=self.dtypes.get(name, 'object'))
+            for name, values in columns.items()
+        })
+
+def _check_required(data: Dict[str, Any], required_fields: Iterable[str]):
+    for field_name in required_fields:
+        if field_name not in data:
+            raise ValidationError(field_name, f'Missing required field: {field_name}')
+
+def _nested(data: Dict[str, Any], field_name: str) -> Dict[str, Any]:
+    value = data.get(field_name) or {}
+    if not isinstance(value, dict):
+        raise ValidationError(field_name, f'Expected an object for {field_name}, got {type(value).__name__}')
+    return value
+
+def _normalize_player(data: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+    _check_required(data, PLAYER_REQUIRED_FIELDS)
+
     # Normalize and validate position
-    valid_positions = ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']
-    position = data.get('position', '').upper()
-    if position not in valid_positions:
+    position = data.get('position') or ''
+    if not isinstance(position, str):
+        raise ValidationError('position', f'Invalid position: {position!r}')
+    position = position.upper()
+    if position not in VALID_POSITIONS:
         raise ValidationError('position', f'Invalid position: {position}')
-    
+
     return {
         'id': data['id'],
         'name': data['fullName'],
@@ -31,28 +88,80 @@ def validate_player_data(data: Dict[str, Any]) -> Dict[str, Any]:
         'weight': data.get('weight'),
         'age': data.get('age'),
         'experience': data.get('experience'),
-        'last_updated': datetime.now().isoformat()
+        'last_updated': timestamp
     }
 
-def validate_team_data(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate and normalize team data"""
-    required_fields = ['id', 'name', 'abbreviation']
-    for field in required_fields:
-        if field not in data:
-            raise ValidationError(field, f'Missing required field: {field}')
-    
+def _normalize_team(data: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+    _check_required(data, TEAM_REQUIRED_FIELDS)
+
+    record = _nested(data, 'record')
     return {
         'id': data['id'],
         'name': data['name'],
         'abbreviation': data['abbreviation'],
         'conference': data.get('conference'),
         'division': data.get('division'),
-        'venue': data.get('venue', {}).get('name'),
-        'head_coach': data.get('headCoach', {}).get('name'),
+        'venue': _nested(data, 'venue').get('name'),
+        'head_coach': _nested(data, 'headCoach').get('name'),
         'win_loss_record': {
-            'wins': data.get('record', {}).get('wins', 0),
-            'losses': data.get('record', {}).get('losses', 0),
-            'ties': data.get('record', {}).get('ties', 0)
+            'wins': record.get('wins', 0),
+            'losses': record.get('losses', 0),
+            'ties': record.get('ties', 0)
         },
-        'last_updated': datetime.now().isoformat()
-    }
\ No newline at end of file
+        'last_updated': timestamp
+    }
+
+def validate_player_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate and normalize player data"""
+    return _normalize_player(data, datetime.now().isoformat())
+
+def validate_team_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate and normalize team data"""
+    return _normalize_team(data, datetime.now().isoformat())
+
+def _validate_batch(records: Iterable[Dict[str, Any]], normalize, dtypes: Dict[str, str],
+                    columnar: bool, flatten=None) -> ValidationReport:
+    timestamp = datetime.now().isoformat()
+    report = ValidationReport(dtypes=dtypes, flatten=flatten)
+    if columnar:
+        report.columns = {name: [] for name in dtypes}
+        appends = [(name, values.append) for name, values in report.columns.items()]
+
+    for index, data in enumerate(records):
+        try:
+            if not isinstance(data, dict):
+                raise ValidationError('', f'Expected an object, got {type(data).__name__}')
+            normalized = normalize(data, timestamp)
+        except ValidationError as e:
+            record_id = data.get('id') if isinstance(data, dict) else None
+            report.errors.append(RecordError(index, record_id, e.field, e.message))
+            continue
+        except (TypeError, AttributeError, ValueError) as e:
+            # A shape the checks above did not anticipate still only rejects this record
+            record_id = data.get('id') if isinstance(data, dict) else None
+            report.errors.append(RecordError(index, record_id, '', f'Malformed record: {e}'))
+            continue
+        report.records.append(normalized)
+        if columnar:
+            row = flatten(normalized) if flatten else normalized
+            for name, append in appends:
+                append(row.get(name))
+    return report
+
+def _flatten_team(team: Dict[str, Any]) -> Dict[str, Any]:
+    return {**team, **team['win_loss_record']}
+
+def validate_players(records: Iterable[Dict[str, Any]], columnar: bool = False) -> ValidationReport:
+    """Validate a whole roster response, collecting bad records instead of raising
+
+    Every record in the batch shares one last_updated timestamp. With
+    columnar=True the report also carries the fields as columns.
+    """
+    return _validate_batch(records, _normalize_player, PLAYER_DTYPES, columnar)
+
+def validate_teams(records: Iterable[Dict[str, Any]], columnar: bool = False) -> ValidationReport:
+    """Validate a whole teams response, collecting bad records instead of raising
+
+    Columns flatten win_loss_record into wins, losses and ties.
+    """
+    return _validate_batch(records, _normalize_team, TEAM_DTYPES, columnar, _flatten_team)
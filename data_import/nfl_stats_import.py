@@ -1,11 +1,13 @@
 import pandas as pd
-import requests
 from datetime import datetime
 import os
+from typing import Optional
+from data_import.api.providers import HedgedFetcher
 
 class NFLStatsImporter:
-    def __init__(self):
-        self.base_url = 'https://site.api.espn.com/apis/site/v2/sports/football/nfl'
+    def __init__(self, fetcher: Optional[HedgedFetcher] = None):
+        # ESPN first, hedged to the NFL API when it runs slow or fails
+        self.fetcher = fetcher or HedgedFetcher.from_config()
         self.data_dir = 'data'
         self._ensure_data_directory()
     
@@ -15,35 +17,23 @@ class NFLStatsImporter:
             os.makedirs(self.data_dir)
     
     def fetch_team_stats(self):
-        """Fetch team statistics from ESPN API"""
-        url = f'{self.base_url}/teams'
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f'Failed to fetch team stats: {response.status_code}')
+        """Fetch normalized team records from the fastest healthy provider"""
+        return self.fetcher.fetch_teams()
     
     def fetch_player_stats(self, team_id):
-        """Fetch player statistics for a specific team"""
-        url = f'{self.base_url}/teams/{team_id}/roster'
-        response = requests.get(url)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f'Failed to fetch player stats: {response.status_code}')
+        """Fetch normalized player records for a team, keyed by abbreviation"""
+        return self.fetcher.fetch_roster(team_id)
     
-    def process_team_stats(self, raw_data):
-        """Process raw team statistics into a pandas DataFrame"""
+    def process_team_stats(self, report):
+        """Process a validated teams batch into a pandas DataFrame"""
         teams_data = []
-        for team in raw_data['sports'][0]['leagues'][0]['teams']:
-            team_info = team['team']
+        for team in report.records:
             teams_data.append({
-                'team_id': team_info['id'],
-                'name': team_info['name'],
-                'abbreviation': team_info['abbreviation'],
-                'location': team_info['location'],
-                'wins': team_info.get('record', {}).get('wins', 0),
-                'losses': team_info.get('record', {}).get('losses', 0)
+                'team_id': team['abbreviation'],
+                'name': team['name'],
+                'abbreviation': team['abbreviation'],
+                'wins': team['win_loss_record']['wins'],
+                'losses': team['win_loss_record']['losses']
             })
         return pd.DataFrame(teams_data)
     
@@ -68,8 +58,7 @@ class NFLStatsImporter:
             for team_id in teams_df['team_id']:
                 try:
                     player_data = self.fetch_player_stats(team_id)
-                    # Process player data here
-                    # Add to all_players list
+                    all_players.extend(player_data.records)
                 except Exception as e:
                     print(f'Error fetching players for team {team_id}: {e}')
             
@@ -1,42 +1,115 @@
-import pandas as pd
+import csv
 import json
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Optional
+from catalog_changes import CatalogChange, ChangeLog, diff_players
+from player_catalog import SeasonCatalogs, file_version, write_snapshot
+from seasons import current_season, playoff_field
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 class PlayoffRosterGenerator:
-    def __init__(self, data_dir: str = 'data'):
+    def __init__(self, data_dir: str = 'data', season: Optional[int] = None):
         self.data_dir = Path(data_dir)
+        self.season = season or current_season()
         self.players_file = self.data_dir / 'players.json'
+        self.snapshot_file = self.data_dir / 'catalog.snapshot.json'
+        self.projections_file = self.data_dir / 'projections.json'
+        self.change_log = ChangeLog(self.data_dir / 'catalog.changes.ndjson')
+        self.seasons = SeasonCatalogs(self.data_dir / 'seasons')
         self._ensure_directories()
         
-        # 2024 Playoff Teams (you can update this each year)
-        self.playoff_teams = {
-            'BAL': {'name': 'Baltimore Ravens', 'conference': 'AFC', 'seed': 1},
-            'BUF': {'name': 'Buffalo Bills', 'conference': 'AFC', 'seed': 2},
-            'KC': {'name': 'Kansas City Chiefs', 'conference': 'AFC', 'seed': 3},
-            'HOU': {'name': 'Houston Texans', 'conference': 'AFC', 'seed': 4},
-            'CLE': {'name': 'Cleveland Browns', 'conference': 'AFC', 'seed': 5},
-            'MIA': {'name': 'Miami Dolphins', 'conference': 'AFC', 'seed': 6},
-            'PIT': {'name': 'Pittsburgh Steelers', 'conference': 'AFC', 'seed': 7},
-            'SF': {'name': 'San Francisco 49ers', 'conference': 'NFC', 'seed': 1},
-            'DAL': {'name': 'Dallas Cowboys', 'conference': 'NFC', 'seed': 2},
-            'DET': {'name': 'Detroit Lions', 'conference': 'NFC', 'seed': 3},
-            'TB': {'name': 'Tampa Bay Buccaneers', 'conference': 'NFC', 'seed': 4},
-            'PHI': {'name': 'Philadelphia Eagles', 'conference': 'NFC', 'seed': 5},
-            'LAR': {'name': 'Los Angeles Rams', 'conference': 'NFC', 'seed': 6},
-            'GB': {'name': 'Green Bay Packers', 'conference': 'NFC', 'seed': 7}
-        }
+        self.playoff_teams = playoff_field(self.season)
 
     def _ensure_directories(self):
         """Create necessary directories if they don't exist"""
         self.data_dir.mkdir(exist_ok=True)
 
-    def generate_playoff_rosters(self) -> pd.DataFrame:
+    def generate_playoff_rosters(self) -> 'pd.DataFrame':
         """Generate and return playoff rosters as a DataFrame"""
+        # pandas is only needed here, so importing the web app stays cheap
+        import pandas as pd
+
         players_data = self._generate_sample_players()
         self._save_players(players_data)
         return pd.DataFrame(players_data.values())
 
+    def run_full_update(self) -> Dict:
+        """Regenerate the season's player catalog and publish it"""
+        players_data = self.apply_projections(self._generate_sample_players())
+        self.publish(players_data)
+        return players_data
+
+    def apply_projections(self, players_data: Dict) -> Dict:
+        """Replace projected_points with the projection stage's output where there is one"""
+        from data_import.projections import load_projections
+
+        projections = load_projections(self.projections_file)
+        for player_id, player in players_data.items():
+            if player_id in projections:
+                player['projected_points'] = projections[player_id]
+        return players_data
+
+    def publish(self, players_data: Dict) -> Optional[CatalogChange]:
+        """Archive a season's catalog; the current season also becomes players.json
+
+        players.json is only rewritten when some record differs, and each
+        rewrite is logged as a per-player diff so consumers can apply it
+        instead of rebuilding. Returns the logged change, if any.
+        """
+        change = None
+        rewritten = True
+        if self.season == current_season():
+            try:
+                previous = self.get_all_players()
+            except FileNotFoundError:
+                previous = None
+            rewritten = previous != players_data
+            if rewritten:
+                from_version = file_version(self.players_file)
+                self._save_players(players_data)
+                if previous is not None:
+                    added, removed, changed = diff_players(previous, players_data)
+                    change = CatalogChange(
+                        from_version, file_version(self.players_file), added, removed, changed
+                    )
+                    self.change_log.append(change)
+            if rewritten or not self.snapshot_file.exists():
+                self._save_snapshot(players_data)
+        if rewritten or not self.seasons.path_for(self.season).exists():
+            self.seasons.publish(self.season, players_data, source_version=str(self.season))
+        return change
+
+    def load_players_csv(self, csv_path) -> Dict:
+        """Read a name,position,team[,projected_points] CSV of real players
+
+        Ids follow init_db's TEAM_POS<n> scheme; kickers and defenses, one per
+        team, are just TEAM_K and TEAM_DEF.
+        """
+        players = {}
+        counts = defaultdict(int)
+        with open(csv_path, newline='') as f:
+            for row in csv.DictReader(f):
+                team, position = row['team'], row['position']
+                if team not in self.playoff_teams:
+                    continue
+                counts[(team, position)] += 1
+                if position in ('K', 'DEF'):
+                    player_id = f'{team}_{position}'
+                else:
+                    player_id = f'{team}_{position}{counts[(team, position)]}'
+                players[player_id] = {
+                    'id': player_id,
+                    'name': row['name'],
+                    'position': position,
+                    'team': team,
+                    'team_name': self.playoff_teams[team]['name'],
+                    'projected_points': float(row.get('projected_points') or 0.0)
+                }
+        return players
+
     def _generate_sample_players(self) -> Dict:
         """Generate sample players for each playoff team"""
         players = {}
@@ -119,6 +192,10 @@ class PlayoffRosterGenerator:
         with open(self.players_file, 'w') as f:
             json.dump(players, f, indent=2)
 
+    def _save_snapshot(self, players: Dict):
+        """Save the compact catalog snapshot that web workers load at startup"""
+        write_snapshot(players, self.snapshot_file, source_version=file_version(self.players_file))
+
     def get_players_by_position(self, position: str) -> List[Dict]:
         """Get all players of a specific position"""
         with open(self.players_file, 'r') as f:
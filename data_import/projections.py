@@ -0,0 +1,241 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional
+import numpy as np
+import pandas as pd
+import yaml
+from player_catalog import file_version
+from scoring import CONFIG_FILE, DEFAULT_SCORING, STAT_CATEGORIES, ScoringSettings, get_scoring
+
+CACHE_FORMAT = 1
+GAME_LOG_KEYS = ('player_id', 'position', 'team', 'opponent', 'season', 'week')
+PROJECTION_COLUMNS = ('position', 'team', 'games', 'projected_points')
+
+class ProjectionError(Exception):
+    pass
+
+def read_game_logs(path) -> pd.DataFrame:
+    """Read one-row-per-player-game logs; stat categories not in the file count as zero"""
+    logs = pd.read_csv(path, dtype={'player_id': str, 'position': str, 'team': str, 'opponent': str})
+    missing = [column for column in GAME_LOG_KEYS if column not in logs.columns]
+    if missing:
+        raise ProjectionError(f'Game logs are missing columns: {", ".join(missing)}')
+    for category in STAT_CATEGORIES:
+        if category not in logs.columns:
+            logs[category] = 0.0
+    logs[list(STAT_CATEGORIES)] = logs[list(STAT_CATEGORIES)].fillna(0.0).astype(float)
+    return logs[list(GAME_LOG_KEYS + STAT_CATEGORIES)]
+
+def load_projections(path) -> Dict[str, float]:
+    """Player id -> projected points from a projection cache, empty if there is none"""
+    try:
+        with open(path, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {
+        player_id: projection['projected_points']
+        for player_id, projection in cache.get('projections', {}).items()
+    }
+
+class ProjectionModel:
+    """Recency-weighted, opponent-adjusted fantasy point projections
+
+    Each game is scored with the scoring settings in one matrix-vector
+    product, divided by its opponent's factor (points that opponent allowed
+    to the position relative to the league average, shrunk towards 1 by
+    prior_games), and averaged with weight decay ** games_ago. The average
+    is then scaled by the next opponent's factor. Positions are independent,
+    so each is projected on its own worker thread.
+    """
+
+    def __init__(self, settings: Optional[ScoringSettings] = None, decay: float = 0.85,
+                 prior_games: float = 4.0, workers: Optional[int] = None):
+        if not 0 < decay <= 1:
+            raise ProjectionError('decay must be in (0, 1]')
+        self.settings = settings or get_scoring(DEFAULT_SCORING)
+        self.decay = decay
+        self.prior_games = prior_games
+        self.workers = workers
+
+    @classmethod
+    def from_config(cls, path=CONFIG_FILE, **options) -> 'ProjectionModel':
+        """Build a model from the projections section of config.yml"""
+        with open(path, 'r') as f:
+            config = (yaml.safe_load(f) or {}).get('projections') or {}
+        options.setdefault('settings', get_scoring(config.get('scoring', DEFAULT_SCORING), path))
+        options.setdefault('decay', float(config.get('decay', 0.85)))
+        options.setdefault('prior_games', float(config.get('prior_games', 4)))
+        return cls(**options)
+
+    @property
+    def params(self) -> Dict:
+        return {'scoring': self.settings.weights, 'decay': self.decay, 'prior_games': self.prior_games}
+
+    def points(self, logs: pd.DataFrame) -> pd.Series:
+        """Fantasy points of every game log row; missing stats count as zero"""
+        stats = logs.reindex(columns=list(STAT_CATEGORIES), fill_value=0.0).fillna(0.0)
+        values = stats.to_numpy(dtype=np.float64)
+        return pd.Series(values @ self.settings.vector, index=logs.index)
+
+    def opponent_factors(self, logs: pd.DataFrame, points: pd.Series) -> pd.Series:
+        """Points each opponent allowed per game relative to the position average"""
+        mean = points.mean()
+        if not mean > 0:
+            return pd.Series(1.0, index=pd.Index(logs['opponent'].unique(), name='opponent'))
+        allowed = points.groupby(logs['opponent']).agg(['sum', 'count'])
+        return (allowed['sum'] + self.prior_games * mean) / (allowed['count'] + self.prior_games) / mean
+
+    def factor_table(self, logs: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+        """Position -> opponent -> factor, rounded for comparison between runs"""
+        points = self.points(logs)
+        return {
+            position: self.opponent_factors(group, points[group.index]).round(6).to_dict()
+            for position, group in logs.groupby('position', sort=True)
+        }
+
+    def project(self, logs: pd.DataFrame, opponents: Optional[Mapping[str, str]] = None,
+                player_ids: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Project every player in logs, or only player_ids
+
+        opponents maps a team to its next opponent; teams without one are
+        projected against an average defense. Opponent factors always use
+        every game of the position. Returns a frame indexed by player_id.
+        """
+        logs = logs.assign(points=self.points(logs))
+        wanted = None if player_ids is None else set(player_ids)
+        groups = [group for _, group in logs.groupby('position', sort=True)]
+        if not groups:
+            return pd.DataFrame(columns=list(PROJECTION_COLUMNS), index=pd.Index([], name='player_id'))
+
+        project = partial(self._project_position, opponents=opponents or {}, wanted=wanted)
+        with ThreadPoolExecutor(max_workers=self.workers or len(groups)) as pool:
+            frames = list(pool.map(project, groups))
+        return pd.concat(frames).sort_index()
+
+    def _project_position(self, group: pd.DataFrame, opponents: Mapping[str, str],
+                          wanted: Optional[set]) -> pd.DataFrame:
+        factors = self.opponent_factors(group, group['points'])
+        if wanted is not None:
+            group = group[group['player_id'].isin(wanted)]
+        adjusted = group['points'] / group['opponent'].map(factors).fillna(1.0)
+
+        # Most recent game first: games_ago 0, 1, 2...
+        ordered = group.sort_values(['season', 'week'], ascending=False, kind='stable')
+        games_ago = ordered.groupby('player_id').cumcount().reindex(group.index)
+        weights = self.decay ** games_ago.to_numpy(dtype=np.float64)
+
+        frame = pd.DataFrame({
+            'player_id': group['player_id'],
+            'weighted': adjusted.to_numpy() * weights,
+            'weight': weights
+        })
+        totals = frame.groupby('player_id').agg(
+            weighted=('weighted', 'sum'), weight=('weight', 'sum'), games=('weight', 'size')
+        )
+        latest = ordered.groupby('player_id')[['position', 'team']].first()
+        next_factor = latest['team'].map(opponents).map(factors).fillna(1.0)
+
+        result = latest.assign(games=totals['games'])
+        result['projected_points'] = (totals['weighted'] / totals['weight'] * next_factor).round(2)
+        return result[list(PROJECTION_COLUMNS)]
+
+class ProjectionStage:
+    """Pipeline stage turning data/game_logs.csv into data/projections.json
+
+    Results are cached by the game logs' file version. When the logs change,
+    only players whose own games changed, or whose position's opponent
+    factors moved, are projected again.
+    """
+
+    @staticmethod
+    def enabled(path=CONFIG_FILE) -> bool:
+        """Whether config.yml turns the stage on for the pipeline"""
+        with open(path, 'r') as f:
+            config = (yaml.safe_load(f) or {}).get('projections') or {}
+        return bool(config.get('enabled', False))
+
+    def __init__(self, data_dir: str = 'data', model: Optional[ProjectionModel] = None):
+        self.data_dir = Path(data_dir)
+        self.logs_file = self.data_dir / 'game_logs.csv'
+        self.cache_file = self.data_dir / 'projections.json'
+        self.model = model or ProjectionModel.from_config()
+
+    def _load_cache(self) -> Optional[Dict]:
+        try:
+            with open(self.cache_file, 'r') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return cache if cache.get('format') == CACHE_FORMAT else None
+
+    def _save_cache(self, cache: Dict):
+        tmp_file = self.cache_file.with_name(f'.{self.cache_file.name}.{os.getpid()}.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_file, self.cache_file)
+
+    @staticmethod
+    def input_hashes(logs: pd.DataFrame) -> Dict[str, str]:
+        """Player id -> hash of that player's game log rows, independent of row order"""
+        row_hashes = pd.util.hash_pandas_object(logs, index=False)
+        return {
+            player_id: format(int(value), 'x')
+            for player_id, value in row_hashes.groupby(logs['player_id'].to_numpy()).sum().items()
+        }
+
+    def run(self, opponents: Optional[Mapping[str, str]] = None) -> Dict:
+        """Bring the projection cache up to date with the game logs"""
+        version = file_version(self.logs_file)
+        if version == '0':
+            return {'skipped': True, 'reason': f'no game logs at {self.logs_file}'}
+
+        opponents = dict(opponents or {})
+        cache = self._load_cache()
+        settings = {'model': self.model.params, 'opponents': opponents}
+        if cache is not None and cache['settings'] != json.loads(json.dumps(settings)):
+            cache = None
+        if cache is not None and cache['stats_version'] == version:
+            return {'skipped': False, 'stats_version': version, 'projected': 0,
+                    'reused': len(cache['projections'])}
+
+        logs = read_game_logs(self.logs_file)
+        hashes = self.input_hashes(logs)
+        factors = self.model.factor_table(logs)
+        previous = cache['projections'] if cache is not None else {}
+        if cache is None:
+            changed = set(hashes)
+        else:
+            moved = {p for p in factors if factors[p] != cache['factors'].get(p)}
+            changed = {
+                player_id for player_id, digest in hashes.items()
+                if cache['inputs'].get(player_id) != digest or player_id not in previous
+            }
+            changed |= set(logs.loc[logs['position'].isin(moved), 'player_id'])
+
+        projected = self.model.project(logs, opponents, player_ids=changed)
+        projections = {
+            player_id: projection for player_id, projection in previous.items()
+            if player_id in hashes and player_id not in changed
+        }
+        for player_id, row in projected.iterrows():
+            projections[player_id] = {
+                'position': row['position'],
+                'team': row['team'],
+                'games': int(row['games']),
+                'projected_points': float(row['projected_points'])
+            }
+
+        self._save_cache({
+            'format': CACHE_FORMAT,
+            'stats_version': version,
+            'settings': settings,
+            'inputs': hashes,
+            'factors': factors,
+            'projections': dict(sorted(projections.items()))
+        })
+        return {'skipped': False, 'stats_version': version, 'projected': len(projected),
+                'reused': len(projections) - len(projected)}
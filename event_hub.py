@@ -0,0 +1,169 @@
+import json
+import queue
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+class Subscription:
+    """One connected client, the league it watches and the rosters it follows"""
+    __slots__ = ('league_id', 'roster_ids', 'messages', 'lagged')
+
+    def __init__(self, roster_ids: Optional[Iterable[str]] = None, max_queue: int = 100,
+                 league_id: Optional[str] = None):
+        self.league_id = league_id
+        self.roster_ids = frozenset(roster_ids) if roster_ids else None
+        self.messages = queue.Queue(maxsize=max_queue)
+        self.lagged = False
+
+    def wants(self, roster_id: Optional[str]) -> bool:
+        return self.roster_ids is None or roster_id is None or roster_id in self.roster_ids
+
+def format_event(event: str, data) -> str:
+    """Format one Server-Sent Events message"""
+    return f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+class EventHub:
+    """Fan-out hub that coalesces updates and broadcasts them once per tick
+
+    Publishers only update pending state. Once per tick the hub works out
+    which scores and ranks changed, serializes each distinct payload once and
+    hands it to every interested subscriber, so a burst of stat events costs
+    one broadcast rather than one recomputation per client.
+
+    Scores, ranks and events are kept per league, and a subscriber only
+    hears about the league it subscribed to.
+    """
+
+    def __init__(self, tick: float = 1.0, heartbeat: float = 15.0, max_queue: int = 100,
+                 reconnect_ms: int = 5000):
+        self.tick = tick
+        self.heartbeat = heartbeat
+        self.max_queue = max_queue
+        self.reconnect_ms = reconnect_ms
+        self._subscribers: Set[Subscription] = set()
+        # League id -> roster id -> latest score / rank / score changed this tick
+        self._scores: Dict[Optional[str], Dict[str, float]] = {}
+        self._ranks: Dict[Optional[str], Dict[str, int]] = {}
+        self._changed_scores: Dict[Optional[str], Dict[str, float]] = {}
+        self._events: Dict[Tuple[Optional[str], str, Optional[str]], Tuple[Optional[str], Dict]] = {}
+        self._lock = threading.Lock()
+        self._ticker = None
+
+    def subscribe(self, roster_ids: Optional[Iterable[str]] = None,
+                  league_id: Optional[str] = None) -> Subscription:
+        """Register a client for one league, starting the tick thread on first use"""
+        subscription = Subscription(roster_ids, self.max_queue, league_id)
+        with self._lock:
+            self._subscribers.add(subscription)
+            if self._ticker is None:
+                self._ticker = threading.Thread(target=self._run, name='EventHubTicker', daemon=True)
+                self._ticker.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event: str, data: Dict, roster_id: Optional[str] = None,
+                league_id: Optional[str] = None):
+        """Queue an event; repeats for the same roster within a tick are coalesced"""
+        with self._lock:
+            if self._subscribers:
+                self._events[(league_id, event, roster_id)] = (roster_id, data)
+
+    def publish_scores(self, scores: Dict[str, float], league_id: Optional[str] = None):
+        """Record new roster scores of a league; only the latest value per tick is sent"""
+        with self._lock:
+            current = self._scores.setdefault(league_id, {})
+            changed = self._changed_scores.setdefault(league_id, {})
+            for roster_id, score in scores.items():
+                if current.get(roster_id) != score:
+                    current[roster_id] = score
+                    changed[roster_id] = score
+
+    def _run(self):
+        while True:
+            time.sleep(self.tick)
+            self.flush()
+
+    def _rank_moves(self, league_id: Optional[str]) -> Dict[str, Dict[str, int]]:
+        scores = self._scores[league_id]
+        previous = self._ranks.get(league_id, {})
+        ordered = sorted(scores, key=scores.get, reverse=True)
+        ranks = {roster_id: rank for rank, roster_id in enumerate(ordered, start=1)}
+        moves = {
+            roster_id: {'rank': rank, 'previous': previous.get(roster_id)}
+            for roster_id, rank in ranks.items()
+            if previous.get(roster_id) != rank
+        }
+        self._ranks[league_id] = ranks
+        return moves
+
+    def flush(self) -> int:
+        """Broadcast everything published since the last tick
+
+        Returns the number of messages delivered.
+        """
+        with self._lock:
+            events, self._events = self._events, {}
+            changed = {league_id: scores for league_id, scores in self._changed_scores.items() if scores}
+            self._changed_scores = {}
+            moves = {league_id: self._rank_moves(league_id) for league_id in changed}
+            subscribers = list(self._subscribers)
+
+        if not subscribers or not (events or changed):
+            return 0
+
+        broadcast = []
+        for (league_id, event, _), (roster_id, data) in events.items():
+            broadcast.append((league_id, roster_id, format_event(event, data)))
+        everything = {
+            league_id: format_event('update', {'scores': scores, 'ranks': moves[league_id]})
+            for league_id, scores in changed.items()
+        }
+
+        delivered = 0
+        for subscription in subscribers:
+            league_id = subscription.league_id
+            messages = [
+                message for event_league, roster_id, message in broadcast
+                if event_league == league_id and subscription.wants(roster_id)
+            ]
+            if league_id in changed:
+                if subscription.roster_ids is None:
+                    messages.append(everything[league_id])
+                else:
+                    league_scores, league_moves = changed[league_id], moves[league_id]
+                    scores = {r: league_scores[r] for r in subscription.roster_ids if r in league_scores}
+                    ranks = {r: league_moves[r] for r in subscription.roster_ids if r in league_moves}
+                    if scores or ranks:
+                        messages.append(format_event('update', {'scores': scores, 'ranks': ranks}))
+            for message in messages:
+                try:
+                    subscription.messages.put_nowait(message)
+                    delivered += 1
+                except queue.Full:
+                    subscription.lagged = True
+        return delivered
+
+    def stream(self, subscription: Subscription) -> Iterator[str]:
+        """Yield SSE messages for a subscription until the client disconnects"""
+        try:
+            yield f'retry: {self.reconnect_ms}\n\n'
+            while True:
+                try:
+                    message = subscription.messages.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ': keep-alive\n\n'
+                    continue
+                if subscription.lagged:
+                    # The client missed updates; tell it to refetch full state
+                    subscription.lagged = False
+                    yield format_event('resync', {})
+                yield message
+        finally:
+            self.unsubscribe(subscription)
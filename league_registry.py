@@ -0,0 +1,189 @@
+import json
+import re
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Optional
+from league_rules import DEFAULT_FORMAT
+from player_catalog import PlayerCatalog, SeasonCatalogs
+from roster_manager import RosterManager
+from roster_serialization import DEFAULT_LEAGUE
+from scoring import DEFAULT_SCORING
+
+_LEAGUE_ID = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+class LeagueError(Exception):
+    pass
+
+class LeagueRegistry:
+    """Per-league roster stores, loaded on first use and dropped when idle
+
+    Each league keeps its rosters, write-ahead log and in-memory indexes in
+    data/leagues/<league_id>/, so queries and analytics only ever touch one
+    league. The default league keeps the original data/rosters/ location.
+    All leagues share one player catalog.
+
+    A league is opened outside the registry lock, so a slow load only holds
+    up requests for that league; concurrent requests for it wait on the one
+    load. An evicted league is only unreferenced, so requests still holding
+    it finish normally, and its write-ahead log is closed once the last of
+    them lets go. Until then the league is handed out again rather than
+    reopened, so there is never more than one manager, and one lineup index,
+    per league. Idle leagues are swept every sweep_interval seconds (a
+    quarter of idle_timeout by default) by a background thread.
+    """
+
+    def __init__(self, data_dir: str = 'data', idle_timeout: float = 900.0,
+                 sweep_interval: Optional[float] = None, **manager_options):
+        self.data_dir = Path(data_dir)
+        self.leagues_dir = self.data_dir / 'leagues'
+        self.idle_timeout = idle_timeout
+        self.sweep_interval = idle_timeout / 4 if sweep_interval is None else sweep_interval
+        self.manager_options = manager_options
+        self.catalog = PlayerCatalog()
+        self.seasons = SeasonCatalogs(self.data_dir / 'seasons')
+        self._loaded: Dict[str, RosterManager] = {}
+        # Evicted leagues some request still holds
+        self._released: 'weakref.WeakValueDictionary[str, RosterManager]' = weakref.WeakValueDictionary()
+        self._last_used: Dict[str, float] = {}
+        self._loading: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._swept_at = time.monotonic()
+        self._sweeper = None
+
+    @staticmethod
+    def validate_id(league_id: str) -> str:
+        if not _LEAGUE_ID.match(league_id or ''):
+            raise LeagueError(f'Invalid league id: {league_id!r}')
+        return league_id
+
+    def league_dir(self, league_id: str) -> Path:
+        return self.leagues_dir / self.validate_id(league_id)
+
+    def _settings(self, league_id: str) -> Dict:
+        try:
+            with open(self.league_dir(league_id) / 'league.json', 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def create(self, league_id: str, league_format: str = DEFAULT_FORMAT,
+               scoring: str = DEFAULT_SCORING) -> RosterManager:
+        """Create a league, recording its format and scoring settings"""
+        league_dir = self.league_dir(league_id)
+        league_dir.mkdir(parents=True, exist_ok=True)
+        with open(league_dir / 'league.json', 'w') as f:
+            json.dump({'league_id': league_id, 'format': league_format, 'scoring': scoring}, f)
+        return self.get(league_id)
+
+    def exists(self, league_id: str) -> bool:
+        return league_id == DEFAULT_LEAGUE or self.league_dir(league_id).exists()
+
+    def league_ids(self) -> List[str]:
+        """Every league on disk, loaded or not"""
+        ids = [path.name for path in self.leagues_dir.glob('*') if path.is_dir()]
+        return sorted(set(ids) | {DEFAULT_LEAGUE})
+
+    def rosters_dir(self, league_id: str) -> Path:
+        if league_id == DEFAULT_LEAGUE:
+            return self.data_dir / 'rosters'
+        return self.league_dir(league_id) / 'rosters'
+
+    def league_options(self, league_id: str) -> Dict:
+        """RosterManager options of a league: the registry's, with its recorded format and scoring"""
+        options = dict(self.manager_options)
+        if league_id != DEFAULT_LEAGUE:
+            settings = self._settings(league_id)
+            options['league_format'] = settings.get('format', options.get('league_format', DEFAULT_FORMAT))
+            options['scoring'] = settings.get('scoring', options.get('scoring', DEFAULT_SCORING))
+        return options
+
+    def _open(self, league_id: str) -> RosterManager:
+        return RosterManager(
+            str(self.data_dir),
+            league_id=league_id,
+            rosters_dir=str(self.rosters_dir(league_id)),
+            catalog=self.catalog,
+            seasons=self.seasons,
+            **self.league_options(league_id)
+        )
+
+    def get(self, league_id: str = DEFAULT_LEAGUE) -> RosterManager:
+        """Get a league's roster manager, loading it on first use"""
+        league_id = self.validate_id(league_id)
+        with self._lock:
+            manager = self._loaded.get(league_id)
+            if manager is None:
+                manager = self._released.pop(league_id, None)
+                if manager is not None:
+                    self._loaded[league_id] = manager
+            if manager is not None:
+                self._touch(league_id, time.monotonic())
+                return manager
+            loading = self._loading.get(league_id)
+            opening = loading is None
+            if opening:
+                loading = self._loading[league_id] = Future()
+        if not opening:
+            return loading.result()
+
+        try:
+            if not self.exists(league_id):
+                raise LeagueError(f'Unknown league: {league_id}')
+            manager = self._open(league_id)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[league_id]
+            loading.set_exception(e)
+            raise
+        # Close the log file once neither the registry nor any request holds the league
+        weakref.finalize(manager, manager.wal.close)
+        with self._lock:
+            del self._loading[league_id]
+            self._loaded[league_id] = manager
+            self._touch(league_id, time.monotonic())
+            if self._sweeper is None and self.sweep_interval > 0:
+                self._sweeper = threading.Thread(
+                    target=_sweep, args=(weakref.ref(self), self.sweep_interval),
+                    name='LeagueSweeper', daemon=True
+                )
+                self._sweeper.start()
+        loading.set_result(manager)
+        return manager
+
+    def _touch(self, league_id: str, now: float):
+        self._last_used[league_id] = now
+        if now - self._swept_at > self.idle_timeout / 4:
+            self._evict_idle(now)
+
+    def _evict_idle(self, now: float):
+        self._swept_at = now
+        for league_id, last_used in list(self._last_used.items()):
+            if now - last_used > self.idle_timeout:
+                self._released[league_id] = self._loaded.pop(league_id)
+                del self._last_used[league_id]
+
+    def evict_idle(self) -> int:
+        """Drop leagues unused for idle_timeout seconds; returns how many were dropped"""
+        with self._lock:
+            before = len(self._loaded)
+            self._evict_idle(time.monotonic())
+            return before - len(self._loaded)
+
+    def is_loaded(self, league_id: str) -> bool:
+        return league_id in self._loaded
+
+    def __len__(self) -> int:
+        return len(self._loaded)
+
+def _sweep(registry_ref: 'weakref.ref[LeagueRegistry]', interval: float):
+    """Evict idle leagues every interval seconds until the registry is gone"""
+    while True:
+        time.sleep(interval)
+        registry = registry_ref()
+        if registry is None:
+            return
+        registry.evict_idle()
+        del registry
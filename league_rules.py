@@ -0,0 +1,136 @@
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+import yaml
+from player_catalog import Player, file_version
+
+CONFIG_FILE = Path(__file__).resolve().parent / 'config.yml'
+DEFAULT_FORMAT = 'standard'
+
+class LeagueRulesError(Exception):
+    pass
+
+@dataclass(frozen=True)
+class SlotRule:
+    name: str
+    label: str
+    positions: Tuple[str, ...]
+
+class LeagueFormat:
+    """Roster slot rules compiled into position x slot eligibility bitmasks
+
+    eligibility maps each position to a bitmask with bit i set when the
+    position may fill slot i, so checking a lineup is one dict lookup and one
+    bit test per slot. Compiled formats are immutable and shared.
+    """
+
+    def __init__(self, name: str, slots: Sequence[SlotRule], unique_teams: bool = True):
+        if not slots:
+            raise LeagueRulesError(f'League format {name} has no slots')
+        self.name = name
+        self.slot_rules = tuple(slots)
+        self.slots = tuple(rule.name for rule in self.slot_rules)
+        if len(set(self.slots)) != len(self.slots):
+            raise LeagueRulesError(f'League format {name} repeats a slot name')
+        self.unique_teams = unique_teams
+        self.slot_index = {slot: i for i, slot in enumerate(self.slots)}
+        self.positions = tuple(sorted({p for rule in self.slot_rules for p in rule.positions}))
+
+        eligibility: Dict[str, int] = dict.fromkeys(self.positions, 0)
+        for i, rule in enumerate(self.slot_rules):
+            for position in rule.positions:
+                eligibility[position] |= 1 << i
+        self.eligibility = eligibility
+        self.full_mask = (1 << len(self.slots)) - 1
+
+        # Slots accepting the same positions are interchangeable, e.g. rb1/rb2
+        groups: Dict[frozenset, list] = {}
+        for rule in self.slot_rules:
+            groups.setdefault(frozenset(rule.positions), []).append(rule.name)
+        self.slot_groups = tuple(tuple(group) for group in groups.values())
+
+    def __repr__(self) -> str:
+        return f'LeagueFormat({self.name!r}, slots={self.slots!r})'
+
+    def slot_mask(self, position: str) -> int:
+        """Bitmask of the slots a position may fill"""
+        return self.eligibility.get(position, 0)
+
+    def named_slots_mask(self, name: str) -> int:
+        """Bitmask of the slots a name refers to, or 0 if none
+
+        name matches slot names and labels case-insensitively; failing that it
+        matches every slot numbered after it, so FLEX covers flex1 and flex2.
+        """
+        key = name.lower()
+        exact = numbered = 0
+        for i, rule in enumerate(self.slot_rules):
+            for slot_name in {rule.name.lower(), rule.label.lower()}:
+                if slot_name == key:
+                    exact |= 1 << i
+                elif slot_name.startswith(key) and slot_name[len(key):].isdigit():
+                    numbered |= 1 << i
+        return exact or numbered
+
+    def is_eligible(self, position: str, slot: str) -> bool:
+        """Whether a position may fill a slot"""
+        return bool(self.eligibility.get(position, 0) >> self.slot_index[slot] & 1)
+
+    def validate(self, players: Mapping[str, Player]) -> Optional[str]:
+        """Return the first rule a lineup breaks, or None if it is legal"""
+        for slot in players:
+            if slot not in self.slot_index:
+                return f'Unknown roster slot: {slot}'
+        eligibility = self.eligibility
+        for i, rule in enumerate(self.slot_rules):
+            player = players.get(rule.name)
+            if player is None:
+                return f'Missing {rule.label} selection'
+            if not eligibility.get(player.position, 0) >> i & 1:
+                return f'Invalid {rule.label} selection'
+        if self.unique_teams and len({p.team for p in players.values()}) != len(players):
+            return 'Cannot select multiple players from the same team'
+        return None
+
+def compile_formats(config: Mapping) -> Dict[str, LeagueFormat]:
+    """Compile the league_formats section of a parsed config"""
+    formats = {}
+    for name, spec in (config.get('league_formats') or {}).items():
+        try:
+            slots = [
+                SlotRule(
+                    name=str(slot['name']),
+                    label=str(slot.get('label', slot['name'])),
+                    positions=tuple(slot['positions'])
+                )
+                for slot in spec['slots']
+            ]
+        except (KeyError, TypeError) as e:
+            raise LeagueRulesError(f'Malformed league format {name}: {e}')
+        formats[name] = LeagueFormat(name, slots, unique_teams=spec.get('unique_teams', True))
+    return formats
+
+_compiled: Dict[Path, Tuple[str, Dict[str, LeagueFormat]]] = {}
+_compiled_lock = threading.Lock()
+
+def load_formats(path=CONFIG_FILE) -> Dict[str, LeagueFormat]:
+    """Get every league format in a config file, compiling it once per file version"""
+    path = Path(path)
+    version = file_version(path)
+    cached = _compiled.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _compiled_lock:
+        with open(path, 'r') as f:
+            formats = compile_formats(yaml.safe_load(f) or {})
+        _compiled[path] = (version, formats)
+    return formats
+
+def get_format(name: str = DEFAULT_FORMAT, path=CONFIG_FILE) -> LeagueFormat:
+    """Get a compiled league format by name"""
+    formats = load_formats(path)
+    if name not in formats:
+        raise LeagueRulesError(f'Unknown league format: {name}')
+    return formats[name]
@@ -0,0 +1,81 @@
+import hashlib
+import threading
+from collections import defaultdict
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+# Slots whose players are interchangeable. Sorting ids within a group makes
+# rb1=A, rb2=B and rb1=B, rb2=A the same lineup.
+SLOT_GROUPS: Tuple[Tuple[str, ...], ...] = (
+    ('qb',), ('rb1', 'rb2'), ('wr1', 'wr2', 'wr3'), ('te',),
+    ('superflex',), ('flex',), ('kicker',), ('defense',)
+)
+
+def lineup_key(player_ids: Mapping[str, str],
+               slot_groups: Sequence[Tuple[str, ...]] = SLOT_GROUPS) -> str:
+    """Build the canonical, slot-normalized description of a lineup"""
+    return '|'.join(
+        ','.join(sorted(player_ids[slot] for slot in group))
+        for group in slot_groups
+    )
+
+def lineup_hash(player_ids: Mapping[str, str],
+                slot_groups: Sequence[Tuple[str, ...]] = SLOT_GROUPS) -> str:
+    """Hash a lineup so identical lineups share a key"""
+    key = lineup_key(player_ids, slot_groups).encode('utf-8')
+    return hashlib.blake2b(key, digest_size=12).hexdigest()
+
+class LineupIndex:
+    """Lineup hash -> roster ids, for duplicate checks and shared scoring"""
+
+    def __init__(self):
+        self._rosters: Dict[str, List[str]] = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def add(self, lineup: str, roster_id: str):
+        """Record a roster under its lineup hash"""
+        with self._lock:
+            self._rosters[lineup].append(roster_id)
+
+    def claim(self, lineup: str, roster_id: str, unique: bool = False) -> bool:
+        """Record a roster, refusing when unique is set and the lineup exists"""
+        with self._lock:
+            if unique and self._rosters.get(lineup):
+                return False
+            self._rosters[lineup].append(roster_id)
+            return True
+
+    def discard(self, lineup: str, roster_id: str):
+        """Remove a roster, e.g. when saving it failed after claim"""
+        with self._lock:
+            roster_ids = self._rosters.get(lineup)
+            if roster_ids and roster_id in roster_ids:
+                roster_ids.remove(roster_id)
+                if not roster_ids:
+                    del self._rosters[lineup]
+
+    def count(self, lineup: str) -> int:
+        """Number of rosters using a lineup"""
+        roster_ids = self._rosters.get(lineup)
+        return len(roster_ids) if roster_ids else 0
+
+    def roster_ids(self, lineup: str) -> List[str]:
+        """Rosters using a lineup"""
+        return list(self._rosters.get(lineup, ()))
+
+    def duplicates(self, min_count: int = 2) -> Dict[str, List[str]]:
+        """Lineups submitted by at least min_count rosters"""
+        with self._lock:
+            return {
+                lineup: list(roster_ids)
+                for lineup, roster_ids in self._rosters.items()
+                if len(roster_ids) >= min_count
+            }
+
+    def groups(self) -> Iterator[Tuple[str, List[str]]]:
+        """Iterate unique lineups with their rosters, so each is scored once"""
+        with self._lock:
+            items = [(lineup, list(roster_ids)) for lineup, roster_ids in self._rosters.items()]
+        return iter(items)
+
+    def __len__(self) -> int:
+        return len(self._rosters)
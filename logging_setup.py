@@ -0,0 +1,172 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Loggers with a file of their own; every other record goes to app.log
+LOG_FILES = {'NFLPipeline': 'pipeline.log', 'NFLApiClient': 'nfl_api.log'}
+DEFAULT_LOG_FILE = 'app.log'
+# Loggers echoed to the console at INFO; the rest only from WARNING up
+CONSOLE_LOGGERS = ('NFLPipeline',)
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """One compact JSON object per record, including any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+            'thread': record.threadName
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class RateLimitFilter(logging.Filter):
+    """Let at most burst warnings and errors per call site through each interval
+
+    Records dropped in a window are counted, and the next record let through
+    from that site carries the count as suppressed=N.
+    """
+
+    def __init__(self, interval: float = 60.0, burst: int = 5):
+        super().__init__()
+        self.interval = interval
+        self.burst = burst
+        self._windows: Dict[Tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                suppressed = window[2] if window else 0
+                window = self._windows[key] = [now, 0, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+            if window[1] >= self.burst:
+                window[2] += 1
+                return False
+            window[1] += 1
+        return True
+
+class _RouteFilter(logging.Filter):
+    def __init__(self, names=None, exclude=()):
+        super().__init__()
+        self.names = names
+        self.exclude = tuple(exclude)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.names is not None:
+            return record.name in self.names
+        return record.name not in self.exclude
+
+class _LogFileHandler(WatchedFileHandler):
+    """Reopens its file when it is rotated or deleted, recreating the directory too"""
+
+    def _open(self):
+        Path(self.baseFilename).parent.mkdir(parents=True, exist_ok=True)
+        return super()._open()
+
+class _ConsoleFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or record.name in CONSOLE_LOGGERS
+
+_state: Dict[str, object] = {}
+_state_lock = threading.Lock()
+
+def _open_handlers(log_dir: Path, json_format: bool, console: bool):
+    formatter = JsonFormatter() if json_format else logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    handlers = []
+    for name, filename in LOG_FILES.items():
+        handler = _LogFileHandler(log_dir / filename)
+        handler.addFilter(_RouteFilter(names={name}))
+        handlers.append(handler)
+    default = _LogFileHandler(log_dir / DEFAULT_LOG_FILE)
+    default.addFilter(_RouteFilter(exclude=LOG_FILES))
+    handlers.append(default)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    if console:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
+        console_handler.addFilter(_ConsoleFilter())
+        handlers.append(console_handler)
+    return handlers
+
+def configure_logging(log_dir: Optional[str] = None, level: int = logging.INFO,
+                      json_format: Optional[bool] = None, console: bool = True) -> QueueListener:
+    """Route all logging through one queue to a background writer thread
+
+    Loggers only enqueue records, so request and fetch paths never wait on
+    disk. Safe to call repeatedly: the first call sets up the process, later
+    ones only recreate log files that have been deleted.
+    """
+    with _state_lock:
+        listener = _state.get('listener')
+        if listener is not None:
+            for handler in listener.handlers:
+                if isinstance(handler, WatchedFileHandler):
+                    with handler.lock:
+                        handler.reopenIfNeeded()
+            return listener
+
+        log_dir = Path(log_dir or os.environ.get('LOG_DIR', 'logs'))
+        log_dir.mkdir(parents=True, exist_ok=True)
+        if json_format is None:
+            json_format = os.environ.get('LOG_FORMAT', 'json') == 'json'
+
+        log_queue = queue.Queue(-1)
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter())
+        root = logging.getLogger()
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        listener = QueueListener(
+            log_queue, *_open_handlers(log_dir, json_format, console), respect_handler_level=True
+        )
+        listener.start()
+        atexit.register(shutdown_logging)
+        _state.update(listener=listener, queue=log_queue, handler=queue_handler, log_dir=log_dir)
+        return listener
+
+def flush_logging():
+    """Block until every record logged so far has been written"""
+    log_queue = _state.get('queue')
+    if log_queue is not None:
+        log_queue.join()
+
+def shutdown_logging():
+    """Write out queued records, stop the writer thread and close the log files"""
+    with _state_lock:
+        listener = _state.pop('listener', None)
+        if listener is None:
+            return
+        logging.getLogger().removeHandler(_state.pop('handler'))
+        _state.clear()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
@@ -0,0 +1,296 @@
+import os
+import sys
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import roster_serialization
+from roster_serialization import ROSTER_SLOTS
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_COLUMNS = ('id', 'name', 'position', 'team', 'team_name', 'projected_points')
+
+# weakref_slot lets the catalog's intern table drop records no roster uses any more
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class Player:
+    id: str
+    name: str
+    position: str
+    team: str
+    projected_points: float = 0.0
+
+def write_snapshot(players: Dict[str, Dict], path, source_version: str):
+    """Write a compact, columnar catalog snapshot that workers can load quickly
+
+    source_version identifies the players.json the snapshot was built from,
+    so readers can tell when the snapshot is stale.
+    """
+    path = Path(path)
+    snapshot = {
+        'format': SNAPSHOT_FORMAT,
+        'source_version': source_version,
+        'columns': list(SNAPSHOT_COLUMNS),
+        'rows': [[player.get(column) for column in SNAPSHOT_COLUMNS] for player in players.values()]
+    }
+    tmp_file = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(roster_serialization.dumps(snapshot))
+    os.replace(tmp_file, path)
+
+def read_snapshot(path, source_version: Optional[str] = None) -> Optional[Dict[str, Dict]]:
+    """Read a catalog snapshot, or None if it is missing, stale or unreadable"""
+    try:
+        with open(path, 'rb') as f:
+            snapshot = roster_serialization.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if snapshot.get('format') != SNAPSHOT_FORMAT:
+        return None
+    if source_version is not None and snapshot.get('source_version') != source_version:
+        return None
+    columns = snapshot['columns']
+    return {row[0]: dict(zip(columns, row)) for row in snapshot['rows']}
+
+def file_version(path) -> str:
+    """Cheap token that changes whenever a file is rewritten"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return '0'
+    return f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+
+class PlayerCatalog:
+    """Interned, shared Player records with compact integer indexes
+
+    Every roster that references a player holds the same immutable Player
+    object, and every player id maps to a stable small integer so rosters can
+    be stored as rows of ints.
+    """
+
+    def __init__(self):
+        self._current: Dict[str, Player] = {}
+        # Version of the players file the current entries came from
+        self.version: Optional[str] = None
+        # Weak, so superseded records go away with the last roster holding them
+        self._interned: 'weakref.WeakValueDictionary[Tuple, Player]' = weakref.WeakValueDictionary()
+        self._index: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._lock = threading.Lock()
+
+    def load(self, players: Dict[str, Dict], version: Optional[str] = None):
+        """Replace the current catalog entries, keeping interned records"""
+        current = {}
+        for player_id, info in players.items():
+            current[player_id] = self.intern(
+                info.get('id', player_id),
+                info['name'],
+                info['position'],
+                info['team'],
+                info.get('projected_points', 0.0)
+            )
+        self._current = current
+        self.version = version
+
+    def apply_change(self, change):
+        """Move to change.to_version by updating only the players it touches"""
+        current = dict(self._current)
+        for player_id in change.removed:
+            current.pop(player_id, None)
+        for player_id, info in change.added.items():
+            current[player_id] = self.intern_dict(info)
+        for player_id, fields in change.changed.items():
+            player = current[player_id]
+            values = {name: getattr(player, name) for name in Player.__slots__}
+            for name, (_, new) in fields.items():
+                if name in values:
+                    values[name] = new
+            current[player_id] = self.intern(
+                values['id'],
+                values['name'],
+                values['position'],
+                values['team'],
+                values['projected_points']
+            )
+        self._current = current
+        self.version = change.to_version
+
+    def intern(self, player_id: str, name: str, position: str, team: str,
+               projected_points: float = 0.0) -> Player:
+        """Return the shared Player record for these field values"""
+        key = (player_id, name, position, team, projected_points)
+        player = self._interned.get(key)
+        if player is not None:
+            return player
+
+        with self._lock:
+            player = self._interned.get(key)
+            if player is None:
+                player = Player(
+                    id=sys.intern(player_id),
+                    name=sys.intern(name),
+                    position=sys.intern(position),
+                    team=sys.intern(team),
+                    projected_points=projected_points
+                )
+                self._interned[key] = player
+                self._register(player.id)
+            return player
+
+    def intern_dict(self, data: Optional[Dict]) -> Optional[Player]:
+        """Return the shared Player record for a serialized player"""
+        if not data:
+            return None
+        return self.intern(
+            data['id'],
+            data['name'],
+            data['position'],
+            data['team'],
+            data.get('projected_points', 0.0)
+        )
+
+    def _register(self, player_id: str) -> int:
+        index = self._index.get(player_id)
+        if index is None:
+            index = len(self._ids)
+            self._index[player_id] = index
+            self._ids.append(player_id)
+        return index
+
+    def get(self, player_id: str) -> Optional[Player]:
+        """Get the current catalog record for a player id"""
+        return self._current.get(player_id)
+
+    def __getitem__(self, player_id: str) -> Player:
+        return self._current[player_id]
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._current
+
+    def __iter__(self) -> Iterator[Player]:
+        return iter(self._current.values())
+
+    def __len__(self) -> int:
+        return len(self._current)
+
+    def index_of(self, player_id: str) -> int:
+        """Get the compact integer index for a player id, assigning one if new"""
+        index = self._index.get(player_id)
+        if index is None:
+            with self._lock:
+                index = self._register(player_id)
+        return index
+
+    def id_at(self, index: int) -> str:
+        """Get the player id for a compact integer index"""
+        return self._ids[index]
+
+    @property
+    def size(self) -> int:
+        """Number of player ids that have been assigned an index"""
+        return len(self._ids)
+
+class SeasonCatalogs:
+    """Lazily loaded, per-season player catalogs with an LRU of active seasons
+
+    Each season's catalog is archived as a snapshot in directory and only
+    read on first access. At most max_active seasons stay in memory, so
+    looking up an old contest does not grow the current one's catalog.
+    """
+
+    def __init__(self, directory, max_active: int = 2):
+        self.directory = Path(directory)
+        self.max_active = max_active
+        self._active: 'OrderedDict[int, PlayerCatalog]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def path_for(self, season: int) -> Path:
+        return self.directory / f'{season}.snapshot.json'
+
+    def publish(self, season: int, players: Dict[str, Dict], source_version: str = ''):
+        """Archive a season's players, replacing any loaded copy"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_snapshot(players, self.path_for(season), source_version=source_version)
+        with self._lock:
+            self._active.pop(season, None)
+
+    def seasons(self) -> List[int]:
+        """Seasons with an archived catalog, oldest first"""
+        return sorted(int(path.name.split('.')[0]) for path in self.directory.glob('*.snapshot.json'))
+
+    def get(self, season: int) -> PlayerCatalog:
+        """Get a season's catalog, loading its archive on first use
+
+        Seasons without an archive get an empty catalog, which still interns
+        the players embedded in that season's rosters.
+        """
+        with self._lock:
+            catalog = self._active.get(season)
+            if catalog is not None:
+                self._active.move_to_end(season)
+                return catalog
+
+        catalog = PlayerCatalog()
+        players = read_snapshot(self.path_for(season))
+        if players is not None:
+            catalog.load(players)
+
+        with self._lock:
+            # Another thread may have loaded it meanwhile; keep the first copy
+            catalog = self._active.setdefault(season, catalog)
+            self._active.move_to_end(season)
+            while len(self._active) > self.max_active:
+                self._active.popitem(last=False)
+        return catalog
+
+    def is_loaded(self, season: int) -> bool:
+        return season in self._active
+
+class RosterTable:
+    """Array-backed N x len(slots) table of catalog player indexes
+
+    Rows are stored in a flat int32 array, which keeps 200k rosters under
+    10 MB and can be viewed as a NumPy matrix without copying.
+    """
+
+    def __init__(self, catalog: PlayerCatalog, slots: Sequence[str] = ROSTER_SLOTS):
+        self.catalog = catalog
+        self.slots = tuple(slots)
+        self.roster_ids: List[str] = []
+        self._rows = array('i')
+
+    @property
+    def width(self) -> int:
+        return len(self.slots)
+
+    def append(self, roster_id: str, player_ids: Sequence[str]):
+        """Add a roster given its player ids in slot order"""
+        self._rows.extend(self.catalog.index_of(player_id) for player_id in player_ids)
+        self.roster_ids.append(roster_id)
+
+    def append_roster(self, roster):
+        """Add a Roster object"""
+        lineup = roster.lineup()
+        self.append(roster.id, [lineup[slot].id for slot in self.slots])
+
+    def row(self, position: int) -> Tuple[int, ...]:
+        """Get the player indexes for the roster at a table position"""
+        start = position * self.width
+        return tuple(self._rows[start:start + self.width])
+
+    def __len__(self) -> int:
+        return len(self.roster_ids)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._rows) * self._rows.itemsize
+
+    def to_numpy(self):
+        """View the table as an (N, width) int32 NumPy array without copying
+
+        The table cannot grow while the returned view is alive.
+        """
+        import numpy as np
+        return np.frombuffer(self._rows, dtype=np.int32).reshape(-1, self.width)
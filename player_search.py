@@ -0,0 +1,189 @@
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from league_rules import LeagueFormat, get_format
+from player_catalog import Player
+
+_SEPARATORS = re.compile(r"[\s\-_/]+")
+_DROPPED = re.compile(r"[^a-z0-9 ]+")
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and punctuation: "Amon-Ra St. Brown" -> "amon ra st brown" """
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii')
+    text = _SEPARATORS.sub(' ', text.lower())
+    return _DROPPED.sub('', text).strip()
+
+def trigrams(token: str) -> Set[str]:
+    """Character trigrams of a token, padded so short tokens still produce some"""
+    padded = f'  {token} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class PlayerSearchIndex:
+    """Prefix and trigram index over player names for one catalog version
+
+    Every prefix of every name token maps to the players containing it, so a
+    query is answered with a few set intersections. Queries with no prefix
+    match (typos) fall back to trigram similarity.
+    """
+
+    # Below this trigram similarity a fuzzy match is not worth showing
+    MIN_SIMILARITY = 0.3
+
+    def __init__(self, players: Iterable[Player], version: str = ''):
+        self.version = version
+        # Removed players leave a None behind so other indexes stay valid
+        self._players: List[Optional[Player]] = []
+        self._positions: Dict[str, int] = {}
+        self._tokens: List[Tuple[str, ...]] = []
+        self._prefixes: Dict[str, Set[int]] = defaultdict(set)
+        self._trigrams: Dict[str, Set[int]] = defaultdict(set)
+        self._trigram_counts: List[int] = []
+        # Postings shared with the index this one was copied from
+        self._borrowed: Set[int] = set()
+
+        for player in players:
+            self._add(player)
+
+    def _postings(self, table: Dict[str, Set[int]], key: str) -> Set[int]:
+        """Get a posting set that is safe to modify, copying it if still shared"""
+        postings = table.get(key)
+        if postings is None:
+            postings = table[key] = set()
+        elif id(postings) in self._borrowed:
+            postings = table[key] = set(postings)
+        return postings
+
+    def _add(self, player: Player):
+        index = len(self._players)
+        self._players.append(player)
+        self._positions[player.id] = index
+        tokens = tuple(normalize(player.name).split())
+        self._tokens.append(tokens)
+        grams = set()
+        for token in tokens:
+            for end in range(1, len(token) + 1):
+                self._postings(self._prefixes, token[:end]).add(index)
+            grams |= trigrams(token)
+        for gram in grams:
+            self._postings(self._trigrams, gram).add(index)
+        self._trigram_counts.append(len(grams))
+
+    def _remove(self, player_id: str):
+        index = self._positions.pop(player_id, None)
+        if index is None:
+            return
+        self._players[index] = None
+        grams = set()
+        for token in self._tokens[index]:
+            for end in range(1, len(token) + 1):
+                self._postings(self._prefixes, token[:end]).discard(index)
+            grams |= trigrams(token)
+        for gram in grams:
+            self._postings(self._trigrams, gram).discard(index)
+
+    def with_changes(self, catalog, player_ids: Iterable[str], version: str) -> 'PlayerSearchIndex':
+        """Copy of the index with the given players re-read from catalog
+
+        Only the posting sets those players appear in are copied; everything
+        else is shared with this index, which stays usable by its readers.
+        """
+        index = object.__new__(PlayerSearchIndex)
+        index.version = version
+        index._players = list(self._players)
+        index._positions = dict(self._positions)
+        index._tokens = list(self._tokens)
+        index._prefixes = defaultdict(set, self._prefixes)
+        index._trigrams = defaultdict(set, self._trigrams)
+        index._trigram_counts = list(self._trigram_counts)
+        index._borrowed = {id(postings) for postings in self._prefixes.values()}
+        index._borrowed.update(id(postings) for postings in self._trigrams.values())
+        for player_id in player_ids:
+            index._remove(player_id)
+            player = catalog.get(player_id)
+            if player is not None:
+                index._add(player)
+        index._borrowed = set()
+        return index
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def _prefix_matches(self, query_tokens: Sequence[str]) -> Dict[int, float]:
+        candidates = None
+        for token in query_tokens:
+            matches = self._prefixes.get(token, set())
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return {}
+
+        scores = {}
+        for index in candidates:
+            tokens = self._tokens[index]
+            score = 0.0
+            for token in query_tokens:
+                if token in tokens:
+                    score += 3.0
+                else:
+                    score += 2.0
+            if tokens and tokens[0].startswith(query_tokens[0]):
+                score += 0.5
+            scores[index] = score
+        return scores
+
+    def _fuzzy_matches(self, query_tokens: Sequence[str]) -> Dict[int, float]:
+        query_grams = set()
+        for token in query_tokens:
+            query_grams |= trigrams(token)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for index in self._trigrams.get(gram, ()):
+                shared[index] += 1
+
+        scores = {}
+        for index, count in shared.items():
+            similarity = count / (len(query_grams) + self._trigram_counts[index] - count)
+            if similarity >= self.MIN_SIMILARITY:
+                scores[index] = similarity
+        return scores
+
+    def search(self, query: str = '', position: Optional[str] = None,
+               team: Optional[str] = None, exclude_teams: Iterable[str] = (),
+               limit: int = 20, league_format: Optional[LeagueFormat] = None) -> List[Tuple[Player, float]]:
+        """Find players matching query, best first
+
+        position may be a plain position or a slot of league_format (the
+        default format if unset), such as FLEX or flex2; a slot keeps the
+        players whose position may fill it. A name shared by several slots,
+        like FLEX for flex1 and flex2, keeps players who may fill any of them.
+        """
+        query_tokens = normalize(query).split()
+        if query_tokens:
+            scores = self._prefix_matches(query_tokens) or self._fuzzy_matches(query_tokens)
+        else:
+            scores = dict.fromkeys(self._positions.values(), 0.0)
+
+        excluded = {t.upper() for t in exclude_teams}
+        team = team.upper() if team else None
+        slot_bits = 0
+        if position:
+            league_format = league_format or get_format()
+            slot_bits = league_format.named_slots_mask(position)
+            position = position.upper()
+
+        results = []
+        for index, score in scores.items():
+            player = self._players[index]
+            if team and player.team != team:
+                continue
+            if player.team in excluded:
+                continue
+            if slot_bits:
+                if not league_format.slot_mask(player.position) & slot_bits:
+                    continue
+            elif position and player.position != position:
+                continue
+            results.append((player, score))
+
+        results.sort(key=lambda item: (-item[1], -item[0].projected_points, item[0].name))
+        return results[:limit]
@@ -0,0 +1,222 @@
+import cProfile
+import hashlib
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+PROFILE_HEADER = 'X-Profile-Token'
+# Lifetime of a signed token unless the signer asks for another one
+DEFAULT_TOKEN_TTL = 300
+
+# Phase durations of the request being handled; None outside a timed request
+_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar('phase_timings', default=None)
+
+@contextmanager
+def _timed(name: str, timings: Dict[str, float]):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+
+class _NoPhase:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+_NO_PHASE = _NoPhase()
+
+def phase(name: str):
+    """Time a block as one Server-Timing phase; a no-op outside a timed request"""
+    timings = _timings.get()
+    if timings is None:
+        return _NO_PHASE
+    return _timed(name, timings)
+
+def server_timing_header(timings: Dict[str, float], total: float) -> str:
+    parts = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in timings.items()]
+    parts.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(parts)
+
+def _token_digest(secret: str, method: str, path: str, expires: int) -> str:
+    message = f'{method.upper()} {path} {expires}'.encode()
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+def sign_profile_request(secret: str, method: str, path: str, ttl: float = DEFAULT_TOKEN_TTL,
+                         now: Optional[float] = None) -> str:
+    """The X-Profile-Token value that asks for one request to be profiled, valid for ttl seconds"""
+    expires = int((time.time() if now is None else now) + ttl)
+    return f'{expires}.{_token_digest(secret, method, path, expires)}'
+
+def verify_profile_token(secret: str, token: str, method: str, path: str,
+                         now: Optional[float] = None) -> bool:
+    """Whether token was signed with secret for this request and has not expired"""
+    expires, _, digest = token.partition('.')
+    try:
+        expires = int(expires)
+    except ValueError:
+        return False
+    if expires < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(digest, _token_digest(secret, method, path, expires))
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+class StackSampler:
+    """Sample one thread's Python stack at a fixed interval
+
+    Stacks are kept as collapsed strings (root;...;leaf) with hit counts, the
+    input format of flamegraph.pl, speedscope and similar tools.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.counts[';'.join(reversed(labels))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.counts
+
+def write_collapsed(counts: Counter, path) -> Path:
+    """Write collapsed stacks, one "stack count" line each"""
+    path = Path(path)
+    with open(path, 'w') as f:
+        for stack, count in counts.most_common():
+            f.write(f'{stack} {count}\n')
+    return path
+
+class RequestProfiler:
+    """Flask hooks adding Server-Timing phases and, when asked, a profile to each request
+
+    A request is profiled on a random sample (sample_rate) or when it carries
+    an X-Profile-Token signed with secret. mode 'sample' writes collapsed
+    stacks for flamegraphs; 'cprofile' writes a pstats file. Unprofiled
+    requests only pay for a few clock reads. Only the newest max_profiles
+    profiles are kept in output_dir.
+    """
+
+    def __init__(self, app=None, sample_rate: float = 0.0, secret: Optional[str] = None,
+                 output_dir='profiles', mode: str = 'sample', server_timing: bool = True,
+                 interval: float = 0.001, max_profiles: int = 100):
+        self.sample_rate = sample_rate
+        self.secret = secret
+        self.output_dir = Path(output_dir)
+        self.mode = mode
+        self.server_timing = server_timing
+        self.interval = interval
+        self.max_profiles = max_profiles
+        if app is not None:
+            self.init_app(app)
+
+    @classmethod
+    def from_env(cls, app=None) -> 'RequestProfiler':
+        return cls(
+            app,
+            sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', 0)),
+            secret=os.environ.get('PROFILE_SECRET') or None,
+            output_dir=os.environ.get('PROFILE_DIR', 'profiles'),
+            mode=os.environ.get('PROFILE_MODE', 'sample'),
+            server_timing=os.environ.get('SERVER_TIMING', '1') == '1',
+            max_profiles=int(os.environ.get('PROFILE_MAX_FILES', 100))
+        )
+
+    def init_app(self, app):
+        from flask import g, request
+        self._g = g
+        self._request = request
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.teardown_request(self._teardown)
+
+    def _wants_profile(self) -> bool:
+        token = self._request.headers.get(PROFILE_HEADER)
+        if token and self.secret and verify_profile_token(
+            self.secret, token, self._request.method, self._request.path
+        ):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _before(self):
+        g = self._g
+        if self.server_timing:
+            g.profile_start = time.perf_counter()
+            g.profile_timings = {}
+            g.profile_token = _timings.set(g.profile_timings)
+        if self._wants_profile():
+            if self.mode == 'cprofile':
+                g.profiler = cProfile.Profile()
+                g.profiler.enable()
+            else:
+                g.profiler = StackSampler(threading.get_ident(), self.interval)
+                g.profiler.start()
+
+    def _finish_profile(self) -> Optional[Path]:
+        profiler = self._g.pop('profiler', None)
+        if profiler is None:
+            return None
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        endpoint = (self._request.endpoint or 'unknown').replace('.', '_')
+        stem = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{endpoint}"
+        if isinstance(profiler, StackSampler):
+            path = write_collapsed(profiler.stop(), self.output_dir / f'{stem}.folded')
+        else:
+            profiler.disable()
+            path = self.output_dir / f'{stem}.prof'
+            profiler.dump_stats(str(path))
+        self._prune()
+        return path
+
+    def _prune(self):
+        """Delete the oldest profiles beyond max_profiles; names start with their timestamp"""
+        profiles = sorted(
+            p for p in self.output_dir.iterdir() if p.suffix in ('.folded', '.prof')
+        )
+        for old in profiles[:max(0, len(profiles) - self.max_profiles)]:
+            old.unlink(missing_ok=True)
+
+    def _after(self, response):
+        g = self._g
+        path = self._finish_profile()
+        if path is not None:
+            response.headers['X-Profile'] = path.name
+        if 'profile_start' in g:
+            total = time.perf_counter() - g.profile_start
+            response.headers['Server-Timing'] = server_timing_header(g.profile_timings, total)
+        return response
+
+    def _teardown(self, exc=None):
+        # Requests that raised never reach after_request
+        self._finish_profile()
+        token = self._g.pop('profile_token', None)
+        if token is not None:
+            _timings.reset(token)
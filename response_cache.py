@@ -0,0 +1,79 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional, Tuple
+from markupsafe import escape
+
+_PLACEHOLDER = re.compile(r'\x1e(\w+)\x1e')
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    etag: str
+    body: Optional[bytes] = None
+
+
+def placeholder(name: str) -> str:
+    """Marker rendered in place of a per-request value"""
+    return f'\x1e{name}\x1e'
+
+
+@dataclass(frozen=True)
+class CachedFragment:
+    """Rendered page split around its per-request placeholders
+
+    parts alternates literal markup and placeholder names, starting and
+    ending with markup.
+    """
+    parts: Tuple[str, ...]
+
+    @classmethod
+    def from_rendered(cls, html: str) -> 'CachedFragment':
+        return cls(tuple(_PLACEHOLDER.split(html)))
+
+    def fill(self, **values) -> str:
+        """Substitute escaped per-request values into the cached markup"""
+        parts = list(self.parts)
+        for i in range(1, len(parts), 2):
+            parts[i] = str(escape(values[parts[i]]))
+        return ''.join(parts)
+
+
+def make_etag(content: bytes) -> str:
+    """Build a strong ETag value from stored content"""
+    return hashlib.sha256(content).hexdigest()[:32]
+
+
+class ResponseCache:
+    """Bounded, thread-safe LRU of serialized response bodies"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        """Get a cached response and mark it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: Hashable, entry: CachedResponse):
+        """Store a response, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
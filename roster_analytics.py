@@ -0,0 +1,147 @@
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Sequence
+from roster_serialization import ROSTER_SLOTS
+
+class OwnershipTracker:
+    """Ownership and exposure counters maintained as rosters are created
+
+    Recording a roster applies its deltas to the counters under a short lock,
+    a few increments per slot, so nothing accumulates between reads. Readers
+    rebuild the JSON snapshot from a copy of the counters at most once per
+    refresh_interval, and a rebuild already in progress is never waited on.
+    """
+
+    def __init__(self, slots: Sequence[str] = ROSTER_SLOTS, refresh_interval: float = 1.0):
+        self.slots = tuple(slots)
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._dirty = False
+        self._reset()
+        self._snapshot = self._build_snapshot(self._copy())
+        self._refreshed_at = time.monotonic()
+
+    def _reset(self):
+        self._total = 0
+        self._players = Counter()
+        self._player_info = {}
+        self._teams = Counter()
+        self._team_slots = defaultdict(Counter)
+        self._qb_superflex = Counter()
+
+    def record(self, roster):
+        """Count a newly created roster"""
+        with self._lock:
+            self._apply(roster)
+            self._dirty = True
+
+    def rebuild(self, rosters: Iterable):
+        """Recount from scratch, e.g. from the store on startup"""
+        with self._refresh_lock:
+            with self._lock:
+                self._reset()
+                for roster in rosters:
+                    self._apply(roster)
+                self._dirty = False
+                counts = self._copy()
+            self._publish(counts)
+
+    def _apply(self, roster):
+        self._total += 1
+        for slot, player in zip(roster.slots, roster.players):
+            self._players[player.id] += 1
+            self._player_info[player.id] = player
+            self._teams[player.team] += 1
+            self._team_slots[player.team][slot] += 1
+        if 'qb' in roster.slots and 'superflex' in roster.slots:
+            self._qb_superflex[(roster.qb.id, roster.superflex.id)] += 1
+
+    def _copy(self) -> Dict:
+        """Copy of the counters, so a snapshot can be built without holding the lock"""
+        return {
+            'total': self._total,
+            'players': Counter(self._players),
+            'player_info': dict(self._player_info),
+            'teams': Counter(self._teams),
+            'team_slots': {team: Counter(slots) for team, slots in self._team_slots.items()},
+            'qb_superflex': Counter(self._qb_superflex)
+        }
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the snapshot if rosters were counted since the last one
+
+        Returns False without waiting when another refresh is running.
+        """
+        if not self._refresh_lock.acquire(blocking=False):
+            return False
+        try:
+            if not self._dirty:
+                return True
+            if not force and time.monotonic() - self._refreshed_at < self.refresh_interval:
+                return True
+            with self._lock:
+                self._dirty = False
+                counts = self._copy()
+            self._publish(counts)
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def _publish(self, counts: Dict):
+        self._snapshot = self._build_snapshot(counts)
+        self._refreshed_at = time.monotonic()
+
+    def snapshot(self) -> Dict:
+        """Get the latest ownership snapshot, refreshing it if it is stale"""
+        if self._dirty:
+            self.refresh()
+        return self._snapshot
+
+    @staticmethod
+    def _pct(count: int, total: int) -> float:
+        return round(100.0 * count / total, 2) if total else 0.0
+
+    def _build_snapshot(self, counts: Dict) -> Dict:
+        total = counts['total']
+        player_info = counts['player_info']
+        team_slots = counts['team_slots']
+        teams = sorted(counts['teams'])
+        players = []
+        for player_id, count in counts['players'].most_common():
+            player = player_info[player_id]
+            players.append({
+                'id': player.id,
+                'name': player.name,
+                'position': player.position,
+                'team': player.team,
+                'count': count,
+                'pct': self._pct(count, total)
+            })
+
+        return {
+            'total_rosters': total,
+            'updated_at': datetime.now().isoformat(),
+            'players': players,
+            'teams': [
+                {'team': team, 'count': count, 'pct': self._pct(count, total)}
+                for team, count in counts['teams'].most_common()
+            ],
+            'team_slots': {
+                'slots': list(self.slots),
+                'teams': teams,
+                'counts': [[team_slots[team][slot] for slot in self.slots] for team in teams]
+            },
+            'qb_superflex': [
+                {
+                    'qb': qb_id,
+                    'superflex': superflex_id,
+                    'superflex_position': player_info[superflex_id].position,
+                    'count': count,
+                    'pct': self._pct(count, total)
+                }
+                for (qb_id, superflex_id), count in counts['qb_superflex'].most_common()
+            ]
+        }
@@ -0,0 +1,225 @@
+"""Stream every roster of a league as CSV, NDJSON or Parquet.
+
+    python roster_export.py --format csv -o rosters.csv.gz
+    python roster_export.py --league office --format parquet -o office.parquet
+"""
+import argparse
+import csv
+import importlib.util
+import io
+import sys
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+import roster_serialization
+
+EXPORT_FORMATS = ('csv', 'ndjson', 'parquet')
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+ROSTER_COLUMNS = ('roster_id', 'user_id', 'team_id', 'league_id', 'season', 'created_at')
+SLOT_FIELDS = ('id', 'name', 'team', 'points')
+DEFAULT_CHUNK_SIZE = 1000
+
+class ExportError(Exception):
+    pass
+
+def check_format(fmt: str):
+    """Raise ExportError unless fmt can be exported in this environment"""
+    if fmt not in EXPORT_FORMATS:
+        raise ExportError(f'Unknown export format: {fmt}; use one of {", ".join(EXPORT_FORMATS)}')
+    if fmt == 'parquet' and importlib.util.find_spec('pyarrow') is None:
+        raise ExportError('Parquet export needs pyarrow; install it or use csv or ndjson')
+
+def export_columns(slots: Sequence[str]) -> List[str]:
+    """Column names of a flattened roster: roster fields, then id/name/team/points per slot"""
+    columns = list(ROSTER_COLUMNS)
+    for slot in slots:
+        columns.extend(f'{slot}_{field}' for field in SLOT_FIELDS)
+    columns.append('total_points')
+    return columns
+
+def flatten_roster(data: Dict, slots: Sequence[str]) -> Dict:
+    """Flatten a decoded roster payload into one export row"""
+    row = {
+        'roster_id': data['id'],
+        'user_id': data['user_id'],
+        'team_id': data['team_id'],
+        'league_id': data.get('league_id'),
+        'season': data.get('season'),
+        'created_at': data['created_at']
+    }
+    total = 0.0
+    players = data['players']
+    for slot in slots:
+        player = players.get(slot) or {}
+        points = player.get('projected_points')
+        row[f'{slot}_id'] = player.get('id')
+        row[f'{slot}_name'] = player.get('name')
+        row[f'{slot}_team'] = player.get('team')
+        row[f'{slot}_points'] = points
+        total += points or 0.0
+    row['total_points'] = round(total, 2)
+    return row
+
+def iter_row_chunks(payloads: Iterable[bytes], slots: Sequence[str],
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    """Decode and flatten stored roster payloads, chunk_size rows at a time"""
+    chunk = []
+    for payload in payloads:
+        chunk.append(flatten_roster(roster_serialization.loads(payload), slots))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def iter_csv(chunks: Iterable[List[Dict]], columns: Sequence[str]) -> Iterator[bytes]:
+    """Encode row chunks as CSV with a header line"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, lineterminator='\n')
+    writer.writeheader()
+    for chunk in chunks:
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def iter_ndjson(chunks: Iterable[List[Dict]]) -> Iterator[bytes]:
+    """Encode row chunks as newline-delimited JSON"""
+    for chunk in chunks:
+        yield b''.join(roster_serialization.dumps(row) + b'\n' for row in chunk)
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._parts)
+        self._parts.clear()
+        return data
+
+def iter_parquet(chunks: Iterable[List[Dict]], columns: Sequence[str],
+                 compression: Optional[str] = 'zstd') -> Iterator[bytes]:
+    """Encode row chunks as Parquet, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    def column_type(column: str):
+        if column.endswith('_points'):
+            return pa.float64()
+        return pa.int32() if column == 'season' else pa.string()
+
+    schema = pa.schema([(column, column_type(column)) for column in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression=compression or 'none')
+    try:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Gzip a byte stream on the fly, holding at most one chunk in memory"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_payloads(payloads: Iterable[bytes], slots: Sequence[str], fmt: str = 'csv',
+                    compress: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Stream stored roster payloads in an export format
+
+    Payloads are decoded and encoded chunk_size at a time, so memory stays
+    flat however many rosters there are. CSV and NDJSON are gzipped when
+    compress is set; Parquet compresses its own columns.
+    """
+    check_format(fmt)
+    columns = export_columns(slots)
+    chunks = iter_row_chunks(payloads, slots, chunk_size)
+    if fmt == 'parquet':
+        return iter_parquet(chunks, columns, compression='zstd' if compress else None)
+    encoded = iter_csv(chunks, columns) if fmt == 'csv' else iter_ndjson(chunks)
+    return gzip_stream(encoded) if compress else encoded
+
+def export_rosters(manager, fmt: str = 'csv', season: Optional[int] = None, compress: bool = True,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """Stream a loaded league's stored rosters in an export format"""
+    return export_payloads(
+        manager.iter_roster_payloads(season), manager.format.slots, fmt, compress, chunk_size
+    )
+
+def export_filename(league_id: str, fmt: str, compress: bool = True) -> str:
+    """Download name for an export, e.g. rosters-default.csv.gz"""
+    suffix = '.gz' if compress and fmt != 'parquet' else ''
+    return f'rosters-{league_id}.{fmt}{suffix}'
+
+def export_mimetype(fmt: str, compress: bool = True) -> str:
+    if compress and fmt != 'parquet':
+        return 'application/gzip'
+    return CONTENT_TYPES[fmt]
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from league_registry import LeagueError, LeagueRegistry
+    from league_rules import DEFAULT_FORMAT, LeagueRulesError, get_format
+    from roster_manager import read_roster_payloads
+    from roster_serialization import DEFAULT_LEAGUE
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+    parser.add_argument('--league', default=DEFAULT_LEAGUE)
+    parser.add_argument('--season', type=int, help='only rosters of this season')
+    parser.add_argument('--data-dir', default='data')
+    parser.add_argument('--no-gzip', action='store_true', help='write CSV or NDJSON uncompressed')
+    parser.add_argument('-o', '--output', default='-', help="output file, or '-' for stdout")
+    args = parser.parse_args(argv)
+
+    # Read the league's files directly; a RosterManager would build indexes the export never uses
+    registry = LeagueRegistry(args.data_dir)
+    try:
+        if not registry.exists(registry.validate_id(args.league)):
+            raise LeagueError(f'Unknown league: {args.league}')
+        league_format = get_format(registry.league_options(args.league).get('league_format', DEFAULT_FORMAT))
+        stream = export_payloads(
+            read_roster_payloads(registry.rosters_dir(args.league), args.season),
+            league_format.slots, args.format, compress=not args.no_gzip
+        )
+    except (ExportError, LeagueError, LeagueRulesError) as e:
+        print(f'Export failed: {e}', file=sys.stderr)
+        return 1
+
+    output = sys.stdout.buffer if args.output == '-' else open(args.output, 'wb')
+    try:
+        for chunk in stream:
+            output.write(chunk)
+    finally:
+        if output is not sys.stdout.buffer:
+            output.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,36 +1,80 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import json
+import logging
 import os
+import threading
 import uuid
 from pathlib import Path
+import roster_serialization
+from roster_serialization import DEFAULT_LEAGUE
+from catalog_changes import ChangeLog
+from player_catalog import Player, PlayerCatalog, RosterTable, SeasonCatalogs, file_version, read_snapshot
+from roster_analytics import OwnershipTracker
+from lineup_index import LineupIndex, lineup_hash
+from write_ahead_log import WriteAheadLog, read_records
+from seasons import LEGACY_SEASON, current_season
+from league_rules import DEFAULT_FORMAT, LeagueFormat, get_format
+from roster_options import RosterOptionsIndex
+from profiling import phase
+from scoring import DEFAULT_SCORING, RosterScorer, ScoringSettings, get_scoring
 
-@dataclass
-class Player:
-    id: str
-    name: str
-    position: str
-    team: str
-    projected_points: float = 0.0
+logger = logging.getLogger('RosterManager')
+
+WAL_FILE = 'rosters.wal'
+
+def read_roster_payloads(rosters_dir, season: Optional[int] = None) -> Iterator[bytes]:
+    """Yield the canonical encoding of every roster stored in rosters_dir, optionally for one season
+
+    Needs no catalog or indexes. Rosters a crash left only in the write-ahead
+    log are yielded after the files.
+    """
+    rosters_dir = Path(rosters_dir)
+    seen = set()
+
+    def accept(payload: bytes) -> bool:
+        return season is None or roster_serialization.payload_season(payload) == season
+
+    for roster_file in rosters_dir.glob('*.json'):
+        seen.add(roster_file.stem)
+        try:
+            payload = roster_serialization.upgrade_payload(roster_file.read_bytes())
+        except FileNotFoundError:
+            continue
+        except (ValueError, KeyError) as e:
+            # One unreadable legacy file must not break listing for everyone
+            logger.warning(f'Skipping unreadable roster {roster_file.name}: {e}')
+            continue
+        if accept(payload):
+            yield payload
+    for payload in read_records(rosters_dir / WAL_FILE):
+        if roster_serialization.loads(payload)['id'] not in seen and accept(payload):
+            yield payload
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Roster:
     id: str
     user_id: str
     team_id: str
-    qb: Player
-    rb1: Player
-    rb2: Player
-    wr1: Player
-    wr2: Player
-    wr3: Player
-    te: Player
-    superflex: Player
-    flex: Player
-    kicker: Player
-    defense: Player
+    season: int
+    league_id: str
     created_at: datetime
+    players: Tuple[Player, ...]
+    slots: Tuple[str, ...] = roster_serialization.ROSTER_SLOTS
+
+    def __getattr__(self, name: str) -> Player:
+        # Slot names read as attributes, e.g. roster.qb
+        if name not in ('slots', 'players'):
+            try:
+                return self.players[self.slots.index(name)]
+            except ValueError:
+                pass
+        raise AttributeError(f'Roster has no slot {name!r}')
+
+    def lineup(self) -> Dict[str, Player]:
+        """Players keyed by slot, in slot order"""
+        return dict(zip(self.slots, self.players))
 
 class RosterValidationError(Exception):
     pass
@@ -60,192 +104,292 @@ class RosterValidator:
         return True
 
 class RosterManager:
-    def __init__(self, data_dir: str = 'data'):
+    # Fold the write-ahead log into the roster files once it grows past this
+    WAL_CHECKPOINT_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, data_dir: str = 'data', allow_duplicate_lineups: bool = True,
+                 durable: bool = True, season: Optional[int] = None, active_seasons: int = 2,
+                 league_format: str = DEFAULT_FORMAT, league_id: str = DEFAULT_LEAGUE,
+                 rosters_dir: Optional[str] = None, catalog: Optional[PlayerCatalog] = None,
+                 seasons: Optional[SeasonCatalogs] = None, scoring: str = DEFAULT_SCORING):
         self.data_dir = Path(data_dir)
-        self.rosters_dir = self.data_dir / 'rosters'
+        self.league_id = league_id
+        self.format: LeagueFormat = get_format(league_format)
+        self.scoring: ScoringSettings = get_scoring(scoring)
+        self.season = season or current_season()
+        self.rosters_dir = Path(rosters_dir) if rosters_dir else self.data_dir / 'rosters'
         self.players_file = self.data_dir / 'players.json'
+        self.snapshot_file = self.data_dir / 'catalog.snapshot.json'
+        self.change_log = ChangeLog(self.data_dir / 'catalog.changes.ndjson')
         self._ensure_directories()
+        self.wal = WriteAheadLog(self.rosters_dir / WAL_FILE, sync=durable)
+        self._recover()
         self.validator = RosterValidator()
+        # Leagues hosted by one process share the catalogs
+        self.catalog = catalog if catalog is not None else PlayerCatalog()
+        self._options_index: Optional[RosterOptionsIndex] = None
+        # Catalogs of other seasons, loaded only while their rosters are read
+        self.seasons = seasons or SeasonCatalogs(self.data_dir / 'seasons', max_active=active_seasons)
+        self.allow_duplicate_lineups = allow_duplicate_lineups
+        self.lineups = LineupIndex()
+        self.ownership = OwnershipTracker(self.format.slots)
+        self._load_indexes()
 
     def _ensure_directories(self):
         """Create necessary directories if they don't exist"""
         self.data_dir.mkdir(exist_ok=True)
-        self.rosters_dir.mkdir(exist_ok=True)
+        self.rosters_dir.mkdir(parents=True, exist_ok=True)
+
+    def _recover(self):
+        """Finish writes interrupted by a crash by replaying the write-ahead log"""
+        for tmp_file in self.rosters_dir.glob('.*.tmp'):
+            tmp_file.unlink(missing_ok=True)
+        self.wal.checkpoint(self._materialize)
+
+    def _materialize(self, payloads: List[bytes]):
+        """Write logged roster payloads whose files are missing, empty or torn"""
+        for payload in payloads:
+            roster_id = roster_serialization.loads(payload)['id']
+            roster_file = self.rosters_dir / f"{roster_id}.json"
+            try:
+                intact = roster_file.read_bytes() == payload
+            except FileNotFoundError:
+                intact = False
+            if not intact:
+                self._write_atomic(roster_file, payload)
+
+    def _write_atomic(self, path: Path, payload: bytes):
+        """Write a file so readers only ever see the old or the complete new content"""
+        tmp_file = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            if self.wal.sync:
+                # The rename may reach disk before the data; the log is dropped at the next checkpoint
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+
+    def _load_indexes(self):
+        """Rebuild in-memory indexes from the stored rosters in a single pass"""
+        self.ownership.rebuild(self._index_lineups(self.iter_rosters(self.season)))
+
+    def _index_lineups(self, rosters: Iterable[Roster]) -> Iterator[Roster]:
+        for roster in rosters:
+            if not self._fits_format(roster.id, roster.slots):
+                continue
+            self.lineups.add(self.lineup_hash(roster), roster.id)
+            yield roster
+
+    def _fits_format(self, roster_id: str, slots: Iterable[str]) -> bool:
+        """Whether a stored roster has this league's slots, logging the ones that don't"""
+        if self.format.slot_index.keys() == set(slots):
+            return True
+        logger.error(
+            f'Skipping roster {roster_id}: its slots {sorted(slots)} do not match '
+            f'league format {self.format.name} {list(self.format.slots)}'
+        )
+        return False
+
+    def lineup_hash(self, roster: Roster) -> str:
+        """Canonical hash shared by every roster with the same lineup"""
+        return lineup_hash(
+            {slot: player.id for slot, player in zip(roster.slots, roster.players)},
+            self.format.slot_groups
+        )
 
     def _player_to_dict(self, player: Player) -> Dict:
         """Convert Player object to dictionary with enhanced stats"""
-        if not player:
-            return None
-            
-        return {
-            'id': player.id,
-            'name': player.name,
-            'position': player.position,
-            'team': player.team,
-            'projected_points': player.projected_points,
-            'stats': {
-                'games_played': 17,
-                'rushing_yards': 0,
-                'rushing_tds': 0,
-                'receiving_yards': 0,
-                'receiving_tds': 0,
-                'passing_yards': 0,
-                'passing_tds': 0,
-                'interceptions': 0,
-                'fumbles': 0,
-                'avg_points': player.projected_points,
-                'last_5_games': [0, 0, 0, 0, 0]
-            }
-        }
+        return roster_serialization.player_to_dict(player)
+
+    def load_catalog(self) -> PlayerCatalog:
+        """Get the player catalog, reloading it when players.json changes
+
+        When the change log covers the step from the loaded version, only the
+        changed players are updated. Otherwise the pipeline's precompiled
+        snapshot is used when it matches the current players.json, or the
+        JSON file is parsed directly.
+        """
+        version = self.catalog_version
+        if version == self.catalog.version:
+            return self.catalog
+        changes = self.change_log.between(self.catalog.version, version)
+        if changes is not None:
+            for change in changes:
+                self.catalog.apply_change(change)
+        else:
+            players = read_snapshot(self.snapshot_file, source_version=version)
+            if players is None:
+                with open(self.players_file, 'r') as f:
+                    players = json.load(f)
+            self.catalog.load(players, version)
+        return self.catalog
+
+    def roster_options(self, partial: Dict[str, Optional[str]]) -> Dict:
+        """Players that keep a partially filled roster completable, per open slot"""
+        catalog = self.load_catalog()
+        index = self._options_index
+        if index is None or index.version != catalog.version:
+            index = RosterOptionsIndex(self.format, catalog, catalog.version)
+            self._options_index = index
+        try:
+            return index.options(partial)
+        except ValueError as e:
+            raise RosterValidationError(str(e))
+
+    def catalog_for(self, season: int) -> PlayerCatalog:
+        """Get the player catalog of a season"""
+        if season == self.season:
+            return self.load_catalog()
+        return self.seasons.get(season)
+
+    def _get_player(self, player_id: str) -> Player:
+        """Look up a shared Player record in the current catalog"""
+        return self.load_catalog()[player_id]
 
     def create_roster(self, user_id: str, roster_data: Dict) -> Roster:
         """Create a new roster for a user"""
         try:
-            # Convert raw data to Player objects
+            # Resolve ids to the shared catalog Player records
             players = {}
             for position, player_id in roster_data.items():
-                player_info = self._get_player_info(player_id)
-                players[position] = Player(
-                    id=player_id,
-                    name=player_info['name'],
-                    position=player_info['position'],
-                    team=player_info['team'],
-                    projected_points=player_info.get('projected_points', 0.0)
-                )
-
-            # Validate positions
-            if not self.validator.validate_player_position(players['qb'], 'QB'):
-                raise RosterValidationError("Invalid QB selection")
-            
-            for pos in ['rb1', 'rb2']:
-                if not self.validator.validate_player_position(players[pos], 'RB'):
-                    raise RosterValidationError(f"Invalid {pos.upper()} selection")
-            
-            for pos in ['wr1', 'wr2', 'wr3']:
-                if not self.validator.validate_player_position(players[pos], 'WR'):
-                    raise RosterValidationError(f"Invalid {pos.upper()} selection")
-            
-            if not self.validator.validate_player_position(players['te'], 'TE'):
-                raise RosterValidationError("Invalid TE selection")
-            
-            if not self.validator.validate_player_position(players['superflex'], 'SUPERFLEX'):
-                raise RosterValidationError("Invalid SUPERFLEX selection")
-            
-            if not self.validator.validate_player_position(players['flex'], 'FLEX'):
-                raise RosterValidationError("Invalid FLEX selection")
-            
-            if not self.validator.validate_player_position(players['kicker'], 'K'):
-                raise RosterValidationError("Invalid Kicker selection")
-            
-            if not self.validator.validate_player_position(players['defense'], 'DEF'):
-                raise RosterValidationError("Invalid Defense selection")
-
-            # Validate unique teams
-            if not self.validator.validate_unique_teams(players):
-                raise RosterValidationError("Cannot select multiple players from the same team")
+                players[position] = self._get_player(player_id)
+
+            # Check slot eligibility and team uniqueness against the league format
+            with phase('validation'):
+                error = self.format.validate(players)
+            if error:
+                raise RosterValidationError(error)
 
             # Create roster object
             roster = Roster(
                 id=str(uuid.uuid4()),
                 user_id=user_id,
                 team_id=user_id,  # You might want to make this configurable
-                qb=players['qb'],
-                rb1=players['rb1'],
-                rb2=players['rb2'],
-                wr1=players['wr1'],
-                wr2=players['wr2'],
-                wr3=players['wr3'],
-                te=players['te'],
-                superflex=players['superflex'],
-                flex=players['flex'],
-                kicker=players['kicker'],
-                defense=players['defense'],
-                created_at=datetime.now()
+                season=self.season,
+                league_id=self.league_id,
+                created_at=datetime.now(),
+                players=tuple(players[slot] for slot in self.format.slots),
+                slots=self.format.slots
             )
 
+            # Reject or group identical lineups before saving
+            lineup = self.lineup_hash(roster)
+            if not self.lineups.claim(lineup, roster.id, unique=not self.allow_duplicate_lineups):
+                raise RosterValidationError("An identical lineup has already been submitted")
+
             # Save roster
-            self._save_roster(roster)
+            try:
+                with phase('storage'):
+                    self._save_roster(roster)
+            except Exception:
+                self.lineups.discard(lineup, roster.id)
+                raise
+            self.ownership.record(roster)
             return roster
 
         except (FileNotFoundError, ValueError, KeyError) as e:
             raise RosterValidationError(f"Error creating roster: {str(e)}")
 
     def _save_roster(self, roster: Roster):
-        """Save roster to file"""
-        roster_file = self.rosters_dir / f"{roster.id}.json"
-        roster_data = {
-            'id': roster.id,
-            'user_id': roster.user_id,
-            'team_id': roster.team_id,
-            'created_at': roster.created_at.isoformat(),
-            'players': {
-                'qb': self._player_to_dict(roster.qb),
-                'rb1': self._player_to_dict(roster.rb1),
-                'rb2': self._player_to_dict(roster.rb2),
-                'wr1': self._player_to_dict(roster.wr1),
-                'wr2': self._player_to_dict(roster.wr2),
-                'wr3': self._player_to_dict(roster.wr3),
-                'te': self._player_to_dict(roster.te),
-                'superflex': self._player_to_dict(roster.superflex),
-                'flex': self._player_to_dict(roster.flex),
-                'kicker': self._player_to_dict(roster.kicker),
-                'defense': self._player_to_dict(roster.defense)
-            }
-        }
-
-        with open(roster_file, 'w') as f:
-            json.dump(roster_data, f, indent=2)
+        """Save roster to file in its canonical encoding
 
-    def get_roster(self, roster_id: str) -> Optional[Roster]:
-        """Retrieve a roster by ID"""
+        The payload is made durable in the write-ahead log first (fsyncs are
+        shared across concurrent submissions), then the roster file is
+        written atomically; a crash in between is repaired on startup.
+        """
+        payload = roster_serialization.encode_roster(roster)
+        self.wal.append(payload)
+        self._write_atomic(self.rosters_dir / f"{roster.id}.json", payload)
+        if self.wal.size > self.WAL_CHECKPOINT_BYTES:
+            self.wal.checkpoint(self._materialize)
+
+    @property
+    def catalog_version(self) -> str:
+        """Cheap token that changes whenever the player catalog is rewritten"""
+        return file_version(self.players_file)
+
+    def catalog_version_for(self, season: int) -> str:
+        """Version token of a season's catalog"""
+        if season == self.season:
+            return self.catalog_version
+        return file_version(self.seasons.path_for(season))
+
+    def get_roster_bytes(self, roster_id: str) -> Optional[bytes]:
+        """Retrieve the stored roster content without parsing it"""
         roster_file = self.rosters_dir / f"{roster_id}.json"
-        if not roster_file.exists():
+        try:
+            return roster_file.read_bytes()
+        except FileNotFoundError:
             return None
 
-        with open(roster_file, 'r') as f:
-            data = json.load(f)
-            return self._dict_to_roster(data)
+    def get_roster_payload(self, roster_id: str) -> Optional[bytes]:
+        """Retrieve a roster's canonical JSON encoding, ready to send as-is"""
+        raw = self.get_roster_bytes(roster_id)
+        if raw is None:
+            return None
+        return roster_serialization.upgrade_payload(raw)
+
+    def iter_roster_payloads(self, season: Optional[int] = None) -> Iterator[bytes]:
+        """Yield the canonical JSON encoding of every stored roster, optionally for one season"""
+        return read_roster_payloads(self.rosters_dir, season)
+
+    def iter_rosters(self, season: Optional[int] = None) -> Iterator[Roster]:
+        """Yield every stored roster, optionally for one season"""
+        for payload in self.iter_roster_payloads(season):
+            yield self._dict_to_roster(roster_serialization.loads(payload))
+
+    def get_roster(self, roster_id: str) -> Optional[Roster]:
+        """Retrieve a roster by ID"""
+        raw = self.get_roster_bytes(roster_id)
+        if raw is None:
+            return None
+        return self._dict_to_roster(roster_serialization.loads(raw))
 
     def _dict_to_roster(self, data: Dict) -> Roster:
         """Convert dictionary to Roster object"""
         players = data['players']
+        season = data.get('season', LEGACY_SEASON)
+        # Intern into the roster's own season so old contests stay out of the current catalog
+        catalog = self.catalog if season == self.season else self.seasons.get(season)
         return Roster(
             id=data['id'],
             user_id=data['user_id'],
             team_id=data.get('team_id', data['user_id']),
+            season=season,
+            league_id=data.get('league_id', DEFAULT_LEAGUE),
             created_at=datetime.fromisoformat(data['created_at']),
-            qb=self._dict_to_player(players['qb']),
-            rb1=self._dict_to_player(players['rb1']),
-            rb2=self._dict_to_player(players['rb2']),
-            wr1=self._dict_to_player(players['wr1']),
-            wr2=self._dict_to_player(players['wr2']),
-            wr3=self._dict_to_player(players['wr3']),
-            te=self._dict_to_player(players['te']),
-            superflex=self._dict_to_player(players['superflex']),
-            flex=self._dict_to_player(players['flex']),
-            kicker=self._dict_to_player(players['kicker']),
-            defense=self._dict_to_player(players['defense'])
+            players=tuple(self._dict_to_player(player, catalog) for player in players.values()),
+            slots=tuple(players)
         )
 
-    def _dict_to_player(self, data: Dict) -> Player:
-        """Convert dictionary to Player object"""
-        if not data:
-            return None
-            
-        return Player(
-            id=data['id'],
-            name=data['name'],
-            position=data['position'],
-            team=data['team'],
-            projected_points=data.get('projected_points', 0.0)
-        )
+    def _dict_to_player(self, data: Dict, catalog: Optional[PlayerCatalog] = None) -> Player:
+        """Convert dictionary to the shared Player record"""
+        if catalog is None:
+            catalog = self.catalog
+        return catalog.intern_dict(data)
+
+    def build_roster_table(self, season: Optional[int] = None) -> RosterTable:
+        """Load a season's stored rosters (the current one by default) into a compact player-index table"""
+        season = season or self.season
+        catalog = self.catalog if season == self.season else self.seasons.get(season)
+        table = RosterTable(catalog, self.format.slots)
+        for payload in self.iter_roster_payloads(season):
+            data = roster_serialization.loads(payload)
+            players = data['players']
+            if not self._fits_format(data['id'], players):
+                continue
+            table.append(data['id'], [players[slot]['id'] for slot in table.slots])
+        return table
+
+    def roster_scorer(self, season: Optional[int] = None) -> RosterScorer:
+        """Build a scorer over a season's stored rosters using the league's scoring settings"""
+        return RosterScorer(self.build_roster_table(season), self.scoring)
 
     def get_user_rosters(self, user_id: str) -> List[Roster]:
         """Get all rosters for a user"""
         rosters = []
         for roster_file in self.rosters_dir.glob("*.json"):
-            with open(roster_file, 'r') as f:
-                data = json.load(f)
-                if data['user_id'] == user_id:
-                    rosters.append(self._dict_to_roster(data))
+            data = roster_serialization.loads(roster_file.read_bytes())
+            if data['user_id'] == user_id:
+                rosters.append(self._dict_to_roster(data))
         return rosters
\ No newline at end of file
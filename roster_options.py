@@ -0,0 +1,143 @@
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from league_rules import LeagueFormat
+from player_catalog import Player
+from response_cache import ResponseCache
+
+def _augment(slot: int, slot_teams: List[int], owner: Dict[int, int], seen: List[int]) -> bool:
+    """Try to give slot a team, re-seating earlier slots along an augmenting path"""
+    candidates = slot_teams[slot] & ~seen[0]
+    while candidates:
+        team = candidates & -candidates
+        candidates ^= team
+        seen[0] |= team
+        if team not in owner or _augment(owner[team], slot_teams, owner, seen):
+            owner[team] = slot
+            return True
+    return False
+
+def perfect_matching(slot_teams: List[int]) -> Optional[Dict[int, int]]:
+    """Give every slot its own team, or return None if that is impossible
+
+    slot_teams holds each slot's allowed-team bitmask; the result maps each
+    chosen team bit to its slot.
+    """
+    owner: Dict[int, int] = {}
+    for slot in range(len(slot_teams)):
+        if not _augment(slot, slot_teams, owner, [0]):
+            return None
+    return owner
+
+class RosterOptionsIndex:
+    """Which players can still be picked for each open slot of a partial roster
+
+    Teams are bits, and for every slot the index keeps the bitmask of teams
+    with at least one eligible player. Under the one-player-per-team rule a
+    partial roster can be completed iff the open slots have a perfect
+    matching into the unused teams, and whether a candidate keeps it
+    completable depends only on its slot and team. So a request runs one
+    small bitset matching per (open slot, team) pair at most, rather than
+    one per player.
+    """
+
+    def __init__(self, league_format: LeagueFormat, players: Iterable[Player], version: str = ''):
+        self.format = league_format
+        self.version = version
+        self.players: Dict[str, Player] = {}
+        self.team_bits: Dict[str, int] = {}
+        self.slot_teams = [0] * len(league_format.slots)
+        self.slot_players: List[List[Player]] = [[] for _ in league_format.slots]
+        # Feasible teams per open slot depend only on the teams used and the
+        # slots still open, which many users share (the empty roster above all)
+        self._allowed = ResponseCache(max_entries=4096)
+
+        ordered = sorted(players, key=lambda p: (-p.projected_points, p.name))
+        for player in ordered:
+            self.players[player.id] = player
+            bit = self.team_bits.setdefault(player.team, 1 << len(self.team_bits))
+            mask = league_format.slot_mask(player.position)
+            for slot in range(len(league_format.slots)):
+                if mask >> slot & 1:
+                    self.slot_teams[slot] |= bit
+                    self.slot_players[slot].append(player)
+
+    def _check_partial(self, partial: Mapping[str, str]) -> Tuple[Dict[int, Player], int]:
+        picked: Dict[int, Player] = {}
+        used = 0
+        for slot_name, player_id in partial.items():
+            if not player_id:
+                continue
+            slot = self.format.slot_index.get(slot_name)
+            if slot is None:
+                raise ValueError(f'Unknown roster slot: {slot_name}')
+            player = self.players.get(player_id)
+            if player is None:
+                raise ValueError(f'Unknown player: {player_id}')
+            if not self.format.slot_mask(player.position) >> slot & 1:
+                raise ValueError(f'Invalid {self.format.slot_rules[slot].label} selection')
+            bit = self.team_bits[player.team]
+            if self.format.unique_teams and used & bit:
+                raise ValueError('Cannot select multiple players from the same team')
+            picked[slot] = player
+            used |= bit
+        return picked, used
+
+    def _allowed_teams(self, used: int, open_slots: List[int]) -> Tuple[bool, Dict[int, int]]:
+        """Whether the open slots can be filled, and each one's team bitmask of legal picks"""
+        if not self.format.unique_teams:
+            # Only eligibility matters; any eligible player keeps the roster completable
+            feasible = all(self.slot_teams[slot] for slot in open_slots)
+            allowed = {slot: ~0 if feasible else 0 for slot in open_slots}
+        else:
+            available = [self.slot_teams[slot] & ~used for slot in open_slots]
+            owner = perfect_matching(available)
+            feasible = owner is not None
+            # Teams the matching leaves unused can go to any slot: the rest of
+            # the matching still covers every other slot
+            spare = ~0
+            if feasible:
+                for team in owner:
+                    spare &= ~team
+            allowed = {}
+            for i, slot in enumerate(open_slots):
+                teams = 0
+                if feasible:
+                    teams = available[i] & spare
+                    rest = available[:i] + available[i + 1:]
+                    # A team held by another slot only works if that slot can be re-seated
+                    candidates = available[i] & ~spare
+                    while candidates:
+                        team = candidates & -candidates
+                        candidates ^= team
+                        if owner[team] == i or perfect_matching([mask & ~team for mask in rest]) is not None:
+                            teams |= team
+                allowed[slot] = teams
+        return feasible, allowed
+
+    def options(self, partial: Mapping[str, Optional[str]]) -> Dict:
+        """Legal choices for every open slot of a partial roster
+
+        partial maps slot names to player ids; empty values are open slots.
+        Raises ValueError when the picks made so far already break a rule.
+        """
+        picked, used = self._check_partial(partial)
+        open_slots = [slot for slot in range(len(self.format.slots)) if slot not in picked]
+        picked_ids = {player.id for player in picked.values()}
+
+        key = (used, tuple(open_slots))
+        cached = self._allowed.get(key)
+        if cached is None:
+            cached = self._allowed_teams(used, open_slots)
+            self._allowed.set(key, cached)
+        feasible, allowed = cached
+
+        team_bits = self.team_bits
+        return {
+            'feasible': feasible,
+            'options': {
+                self.format.slots[slot]: [
+                    player.id for player in self.slot_players[slot]
+                    if team_bits[player.team] & teams and player.id not in picked_ids
+                ]
+                for slot, teams in allowed.items()
+            }
+        }
@@ -0,0 +1,107 @@
+"""Canonical roster encoding shared by the store and the read endpoints.
+
+Rosters are written once in this compact form and served back as raw bytes,
+so every change to the stored layout must bump SCHEMA_VERSION and teach
+upgrade_payload how to convert older records.
+"""
+import json
+from typing import Any, Dict, Iterable, Optional
+from seasons import LEGACY_SEASON
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+SCHEMA_VERSION = 3
+
+# League of every roster written before rosters were partitioned by league
+DEFAULT_LEAGUE = 'default'
+
+ROSTER_SLOTS = (
+    'qb', 'rb1', 'rb2', 'wr1', 'wr2', 'wr3', 'te',
+    'superflex', 'flex', 'kicker', 'defense'
+)
+
+# Every canonical payload starts with these bytes, which lets readers detect
+# current-format records without parsing them
+PAYLOAD_PREFIX = b'{"schema_version":%d,' % SCHEMA_VERSION
+SEASON_PREFIX = PAYLOAD_PREFIX + b'"season":'
+
+def dumps(data: Any) -> bytes:
+    """Encode data as compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def loads(raw: bytes) -> Any:
+    """Decode JSON produced by dumps (or any other JSON encoder)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def player_to_dict(player) -> Optional[Dict]:
+    """Convert Player object to dictionary with enhanced stats"""
+    if not player:
+        return None
+
+    return {
+        'id': player.id,
+        'name': player.name,
+        'position': player.position,
+        'team': player.team,
+        'projected_points': player.projected_points,
+        'stats': {
+            'games_played': 17,
+            'rushing_yards': 0,
+            'rushing_tds': 0,
+            'receiving_yards': 0,
+            'receiving_tds': 0,
+            'passing_yards': 0,
+            'passing_tds': 0,
+            'interceptions': 0,
+            'fumbles': 0,
+            'avg_points': player.projected_points,
+            'last_5_games': [0, 0, 0, 0, 0]
+        }
+    }
+
+def roster_to_dict(roster) -> Dict:
+    """Convert Roster object to its canonical dictionary form"""
+    return {
+        'schema_version': SCHEMA_VERSION,
+        'season': roster.season,
+        'league_id': roster.league_id,
+        'id': roster.id,
+        'user_id': roster.user_id,
+        'team_id': roster.team_id,
+        'created_at': roster.created_at.isoformat(),
+        'players': {slot: player_to_dict(player) for slot, player in zip(roster.slots, roster.players)}
+    }
+
+def encode_roster(roster) -> bytes:
+    """Encode a roster into the canonical stored payload"""
+    return dumps(roster_to_dict(roster))
+
+def upgrade_payload(raw: bytes) -> bytes:
+    """Return raw unchanged if canonical, otherwise re-encode an older record"""
+    if raw.startswith(PAYLOAD_PREFIX):
+        return raw
+
+    data = loads(raw)
+    data.pop('schema_version', None)
+    season = data.pop('season', LEGACY_SEASON)
+    league_id = data.pop('league_id', DEFAULT_LEAGUE)
+    data.setdefault('team_id', data['user_id'])
+    return dumps({'schema_version': SCHEMA_VERSION, 'season': season, 'league_id': league_id, **data})
+
+def payload_season(payload: bytes) -> int:
+    """Read the season of a canonical payload from its prefix, without parsing it"""
+    if payload.startswith(SEASON_PREFIX):
+        start = len(SEASON_PREFIX)
+        return int(payload[start:payload.index(b',', start)])
+    return loads(payload).get('season', LEGACY_SEASON)
+
+def join_payloads(payloads: Iterable[bytes]) -> bytes:
+    """Combine canonical payloads into a JSON array without re-encoding them"""
+    return b'[' + b','.join(payloads) + b']'
@@ -5,7 +5,9 @@ import time
 from datetime import datetime
 from typing import Optional, Dict, Any
 from data_import.nfl_stats_import import NFLStatsImporter
+from data_import.projections import ProjectionStage
 from data_import.playoff_roster_generator import PlayoffRosterGenerator
+from logging_setup import configure_logging
 
 class PipelineError(Exception):
     """Custom exception for pipeline errors"""
@@ -15,33 +17,20 @@ class NFLPipeline:
     def __init__(self):
         self._setup_logging()
         self.stats_importer = NFLStatsImporter()
+        # Nothing writes game logs keyed by catalog ids yet, so the stage is opt-in
+        self.projection_stage = ProjectionStage() if ProjectionStage.enabled() else None
         self.roster_generator = PlayoffRosterGenerator()
         self.last_run = None
         self.errors = []
     
     def _setup_logging(self):
-        """Configure logging for the pipeline"""
-        # Ensure logs directory exists
-        os.makedirs('logs', exist_ok=True)
-        
-        # Setup file handler
-        log_file = os.path.join('logs', 'pipeline.log')
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        ))
-        
-        # Setup console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(logging.Formatter(
-            '%(asctime)s - %(message)s'
-        ))
-        
-        # Configure logger
+        """Configure logging for the pipeline
+
+        Records go through the process-wide queue to logs/pipeline.log and
+        the console, so building several pipelines never duplicates lines.
+        """
+        configure_logging()
         self.logger = logging.getLogger('NFLPipeline')
-        self.logger.setLevel(logging.INFO)
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
     
     def _backup_data(self):
         """Create backup of current data"""
@@ -93,6 +82,39 @@ class NFLPipeline:
             })
             return {'success': False, 'error': str(e)}
     
+    def run_projections(self) -> Dict[str, Any]:
+        """Project player points from the imported game logs"""
+        if self.projection_stage is None:
+            return {
+                'success': True,
+                'skipped': True,
+                'reason': 'projections are disabled in config.yml',
+                'timestamp': datetime.now().isoformat()
+            }
+        self.logger.info('Starting projection stage')
+        try:
+            summary = self.projection_stage.run()
+            if summary['skipped']:
+                self.logger.info(f"Projections skipped: {summary['reason']}")
+            else:
+                self.logger.info(
+                    f"Projections updated: {summary['projected']} projected, {summary['reused']} reused"
+                )
+            return {
+                'success': True,
+                **summary,
+                'timestamp': datetime.now().isoformat()
+            }
+
+        except Exception as e:
+            self.logger.error(f'Projection stage failed: {str(e)}')
+            self.errors.append({
+                'step': 'projections',
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            })
+            return {'success': False, 'error': str(e)}
+
     def run_roster_generator(self) -> Dict[str, Any]:
         """Run the playoff roster generator process"""
         self.logger.info('Starting roster generation process')
@@ -123,6 +145,7 @@ class NFLPipeline:
         # Track results
         results = {
             'stats_import': None,
+            'projections': None,
             'roster_generator': None,
             'success': False,
             'errors': [],
@@ -134,6 +157,11 @@ class NFLPipeline:
             results['stats_import'] = self.run_stats_import()
             if not results['stats_import']['success']:
                 raise PipelineError('Stats import step failed')
+
+            # Project points from the game logs before the catalog is published
+            results['projections'] = self.run_projections()
+            if not results['projections']['success']:
+                raise PipelineError('Projection step failed')
             
             # Run roster generator
             results['roster_generator'] = self.run_roster_generator()
@@ -0,0 +1,279 @@
+import math
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Mapping, Optional, Tuple
+import yaml
+from player_catalog import PlayerCatalog, RosterTable, file_version
+
+if TYPE_CHECKING:
+    import numpy as np
+
+CONFIG_FILE = Path(__file__).resolve().parent / 'config.yml'
+DEFAULT_SCORING = 'standard'
+
+# Column order of every stat matrix and weight vector
+STAT_CATEGORIES: Tuple[str, ...] = (
+    'pass_yd', 'pass_td', 'pass_int',
+    'rush_yd', 'rush_td',
+    'rec', 'rec_yd', 'rec_td',
+    'two_pt', 'fumble_lost',
+    'fg_made', 'fg_missed', 'xp_made',
+    'def_sack', 'def_int', 'def_fumble_rec', 'def_td', 'def_safety'
+)
+CATEGORY_INDEX = {category: i for i, category in enumerate(STAT_CATEGORIES)}
+
+class ScoringError(Exception):
+    pass
+
+class ScoringSettings:
+    """Points per stat category compiled into a weight vector over STAT_CATEGORIES
+
+    Scoring a player x category stat matrix is then one matrix-vector product.
+    Compiled settings are immutable and shared.
+    """
+
+    def __init__(self, name: str, weights: Mapping[str, float]):
+        unknown = sorted(set(weights) - set(CATEGORY_INDEX))
+        if unknown:
+            raise ScoringError(f'Scoring settings {name} use unknown stat categories: {", ".join(unknown)}')
+        self.name = name
+        self.weights = {category: float(weights.get(category, 0.0)) for category in STAT_CATEGORIES}
+        self._vector = None
+
+    def __repr__(self) -> str:
+        return f'ScoringSettings({self.name!r})'
+
+    @property
+    def vector(self) -> 'np.ndarray':
+        """Weights in STAT_CATEGORIES order, built on first use"""
+        if self._vector is None:
+            # numpy is only needed once something is scored, so importing the web app stays cheap
+            import numpy as np
+            vector = np.array([self.weights[c] for c in STAT_CATEGORIES], dtype=np.float64)
+            vector.setflags(write=False)
+            self._vector = vector
+        return self._vector
+
+    def points(self, stats: Mapping[str, float]) -> float:
+        """Score one player's stat line"""
+        return sum(self.weights[c] * value for c, value in stats.items() if c in CATEGORY_INDEX)
+
+def compile_scoring(config: Mapping) -> Dict[str, ScoringSettings]:
+    """Compile the scoring_settings section of a parsed config"""
+    specs = config.get('scoring_settings') or {}
+    resolved: Dict[str, Dict[str, float]] = {}
+
+    def resolve(name: str, chain: Tuple[str, ...] = ()) -> Dict[str, float]:
+        if name in resolved:
+            return resolved[name]
+        if name in chain:
+            raise ScoringError(f'Scoring settings {name} extend themselves')
+        spec = specs.get(name)
+        if not isinstance(spec, Mapping):
+            raise ScoringError(f'Malformed scoring settings: {name}')
+        spec = dict(spec)
+        parent = spec.pop('extends', None)
+        weights = dict(resolve(parent, chain + (name,))) if parent else {}
+        try:
+            weights.update({category: float(value) for category, value in spec.items()})
+        except (TypeError, ValueError) as e:
+            raise ScoringError(f'Malformed scoring settings {name}: {e}')
+        resolved[name] = weights
+        return weights
+
+    return {name: ScoringSettings(name, resolve(name)) for name in specs}
+
+_compiled: Dict[Path, Tuple[str, Dict[str, ScoringSettings]]] = {}
+_compiled_lock = threading.Lock()
+
+def load_scoring(path=CONFIG_FILE) -> Dict[str, ScoringSettings]:
+    """Get every scoring setting in a config file, compiling it once per file version"""
+    path = Path(path)
+    version = file_version(path)
+    cached = _compiled.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _compiled_lock:
+        with open(path, 'r') as f:
+            settings = compile_scoring(yaml.safe_load(f) or {})
+        _compiled[path] = (version, settings)
+    return settings
+
+def get_scoring(name: str = DEFAULT_SCORING, path=CONFIG_FILE) -> ScoringSettings:
+    """Get compiled scoring settings by name"""
+    settings = load_scoring(path)
+    if name not in settings:
+        raise ScoringError(f'Unknown scoring settings: {name}')
+    return settings[name]
+
+class StatMatrix:
+    """A week's stats as a catalog index x STAT_CATEGORIES float matrix
+
+    Rows line up with PlayerCatalog indexes, the same indexes RosterTable
+    stores, so player points can be gathered per roster without lookups.
+    Players without stats score zero.
+    """
+
+    def __init__(self, catalog: PlayerCatalog, values: Optional['np.ndarray'] = None):
+        import numpy as np
+        self.catalog = catalog
+        if values is None:
+            values = np.zeros((catalog.size, len(STAT_CATEGORIES)), dtype=np.float64)
+        if values.ndim != 2 or values.shape[1] != len(STAT_CATEGORIES):
+            raise ScoringError(f'Stat matrix must have {len(STAT_CATEGORIES)} columns')
+        self.values = values
+
+    @classmethod
+    def from_records(cls, catalog: PlayerCatalog, records: Iterable[Mapping]) -> 'StatMatrix':
+        """Build a matrix from {'player_id': ..., <category>: value} records"""
+        matrix = cls(catalog)
+        for record in records:
+            matrix.set(record['player_id'], record)
+        return matrix
+
+    def _row(self, player_id: str) -> int:
+        index = self.catalog.index_of(player_id)
+        if index >= len(self.values):
+            import numpy as np
+            grown = np.zeros((self.catalog.size, len(STAT_CATEGORIES)), dtype=np.float64)
+            grown[:len(self.values)] = self.values
+            self.values = grown
+        return index
+
+    def set(self, player_id: str, stats: Mapping[str, float]):
+        """Set a player's stat categories; categories not given are left as they are"""
+        row = self._row(player_id)
+        for category, value in stats.items():
+            column = CATEGORY_INDEX.get(category)
+            if column is not None:
+                self.values[row, column] = float(value)
+
+    def get(self, player_id: str) -> Dict[str, float]:
+        """Get a player's stat line"""
+        row = self.catalog.index_of(player_id)
+        if row >= len(self.values):
+            return dict.fromkeys(STAT_CATEGORIES, 0.0)
+        return dict(zip(STAT_CATEGORIES, self.values[row].tolist()))
+
+def score_players(stats: StatMatrix, settings: ScoringSettings, size: Optional[int] = None) -> 'np.ndarray':
+    """Points for every catalog index, as one matrix-vector product
+
+    size pads the result with zeros for indexes assigned after the matrix was
+    built, so it can be indexed by any row of a roster table.
+    """
+    import numpy as np
+    points = stats.values @ settings.vector
+    size = size if size is not None else stats.catalog.size
+    if len(points) < size:
+        points = np.concatenate([points, np.zeros(size - len(points))])
+    return points
+
+def score_rosters(rows: 'np.ndarray', points: 'np.ndarray') -> 'np.ndarray':
+    """Sum player points across each row of an (N, slots) player-index matrix"""
+    return points[rows].sum(axis=1)
+
+class RosterScorer:
+    """Scores every roster of a RosterTable and rescores them after stat corrections
+
+    Holds a NumPy view of the table, so the table must not grow while the
+    scorer is in use; build a new scorer after loading more rosters.
+    """
+
+    def __init__(self, table: RosterTable, settings: ScoringSettings):
+        import numpy as np
+        self.table = table
+        self.settings = settings
+        self._rows = table.to_numpy()
+        self.points = np.zeros(table.catalog.size)
+        self.totals = np.zeros(len(table))
+
+    def score(self, stats: StatMatrix) -> 'np.ndarray':
+        """Score all rosters; returns the totals in table order"""
+        self.points = score_players(stats, self.settings, size=self.table.catalog.size)
+        self.totals = score_rosters(self._rows, self.points)
+        return self.totals
+
+    def scores(self, decimals: int = 2) -> Dict[str, float]:
+        """Roster id -> latest total"""
+        import numpy as np
+        return dict(zip(self.table.roster_ids, np.round(self.totals, decimals).tolist()))
+
+    def apply_correction(self, stats: StatMatrix, corrections: Mapping[str, Mapping[str, float]],
+                         decimals: int = 2) -> Dict[str, float]:
+        """Apply stat corrections by player id and rescore every roster
+
+        Returns only the rosters whose rounded totals changed, ready to be
+        published to score subscribers.
+        """
+        import numpy as np
+        for player_id, values in corrections.items():
+            stats.set(player_id, values)
+        before = np.round(self.totals, decimals)
+        after = np.round(self.score(stats), decimals)
+        roster_ids = self.table.roster_ids
+        return {roster_ids[i]: float(after[i]) for i in np.flatnonzero(before != after)}
+
+def check_stat_records(catalog: PlayerCatalog, records: Iterable[Mapping]):
+    """Raise ScoringError unless every record names a catalog player and has finite values
+
+    Uses catalog membership rather than index_of, so unknown ids are never
+    registered in the shared catalog.
+    """
+    for record in records:
+        player_id = record.get('player_id')
+        if not isinstance(player_id, str) or player_id not in catalog:
+            raise ScoringError(f'Unknown player: {player_id!r}')
+        for category, value in record.items():
+            if category not in CATEGORY_INDEX:
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ScoringError(f'{player_id}: {category} must be a number, got {value!r}')
+            if not math.isfinite(value):
+                raise ScoringError(f'{player_id}: {category} must be finite, got {value!r}')
+
+class LiveScores:
+    """A league's stats for the week, rescored as updates and corrections arrive
+
+    The first update after the scorer is dropped (on startup, or when a
+    roster is added) rebuilds it from the store and scores every roster;
+    later ones only apply the corrections. publish receives the totals that
+    changed, e.g. EventHub.publish_scores.
+    """
+
+    def __init__(self, manager, publish: Callable[[Dict[str, float]], None]):
+        self.manager = manager
+        self.publish = publish
+        self.stats: Optional[StatMatrix] = None
+        self._scorer: Optional[RosterScorer] = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Rebuild the scorer on the next update, e.g. after a roster is added"""
+        with self._lock:
+            self._scorer = None
+
+    def update(self, records: Iterable[Mapping]) -> Dict[str, float]:
+        """Apply {'player_id': ..., <category>: value} stat records and publish changed totals
+
+        The whole batch is checked first, so a bad record changes nothing.
+        """
+        records = list(records)
+        check_stat_records(self.manager.catalog, records)
+        corrections = {record['player_id']: record for record in records}
+        with self._lock:
+            if self.stats is None:
+                self.stats = StatMatrix(self.manager.catalog)
+            if self._scorer is None:
+                for player_id, values in corrections.items():
+                    self.stats.set(player_id, values)
+                self._scorer = self.manager.roster_scorer()
+                self._scorer.score(self.stats)
+                changed = self._scorer.scores()
+            else:
+                changed = self._scorer.apply_correction(self.stats, corrections)
+        if changed:
+            self.publish(changed)
+        return changed
@@ -0,0 +1,30 @@
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+PLAYOFF_FIELDS_FILE = Path(__file__).resolve().parent / 'data_import' / 'playoff_fields.json'
+
+# Rosters written before records carried a season were all for this contest
+LEGACY_SEASON = 2023
+
+@lru_cache(maxsize=1)
+def load_playoff_fields() -> Dict[int, Dict[str, Dict]]:
+    """Load every season's playoff field, keyed by season"""
+    with open(PLAYOFF_FIELDS_FILE, 'r') as f:
+        fields = json.load(f)
+    return {int(season): teams for season, teams in fields.items()}
+
+def playoff_field(season: int) -> Dict[str, Dict]:
+    """Get the playoff teams for a season"""
+    fields = load_playoff_fields()
+    if season not in fields:
+        raise KeyError(f'No playoff field recorded for season {season}')
+    return fields[season]
+
+def current_season() -> int:
+    """The season open for new rosters: $SEASON, else the latest recorded field"""
+    if os.environ.get('SEASON'):
+        return int(os.environ['SEASON'])
+    return max(load_playoff_fields())
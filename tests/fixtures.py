@@ -0,0 +1,27 @@
+from typing import Dict
+from data_import.playoff_roster_generator import PlayoffRosterGenerator
+
+SLOT_POSITIONS = [
+    ('qb', 'QB'), ('rb1', 'RB'), ('rb2', 'RB'), ('wr1', 'WR'), ('wr2', 'WR'),
+    ('wr3', 'WR'), ('te', 'TE'), ('superflex', 'QB'), ('flex', 'RB'),
+    ('kicker', 'K'), ('defense', 'DEF')
+]
+
+def seed_players(data_dir: str) -> Dict:
+    """Write the generator's sample players into data_dir and return them"""
+    generator = PlayoffRosterGenerator(data_dir)
+    players = generator._generate_sample_players()
+    generator._save_players(players)
+    return players
+
+def build_roster_data(players: Dict, offset: int = 0) -> Dict:
+    """Pick a valid roster, one player per team, from a players dict"""
+    teams = sorted({p['team'] for p in players.values()})
+    teams = teams[offset:] + teams[:offset]
+    roster_data = {}
+    for (slot, position), team in zip(SLOT_POSITIONS, teams):
+        roster_data[slot] = next(
+            p['id'] for p in players.values()
+            if p['team'] == team and p['position'] == position
+        )
+    return roster_data
@@ -0,0 +1,146 @@
+import unittest
+import json
+import shutil
+import tempfile
+from unittest.mock import patch
+import app as app_module
+from roster_manager import RosterManager
+from response_cache import ResponseCache
+from roster_serialization import SCHEMA_VERSION
+from tests.fixtures import build_roster_data, seed_players
+
+class TestRosterEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+
+        app_module.roster_manager = RosterManager(self.data_dir)
+        app_module.response_cache = ResponseCache(max_entries=8)
+        app_module.fragment_cache = ResponseCache(max_entries=8)
+        app_module.app.config['TESTING'] = True
+        self.client = app_module.app.test_client()
+        self.roster = app_module.roster_manager.create_roster(
+            'test_user', build_roster_data(self.players)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_get_roster_sets_cache_headers(self):
+        """Test roster reads carry a strong ETag and Cache-Control"""
+        response = self.client.get(f'/api/roster/{self.roster.id}')
+
+        self.assertEqual(response.status_code, 200)
+        etag, weak = response.get_etag()
+        self.assertTrue(etag)
+        self.assertFalse(weak)
+        self.assertIn('max-age', response.headers['Cache-Control'])
+        self.assertEqual(response.get_json()['id'], self.roster.id)
+
+    def test_get_roster_if_none_match(self):
+        """Test a matching If-None-Match returns 304 without a body"""
+        first = self.client.get(f'/api/roster/{self.roster.id}')
+        etag = first.headers['ETag']
+
+        second = self.client.get(
+            f'/api/roster/{self.roster.id}',
+            headers={'If-None-Match': etag}
+        )
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.data, b'')
+        self.assertEqual(second.headers['ETag'], etag)
+
+    def test_get_roster_served_from_cache(self):
+        """Test repeated reads do not touch the stored file again"""
+        self.client.get(f'/api/roster/{self.roster.id}')
+        roster_file = app_module.roster_manager.rosters_dir / f'{self.roster.id}.json'
+        roster_file.unlink()
+
+        response = self.client.get(f'/api/roster/{self.roster.id}')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['user_id'], 'test_user')
+
+    def test_get_roster_returns_stored_payload(self):
+        """Test the API body is the canonical payload written at creation"""
+        response = self.client.get(f'/api/roster/{self.roster.id}')
+        stored = app_module.roster_manager.get_roster_bytes(self.roster.id)
+
+        self.assertEqual(response.data, stored)
+        self.assertEqual(response.get_json()['schema_version'], SCHEMA_VERSION)
+
+    def test_get_roster_upgrades_legacy_file(self):
+        """Test indented pre-versioning roster files are still served"""
+        data = json.loads(app_module.roster_manager.get_roster_bytes(self.roster.id))
+        del data['schema_version']
+        legacy_file = app_module.roster_manager.rosters_dir / 'legacy.json'
+        legacy_file.write_text(json.dumps(dict(data, id='legacy'), indent=2))
+
+        response = self.client.get('/api/roster/legacy')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['schema_version'], SCHEMA_VERSION)
+        self.assertEqual(response.get_json()['players'], data['players'])
+
+    def test_get_all_rosters(self):
+        """Test the roster list joins every stored payload"""
+        app_module.roster_manager.create_roster(
+            'other_user', build_roster_data(self.players, offset=3)
+        )
+
+        response = self.client.get('/api/rosters')
+
+        self.assertEqual(response.status_code, 200)
+        rosters = response.get_json()
+        self.assertEqual(len(rosters), 2)
+        self.assertEqual({r['user_id'] for r in rosters}, {'test_user', 'other_user'})
+
+    def test_ownership_counts_new_rosters(self):
+        """Test ownership analytics include rosters created after startup"""
+        app_module.roster_manager.ownership.refresh_interval = 0
+        app_module.roster_manager.create_roster(
+            'other_user', build_roster_data(self.players)
+        )
+
+        response = self.client.get('/api/analytics/ownership')
+
+        snapshot = response.get_json()
+        self.assertEqual(snapshot['total_rosters'], 2)
+        qb = next(p for p in snapshot['players'] if p['id'] == self.roster.qb.id)
+        self.assertEqual(qb['pct'], 100.0)
+        self.assertEqual(snapshot['qb_superflex'][0]['count'], 2)
+        self.assertEqual(len(snapshot['team_slots']['counts']), len(snapshot['team_slots']['teams']))
+
+    def test_get_roster_not_found(self):
+        """Test unknown rosters return 404"""
+        response = self.client.get('/api/roster/missing')
+        self.assertEqual(response.status_code, 404)
+
+    def test_view_roster_page_cached(self):
+        """Test roster pages render once and refresh only the timestamp"""
+        first = self.client.get(f'/roster/{self.roster.id}')
+        self.assertEqual(first.status_code, 200)
+        self.assertIn(self.roster.qb.name, first.get_data(as_text=True))
+        self.assertIn('Last Updated: 20', first.get_data(as_text=True))
+
+        with patch.object(app_module, 'render_template') as render:
+            second = self.client.get(f'/roster/{self.roster.id}')
+            render.assert_not_called()
+        self.assertEqual(second.status_code, 200)
+        self.assertIn(self.roster.qb.name, second.get_data(as_text=True))
+
+    def test_create_roster_page_invalidated_by_new_catalog(self):
+        """Test publishing a new catalog re-renders the player dropdowns"""
+        self.client.get('/create-roster')
+        players_file = app_module.roster_manager.players_file
+        players = json.loads(players_file.read_text())
+        players['1']['name'] = 'Renamed Quarterback'
+        players_file.write_text(json.dumps(players))
+
+        response = self.client.get('/create-roster')
+
+        self.assertIn('Renamed Quarterback', response.get_data(as_text=True))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+import copy
+import shutil
+import tempfile
+from unittest.mock import patch
+from catalog_changes import CatalogChange, ChangeLog, diff_players
+from data_import.playoff_roster_generator import PlayoffRosterGenerator
+from player_catalog import file_version
+from player_search import PlayerSearchIndex
+from roster_manager import RosterManager
+
+class TestCatalogChanges(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.generator = PlayoffRosterGenerator(self.data_dir)
+        self.players = self.generator._generate_sample_players()
+        self.generator.publish(self.players)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def _updated_players(self):
+        players = copy.deepcopy(self.players)
+        first, second = list(players)[:2]
+        players[first]['projected_points'] = 99.5
+        del players[second]
+        players['NEW_WR9'] = dict(players[first], id='NEW_WR9', name='Late Signing')
+        return players, first, second
+
+    def test_diff_players(self):
+        """Test records are reported as added, removed or changed by field"""
+        players, first, second = self._updated_players()
+
+        added, removed, changed = diff_players(self.players, players)
+
+        self.assertEqual(list(added), ['NEW_WR9'])
+        self.assertEqual(removed, (second,))
+        self.assertEqual(
+            changed,
+            {first: {'projected_points': [self.players[first]['projected_points'], 99.5]}}
+        )
+
+    def test_unchanged_publish_skips_write(self):
+        """Test republishing identical players leaves players.json and the log alone"""
+        version = file_version(self.generator.players_file)
+
+        self.assertIsNone(self.generator.publish(copy.deepcopy(self.players)))
+
+        self.assertEqual(file_version(self.generator.players_file), version)
+        self.assertEqual(self.generator.change_log.entries(), [])
+
+    def test_publish_logs_change(self):
+        """Test a changed catalog is logged as a diff between file versions"""
+        before = file_version(self.generator.players_file)
+        players, first, _ = self._updated_players()
+
+        change = self.generator.publish(players)
+
+        self.assertEqual(change.from_version, before)
+        self.assertEqual(change.to_version, file_version(self.generator.players_file))
+        self.assertEqual(self.generator.change_log.entries(), [change])
+        self.assertIn(first, change.changed)
+
+    def test_manager_applies_logged_change(self):
+        """Test the roster manager patches its catalog instead of reloading it"""
+        manager = RosterManager(self.data_dir)
+        manager.load_catalog()
+        players, first, second = self._updated_players()
+        self.generator.publish(players)
+
+        with patch('roster_manager.read_snapshot') as read_snapshot:
+            catalog = manager.load_catalog()
+
+        read_snapshot.assert_not_called()
+        self.assertEqual(catalog.version, manager.catalog_version)
+        self.assertEqual(catalog[first].projected_points, 99.5)
+        self.assertNotIn(second, catalog)
+        self.assertEqual(catalog['NEW_WR9'].name, 'Late Signing')
+        self.assertEqual(len(catalog), len(players))
+
+    def test_search_index_with_changes(self):
+        """Test a patched search index answers like a rebuilt one"""
+        manager = RosterManager(self.data_dir)
+        index = PlayerSearchIndex(manager.load_catalog(), manager.catalog_version)
+        players, first, second = self._updated_players()
+        change = self.generator.publish(players)
+        catalog = manager.load_catalog()
+
+        patched = index.with_changes(catalog, change.player_ids, change.to_version)
+        rebuilt = PlayerSearchIndex(catalog, change.to_version)
+
+        self.assertEqual(len(patched), len(rebuilt))
+        for query in ('late', 'signing', self.players[second]['name'], ''):
+            self.assertEqual(
+                [p.id for p, _ in patched.search(query, limit=50)],
+                [p.id for p, _ in rebuilt.search(query, limit=50)]
+            )
+        self.assertNotEqual(index.search('late'), patched.search('late'))
+
+class TestChangeLog(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.log = ChangeLog(f'{self.data_dir}/changes.ndjson', max_entries=4)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_between_follows_chain(self):
+        """Test changes are chained by version and gaps return None"""
+        for i in range(3):
+            self.log.append(CatalogChange(f'v{i}', f'v{i + 1}', removed=(f'p{i}',)))
+
+        self.assertEqual([c.removed for c in self.log.between('v0', 'v3')], [('p0',), ('p1',), ('p2',)])
+        self.assertEqual(self.log.between('v3', 'v3'), [])
+        self.assertIsNone(self.log.between('v9', 'v3'))
+
+    def test_log_is_trimmed(self):
+        """Test only the newest entries are kept"""
+        for i in range(6):
+            self.log.append(CatalogChange(f'v{i}', f'v{i + 1}'))
+
+        entries = ChangeLog(self.log.path).entries()
+        self.assertLessEqual(len(entries), 4)
+        self.assertEqual(entries[-1].to_version, 'v6')
+        self.assertIsNone(self.log.between('v0', 'v6'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import json
+from event_hub import EventHub
+
+def parse_event(message):
+    """Split an SSE message into its event name and decoded data"""
+    lines = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+    return lines['event'], json.loads(lines['data'])
+
+class TestEventHub(unittest.TestCase):
+    def setUp(self):
+        # A long tick keeps the background thread out of the way; tests flush by hand
+        self.hub = EventHub(tick=3600, heartbeat=0.01)
+
+    def drain(self, subscription):
+        messages = []
+        while not subscription.messages.empty():
+            messages.append(parse_event(subscription.messages.get_nowait()))
+        return messages
+
+    def test_scores_coalesced_per_tick(self):
+        """Test several score changes in one tick produce a single update"""
+        subscription = self.hub.subscribe()
+        self.hub.publish_scores({'a': 10.0, 'b': 5.0})
+        self.hub.publish_scores({'a': 12.0})
+        self.hub.publish_scores({'b': 20.0})
+
+        self.hub.flush()
+
+        messages = self.drain(subscription)
+        self.assertEqual(len(messages), 1)
+        event, data = messages[0]
+        self.assertEqual(event, 'update')
+        self.assertEqual(data['scores'], {'a': 12.0, 'b': 20.0})
+        self.assertEqual(data['ranks']['b'], {'rank': 1, 'previous': None})
+
+    def test_subscription_filters_rosters(self):
+        """Test clients only receive updates for rosters they follow"""
+        subscription = self.hub.subscribe(['a'])
+        self.hub.publish_scores({'a': 1.0, 'b': 2.0})
+        self.hub.flush()
+        self.drain(subscription)
+
+        self.hub.publish_scores({'b': 3.0})
+        self.hub.publish('roster_created', {'roster_id': 'c'}, roster_id='c')
+        self.hub.flush()
+        self.assertEqual(self.drain(subscription), [])
+
+        self.hub.publish_scores({'a': 4.0})
+        self.hub.flush()
+        event, data = self.drain(subscription)[0]
+        self.assertEqual(data['scores'], {'a': 4.0})
+        self.assertEqual(data['ranks'], {'a': {'rank': 1, 'previous': 2}})
+
+    def test_leagues_ranked_separately(self):
+        """Test scores and rank moves of one league never reach another league's clients"""
+        office = self.hub.subscribe(league_id='office')
+        family = self.hub.subscribe(league_id='family')
+        self.hub.publish_scores({'a': 10.0, 'b': 5.0}, league_id='office')
+        self.hub.publish_scores({'c': 50.0}, league_id='family')
+        self.hub.publish('roster_created', {'roster_id': 'd'}, roster_id='d', league_id='family')
+
+        self.hub.flush()
+
+        [(_, office_update)] = self.drain(office)
+        self.assertEqual(office_update['scores'], {'a': 10.0, 'b': 5.0})
+        self.assertEqual(office_update['ranks']['a'], {'rank': 1, 'previous': None})
+        self.assertEqual([event for event, _ in self.drain(family)], ['roster_created', 'update'])
+
+    def test_unchanged_scores_not_sent(self):
+        """Test republishing identical scores sends nothing"""
+        self.hub.publish_scores({'a': 1.0})
+        self.hub.flush()
+        subscription = self.hub.subscribe()
+
+        self.hub.publish_scores({'a': 1.0})
+
+        self.assertEqual(self.hub.flush(), 0)
+        self.assertEqual(self.drain(subscription), [])
+
+    def test_stream_unsubscribes_on_close(self):
+        """Test the stream sends heartbeats and cleans up when closed"""
+        subscription = self.hub.subscribe()
+        stream = self.hub.stream(subscription)
+
+        self.assertTrue(next(stream).startswith('retry:'))
+        self.assertEqual(next(stream), ': keep-alive\n\n')
+        stream.close()
+
+        self.assertEqual(self.hub.subscriber_count, 0)
+
+if __name__ == '__main__':
+    unittest.main()
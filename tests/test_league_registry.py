@@ -0,0 +1,189 @@
+import unittest
+import json
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+import app as app_module
+from league_registry import LeagueError, LeagueRegistry
+from response_cache import ResponseCache
+from roster_manager import RosterManager
+from roster_serialization import DEFAULT_LEAGUE, SCHEMA_VERSION, upgrade_payload
+from tests.fixtures import build_roster_data, seed_players
+
+class TestLeagueRegistry(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+        self.registry = LeagueRegistry(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_leagues_store_rosters_separately(self):
+        """Test each league writes to its own directory and sees only its rosters"""
+        office = self.registry.create('office')
+        family = self.registry.create('family')
+
+        roster = office.create_roster('user_a', build_roster_data(self.players))
+
+        self.assertEqual(roster.league_id, 'office')
+        self.assertTrue((office.rosters_dir / f'{roster.id}.json').exists())
+        self.assertEqual(office.rosters_dir.parent.name, 'office')
+        self.assertIsNone(family.get_roster(roster.id))
+        self.assertEqual(len(list(family.iter_rosters())), 0)
+        self.assertIs(office.catalog, family.catalog)
+
+    def test_payload_records_league(self):
+        """Test stored payloads carry the league and legacy payloads default it"""
+        office = self.registry.create('office')
+        roster = office.create_roster('user_a', build_roster_data(self.players))
+
+        data = json.loads(office.get_roster_payload(roster.id))
+        self.assertEqual(data['league_id'], 'office')
+
+        legacy = json.loads(upgrade_payload(b'{"id": "r1", "user_id": "user_a"}'))
+        self.assertEqual(legacy['schema_version'], SCHEMA_VERSION)
+        self.assertEqual(legacy['league_id'], DEFAULT_LEAGUE)
+
+    def test_default_league_uses_original_directory(self):
+        """Test the default league keeps data/rosters"""
+        manager = self.registry.get()
+        self.assertEqual(manager.rosters_dir.name, 'rosters')
+        self.assertEqual(str(manager.rosters_dir.parent), self.data_dir)
+
+    def test_lazy_load_and_idle_eviction(self):
+        """Test leagues load on first use and are dropped once idle"""
+        self.registry.create('office')
+        self.registry.idle_timeout = 0
+        self.registry.evict_idle()
+        self.assertFalse(self.registry.is_loaded('office'))
+
+        self.registry.get('office')
+        self.assertTrue(self.registry.is_loaded('office'))
+        self.assertEqual(self.registry.evict_idle(), 1)
+        self.assertEqual(len(self.registry), 0)
+
+    def test_evicted_league_closed_when_released(self):
+        """Test an evicted league keeps its log open until its last holder lets go"""
+        manager = self.registry.create('office')
+        wal = manager.wal
+        self.registry.idle_timeout = 0
+
+        self.registry.evict_idle()
+        self.assertFalse(wal._file.closed)
+        manager.create_roster('user_a', build_roster_data(self.players))
+
+        del manager
+        self.assertTrue(wal._file.closed)
+
+    def test_held_league_not_reopened(self):
+        """Test an evicted league still held by a request is handed out again instead of reopened"""
+        manager = self.registry.create('office')
+        self.registry.idle_timeout = 0
+        self.registry.evict_idle()
+        self.registry.idle_timeout = 900
+
+        self.assertIs(self.registry.get('office'), manager)
+        self.assertTrue(self.registry.is_loaded('office'))
+
+    def test_idle_leagues_swept_in_background(self):
+        """Test idle leagues are evicted without any further requests"""
+        registry = LeagueRegistry(self.data_dir, idle_timeout=0.05)
+        registry.create('office')
+
+        deadline = time.monotonic() + 5
+        while registry.is_loaded('office') and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(registry.is_loaded('office'))
+
+    def test_slow_load_blocks_only_its_league(self):
+        """Test other leagues are served while one loads, and the load runs once"""
+        self.registry.create('family')
+        self.registry.create('office')
+        self.registry.idle_timeout = 0
+        self.registry.evict_idle()
+        family = self.registry.get('family')
+        real_open = self.registry._open
+        opened = []
+
+        def slow_open(league_id):
+            opened.append(league_id)
+            time.sleep(0.3)
+            return real_open(league_id)
+
+        self.registry.idle_timeout = 900
+        results = []
+        with patch.object(self.registry, '_open', side_effect=slow_open):
+            threads = [
+                threading.Thread(target=lambda: results.append(self.registry.get('office')))
+                for _ in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(0.05)
+            start = time.perf_counter()
+            self.assertIs(self.registry.get('family'), family)
+            self.assertLess(time.perf_counter() - start, 0.1)
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(opened, ['office'])
+        self.assertIs(results[0], results[1])
+
+    def test_league_format_from_settings(self):
+        """Test a league opens with the format and scoring recorded at creation"""
+        self.registry.create('no_kickers', league_format='two_flex_no_kicker', scoring='ppr')
+        reopened = LeagueRegistry(self.data_dir)
+
+        self.assertEqual(reopened.get('no_kickers').format.name, 'two_flex_no_kicker')
+        self.assertEqual(reopened.get('no_kickers').scoring.name, 'ppr')
+        self.assertEqual(reopened.league_ids(), [DEFAULT_LEAGUE, 'no_kickers'])
+
+    def test_unknown_and_invalid_leagues(self):
+        """Test missing leagues and unsafe ids raise LeagueError"""
+        with self.assertRaises(LeagueError):
+            self.registry.get('missing')
+        with self.assertRaises(LeagueError):
+            self.registry.get('../rosters')
+
+class TestLeagueEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+        app_module.leagues = LeagueRegistry(self.data_dir)
+        app_module.roster_manager = RosterManager(self.data_dir)
+        app_module.response_cache = ResponseCache(max_entries=8)
+        app_module.fragment_cache = ResponseCache(max_entries=8)
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_submit_and_read_in_league(self):
+        """Test ?league= routes writes and reads to that league only"""
+        app_module.leagues.create('office')
+        roster_data = build_roster_data(self.players)
+
+        response = self.client.post('/api/submit-roster?league=office', json=roster_data)
+        self.assertEqual(response.status_code, 200)
+        roster_id = response.get_json()['roster_id']
+        self.assertEqual(response.get_json()['league_id'], 'office')
+
+        self.assertEqual(self.client.get(f'/api/roster/{roster_id}?league=office').status_code, 200)
+        self.assertEqual(self.client.get(f'/api/roster/{roster_id}').status_code, 404)
+        self.assertEqual(len(self.client.get('/api/rosters?league=office').get_json()), 1)
+        self.assertEqual(self.client.get('/api/rosters').get_json(), [])
+
+    def test_unknown_league(self):
+        """Test requests for a missing league return 404"""
+        self.assertEqual(self.client.get('/api/rosters?league=missing').status_code, 404)
+        response = self.client.post(
+            '/api/submit-roster',
+            json=dict(build_roster_data(self.players), league_id='missing')
+        )
+        self.assertEqual(response.status_code, 404)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import os
+import shutil
+import tempfile
+from league_rules import LeagueFormat, LeagueRulesError, SlotRule, get_format, load_formats
+from player_catalog import Player
+from roster_manager import RosterManager, RosterValidationError
+from tests.fixtures import build_roster_data, seed_players
+
+def player(player_id, position, team):
+    return Player(player_id, f'{position} {team}', position, team)
+
+class TestLeagueFormat(unittest.TestCase):
+    def setUp(self):
+        self.format = get_format('standard')
+        teams = ['BAL', 'BUF', 'KC', 'HOU', 'CLE', 'MIA', 'PIT', 'SF', 'DAL', 'DET', 'TB']
+        positions = ['QB', 'RB', 'RB', 'WR', 'WR', 'WR', 'TE', 'QB', 'TE', 'K', 'DEF']
+        self.lineup = {
+            slot: player(str(i), position, team)
+            for i, (slot, position, team) in enumerate(zip(self.format.slots, positions, teams))
+        }
+
+    def test_eligibility_table(self):
+        """Test each position's bitmask covers exactly its eligible slots"""
+        self.assertTrue(self.format.is_eligible('QB', 'superflex'))
+        self.assertFalse(self.format.is_eligible('QB', 'flex'))
+        self.assertTrue(self.format.is_eligible('TE', 'flex'))
+        self.assertEqual(self.format.slot_mask('K'), 1 << self.format.slot_index['kicker'])
+        self.assertEqual(self.format.slot_mask('P'), 0)
+
+    def test_valid_lineup(self):
+        """Test a legal lineup passes"""
+        self.assertIsNone(self.format.validate(self.lineup))
+
+    def test_invalid_lineups(self):
+        """Test each kind of violation is reported"""
+        self.assertEqual(
+            self.format.validate(dict(self.lineup, flex=player('x', 'QB', 'GB'))),
+            'Invalid FLEX selection'
+        )
+        self.assertEqual(
+            self.format.validate(dict(self.lineup, kicker=player('x', 'K', 'BAL'))),
+            'Cannot select multiple players from the same team'
+        )
+        lineup = dict(self.lineup)
+        del lineup['defense']
+        self.assertEqual(self.format.validate(lineup), 'Missing Defense selection')
+        self.assertEqual(
+            self.format.validate(dict(self.lineup, bench=player('x', 'WR', 'GB'))),
+            'Unknown roster slot: bench'
+        )
+
+    def test_interchangeable_slot_groups(self):
+        """Test slots with the same eligible positions are grouped"""
+        self.assertIn(('rb1', 'rb2'), self.format.slot_groups)
+        self.assertIn(('wr1', 'wr2', 'wr3'), self.format.slot_groups)
+
+    def test_named_slots(self):
+        """Test slot names and labels resolve to slot bitmasks"""
+        two_flex = get_format('two_flex_no_kicker')
+        flex_bits = 1 << two_flex.slot_index['flex1'] | 1 << two_flex.slot_index['flex2']
+
+        self.assertEqual(self.format.named_slots_mask('Kicker'), 1 << self.format.slot_index['kicker'])
+        self.assertEqual(two_flex.named_slots_mask('FLEX'), flex_bits)
+        self.assertEqual(two_flex.named_slots_mask('flex2'), 1 << two_flex.slot_index['flex2'])
+        self.assertEqual(two_flex.named_slots_mask('superflex'), 0)
+
+    def test_formats_compiled_once(self):
+        """Test repeated lookups reuse the compiled formats"""
+        self.assertIs(load_formats(), load_formats())
+        self.assertIs(get_format('standard'), get_format('standard'))
+
+    def test_unknown_and_malformed_formats(self):
+        """Test bad format definitions raise LeagueRulesError"""
+        with self.assertRaises(LeagueRulesError):
+            get_format('missing')
+        with self.assertRaises(LeagueRulesError):
+            LeagueFormat('empty', [])
+        with self.assertRaises(LeagueRulesError):
+            LeagueFormat('twice', [SlotRule('qb', 'QB', ('QB',)), SlotRule('qb', 'QB', ('QB',))])
+
+class TestLeagueFormatRosters(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_alternate_format_roundtrip(self):
+        """Test a format without a kicker and with two FLEX slots needs no code changes"""
+        manager = RosterManager(self.data_dir, league_format='two_flex_no_kicker')
+        standard = build_roster_data(self.players)
+        roster_data = {
+            'qb': standard['qb'], 'rb1': standard['rb1'], 'rb2': standard['rb2'],
+            'wr1': standard['wr1'], 'wr2': standard['wr2'], 'te': standard['te'],
+            'flex1': standard['wr3'], 'flex2': standard['flex'], 'defense': standard['defense']
+        }
+
+        roster = manager.create_roster('user_a', roster_data)
+        loaded = manager.get_roster(roster.id)
+
+        self.assertEqual(loaded.slots, manager.format.slots)
+        self.assertEqual(loaded.flex2.id, standard['flex'])
+        self.assertFalse(hasattr(loaded, 'kicker'))
+        with self.assertRaises(RosterValidationError):
+            manager.create_roster('user_a', dict(roster_data, kicker=standard['kicker']))
+
+    def test_create_roster_reports_rule(self):
+        """Test the manager surfaces the format's validation message"""
+        manager = RosterManager(self.data_dir)
+        roster_data = build_roster_data(self.players)
+        roster_data['te'] = roster_data['kicker']
+
+        with self.assertRaisesRegex(RosterValidationError, 'Invalid TE selection'):
+            manager.create_roster('user_a', roster_data)
+
+if __name__ == '__main__':
+    unittest.main()
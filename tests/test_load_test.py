@@ -0,0 +1,56 @@
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from benchmarks.load_test import find_regressions, percentile, seed_store, summarize
+from roster_manager import RosterManager
+
+class TestLoadTestHarness(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        """Test percentiles use the nearest-rank definition"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_summarize(self):
+        """Test endpoint statistics are reported in milliseconds"""
+        stats = summarize([0.001, 0.002, 0.003, 0.004], errors=1, elapsed=2.0)
+
+        self.assertEqual(stats['requests'], 4)
+        self.assertEqual(stats['throughput_rps'], 2.0)
+        self.assertEqual(stats['p50_ms'], 2.0)
+        self.assertEqual(stats['max_ms'], 4.0)
+
+    def test_find_regressions(self):
+        """Test throughput drops and p95 increases past the threshold are flagged"""
+        baseline = {'endpoints': {
+            'get_roster': {'throughput_rps': 1000.0, 'p95_ms': 10.0},
+            'get_rosters': {'throughput_rps': 100.0, 'p95_ms': 50.0}
+        }}
+        current = {'endpoints': {
+            'get_roster': {'throughput_rps': 700.0, 'p95_ms': 10.5},
+            'get_rosters': {'throughput_rps': 95.0, 'p95_ms': 80.0}
+        }}
+
+        regressions = find_regressions(baseline, current, threshold=0.2)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith('get_roster: throughput'))
+        self.assertTrue(regressions[1].startswith('get_rosters: p95'))
+
+    def test_seed_store_creates_valid_rosters(self):
+        """Test seeded rosters pass validation and are readable"""
+        data_dir = Path(tempfile.mkdtemp())
+        try:
+            players, roster_ids = seed_store(data_dir, n_players=200, n_rosters=20)
+
+            self.assertGreaterEqual(len(players), 200)
+            manager = RosterManager(str(data_dir))
+            self.assertEqual(len(list(manager.iter_rosters())), 20)
+            self.assertIsNotNone(manager.get_roster(roster_ids[0]))
+        finally:
+            shutil.rmtree(data_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+from data_import.api import ApiConfig, NFLApiClient, NFLDataCache
+from logging_setup import (
+    JsonFormatter, RateLimitFilter, configure_logging, flush_logging, shutdown_logging
+)
+
+def make_record(msg='boom', level=logging.ERROR, lineno=10, **extra):
+    record = logging.LogRecord('test', level, '/src/module.py', lineno, msg, (), None)
+    record.__dict__.update(extra)
+    return record
+
+class TestLoggingSetup(unittest.TestCase):
+    def setUp(self):
+        # Start from an unconfigured process writing into a scratch LOG_DIR
+        shutdown_logging()
+        self.log_dir = tempfile.mkdtemp()
+        self.env = patch.dict(os.environ, {'LOG_DIR': self.log_dir})
+        self.env.start()
+
+    def tearDown(self):
+        shutdown_logging()
+        self.env.stop()
+        shutil.rmtree(self.log_dir)
+
+    def test_configured_once_per_process(self):
+        """Test repeated clients and setups add no handlers"""
+        listener = configure_logging()
+        root_handlers = list(logging.getLogger().handlers)
+        cache_dir = tempfile.mkdtemp()
+
+        for _ in range(3):
+            NFLApiClient(ApiConfig(base_url='http://localhost'), NFLDataCache(cache_dir))
+
+        self.assertIs(configure_logging(), listener)
+        self.assertEqual(logging.getLogger().handlers, root_handlers)
+        self.assertEqual(logging.getLogger('NFLApiClient').handlers, [])
+
+    def test_records_written_as_json(self):
+        """Test records reach their file through the queue as JSON lines"""
+        listener = configure_logging()
+        log_file = next(
+            Path(h.baseFilename) for h in listener.handlers
+            if getattr(h, 'baseFilename', '').endswith('nfl_api.log')
+        )
+
+        logging.getLogger('NFLApiClient').info('fetched roster', extra={'team': 'KC'})
+        flush_logging()
+
+        entry = json.loads(log_file.read_text().splitlines()[-1])
+        self.assertEqual(entry['msg'], 'fetched roster')
+        self.assertEqual(entry['team'], 'KC')
+        self.assertEqual(entry['logger'], 'NFLApiClient')
+        self.assertEqual(log_file.parent, Path(self.log_dir))
+
+    def test_shutdown_stops_writer(self):
+        """Test shutting down flushes, stops the listener and allows a fresh setup"""
+        listener = configure_logging()
+        logging.getLogger('NFLPipeline').warning('stopping')
+
+        shutdown_logging()
+
+        self.assertIsNone(listener._thread)
+        self.assertIn('stopping', (Path(self.log_dir) / 'pipeline.log').read_text())
+        self.assertIsNot(configure_logging(), listener)
+
+    def test_json_formatter_extra_fields(self):
+        """Test extra= fields are kept and standard attributes are not repeated"""
+        entry = json.loads(JsonFormatter().format(make_record(level=logging.INFO, roster_id='r1')))
+        self.assertEqual(entry['roster_id'], 'r1')
+        self.assertNotIn('lineno', entry)
+
+    def test_errors_rate_limited_per_call_site(self):
+        """Test a flood from one call site is cut to the burst and then counted"""
+        limiter = RateLimitFilter(interval=60, burst=2)
+
+        passed = [limiter.filter(make_record()) for _ in range(5)]
+
+        self.assertEqual(passed, [True, True, False, False, False])
+        self.assertTrue(limiter.filter(make_record(lineno=11)))
+        self.assertTrue(limiter.filter(make_record(level=logging.INFO)))
+
+        limiter.interval = 0
+        record = make_record()
+        self.assertTrue(limiter.filter(record))
+        self.assertEqual(record.suppressed, 3)
+
+if __name__ == '__main__':
+    unittest.main()
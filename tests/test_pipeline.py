@@ -3,6 +3,7 @@ from unittest.mock import Mock, patch
 from datetime import datetime
 import os
 import shutil
+from logging_setup import shutdown_logging
 from run_pipeline import NFLPipeline, PipelineError
 
 class TestNFLPipeline(unittest.TestCase):
@@ -19,7 +20,9 @@ class TestNFLPipeline(unittest.TestCase):
         self.pipeline = NFLPipeline()
     
     def tearDown(self):
-        # Clean up test files and directories
+        # Clean up test files and directories; stop the log writer first so it
+        # cannot recreate logs/ afterwards
+        shutdown_logging()
         for dir_name in ['logs', 'backups', 'data']:
             if os.path.exists(dir_name):
                 shutil.rmtree(dir_name)
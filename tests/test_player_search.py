@@ -0,0 +1,130 @@
+import unittest
+import shutil
+import tempfile
+import time
+import app as app_module
+from league_registry import LeagueRegistry
+from league_rules import get_format
+from player_catalog import Player
+from player_search import PlayerSearchIndex, normalize
+from roster_manager import RosterManager
+from response_cache import ResponseCache
+from tests.fixtures import seed_players
+
+PLAYERS = [
+    Player('1', 'Patrick Mahomes', 'QB', 'KC', 25.0),
+    Player('2', 'Travis Kelce', 'TE', 'KC', 14.0),
+    Player('3', 'Josh Allen', 'QB', 'BUF', 24.0),
+    Player('4', 'Christian McCaffrey', 'RB', 'SF', 22.0),
+    Player('5', 'Amon-Ra St. Brown', 'WR', 'DET', 18.0),
+    Player('6', 'Jahmyr Gibbs', 'RB', 'DET', 16.0),
+    Player('7', 'Josh Jacobs', 'RB', 'LV', 13.0),
+    Player('8', 'Harrison Butker', 'K', 'KC', 9.0),
+]
+
+class TestPlayerSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PlayerSearchIndex(PLAYERS, version='v1')
+
+    def ids(self, results):
+        return [player.id for player, _ in results]
+
+    def test_normalize(self):
+        """Test names are lowercased with accents and punctuation removed"""
+        self.assertEqual(normalize('Amon-Ra St. Brown'), 'amon ra st brown')
+        self.assertEqual(normalize('Jámaal'), 'jamaal')
+
+    def test_prefix_search(self):
+        """Test prefixes of any name token match, best projection first"""
+        self.assertEqual(self.ids(self.index.search('jo')), ['3', '7'])
+        self.assertEqual(self.ids(self.index.search('kel')), ['2'])
+        self.assertEqual(self.ids(self.index.search('st bro')), ['5'])
+
+    def test_multi_token_search(self):
+        """Test every query token must match"""
+        self.assertEqual(self.ids(self.index.search('josh ja')), ['7'])
+
+    def test_typo_falls_back_to_trigrams(self):
+        """Test a misspelled name still finds the player"""
+        self.assertEqual(self.ids(self.index.search('mccafrey'))[0], '4')
+
+    def test_slot_eligibility(self):
+        """Test FLEX and SUPERFLEX filters follow roster rules"""
+        self.assertEqual(self.ids(self.index.search('', position='FLEX')), ['4', '5', '6', '2', '7'])
+        self.assertEqual(set(self.ids(self.index.search('', position='superflex'))), {'1', '2', '3', '4', '5', '6', '7'})
+        self.assertEqual(self.ids(self.index.search('j', position='QB')), ['3'])
+
+    def test_slots_of_league_format(self):
+        """Test slot names of the given format filter by that format's eligibility"""
+        two_flex = get_format('two_flex_no_kicker')
+
+        self.assertEqual(self.ids(self.index.search('', position='flex2', league_format=two_flex)),
+                         ['4', '5', '6', '2', '7'])
+        self.assertEqual(self.ids(self.index.search('', position='WR1', league_format=two_flex)), ['5'])
+        self.assertEqual(self.ids(self.index.search('', position='FLEX', league_format=two_flex)),
+                         ['4', '5', '6', '2', '7'])
+        self.assertEqual(self.ids(self.index.search('', position='superflex', league_format=two_flex)), [])
+        self.assertEqual(self.ids(self.index.search('', position='K')), ['8'])
+
+    def test_team_filters(self):
+        """Test team and exclude_teams filters"""
+        self.assertEqual(set(self.ids(self.index.search('', team='kc'))), {'1', '2', '8'})
+        results = self.index.search('', exclude_teams=['KC', 'DET'])
+        self.assertEqual(set(self.ids(results)), {'3', '4', '7'})
+
+    def test_search_speed(self):
+        """Test queries against a full catalog stay well under 5 ms"""
+        from benchmarks.load_test import generate_players
+        players = [Player(**p) for p in generate_players(700).values()]
+        index = PlayerSearchIndex(players)
+
+        start = time.perf_counter()
+        for query in ('q', 'rb 1', 'wr', 'defnse', 'bal'):
+            index.search(query, position='FLEX', exclude_teams=['BUF'])
+        self.assertLess((time.perf_counter() - start) / 5, 0.005)
+
+class TestPlayerSearchEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        seed_players(self.data_dir)
+        app_module.roster_manager = RosterManager(self.data_dir)
+        app_module.response_cache = ResponseCache(max_entries=8)
+        app_module.search_indexes = ResponseCache(max_entries=2)
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_search_endpoint(self):
+        """Test the endpoint filters by slot and excluded teams"""
+        response = self.client.get('/api/players/search?q=qb&position=SUPERFLEX&exclude_teams=BAL,BUF')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertTrue(data['results'])
+        self.assertEqual(data['catalog_version'], app_module.roster_manager.catalog_version)
+        for result in data['results']:
+            self.assertEqual(result['position'], 'QB')
+            self.assertNotIn(result['team'], ('BAL', 'BUF'))
+
+    def test_search_uses_league_format(self):
+        """Test the endpoint resolves slots with the requested league's format"""
+        saved = app_module.leagues
+        app_module.leagues = LeagueRegistry(self.data_dir)
+        self.addCleanup(setattr, app_module, 'leagues', saved)
+        app_module.leagues.create('office', league_format='two_flex_no_kicker')
+
+        response = self.client.get('/api/players/search?position=flex1&league=office&limit=100')
+
+        positions = {result['position'] for result in response.get_json()['results']}
+        self.assertTrue(positions)
+        self.assertLessEqual(positions, {'RB', 'WR', 'TE'})
+
+    def test_index_reused_per_catalog_version(self):
+        """Test the index is only built once for an unchanged catalog"""
+        self.client.get('/api/players/search?q=wr')
+        self.client.get('/api/players/search?q=te')
+        self.assertEqual(len(app_module.search_indexes), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+import app as app_module
+from profiling import StackSampler, phase, sign_profile_request, verify_profile_token
+from response_cache import ResponseCache
+from roster_manager import RosterManager
+from tests.fixtures import build_roster_data, seed_players
+
+class TestProfilingMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.profile_dir = Path(self.data_dir) / 'profiles'
+        self.players = seed_players(self.data_dir)
+        app_module.roster_manager = RosterManager(self.data_dir)
+        app_module.response_cache = ResponseCache(max_entries=8)
+        app_module.fragment_cache = ResponseCache(max_entries=8)
+        self.profiler = app_module.profiler
+        self.saved = (self.profiler.sample_rate, self.profiler.secret, self.profiler.output_dir,
+                      self.profiler.mode, self.profiler.max_profiles)
+        self.profiler.output_dir = self.profile_dir
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        (self.profiler.sample_rate, self.profiler.secret, self.profiler.output_dir,
+         self.profiler.mode, self.profiler.max_profiles) = self.saved
+        shutil.rmtree(self.data_dir)
+
+    def test_server_timing_phases(self):
+        """Test responses report storage, serialization and render phases"""
+        app_module.roster_manager.create_roster('user_a', build_roster_data(self.players))
+
+        rosters = self.client.get('/api/rosters')
+        page = self.client.get('/create-roster')
+
+        self.assertIn('storage;dur=', rosters.headers['Server-Timing'])
+        self.assertIn('serialize;dur=', rosters.headers['Server-Timing'])
+        self.assertIn('total;dur=', rosters.headers['Server-Timing'])
+        self.assertIn('render;dur=', page.headers['Server-Timing'])
+        self.assertNotIn('X-Profile', rosters.headers)
+        self.assertFalse(self.profile_dir.exists())
+
+    def test_sampled_request_writes_collapsed_stacks(self):
+        """Test a sampled request leaves a flamegraph-ready profile"""
+        self.profiler.sample_rate = 1.0
+
+        response = self.client.get('/create-roster')
+
+        profile = self.profile_dir / response.headers['X-Profile']
+        self.assertEqual(profile.suffix, '.folded')
+        for line in profile.read_text().splitlines():
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(stack)
+            self.assertGreater(int(count), 0)
+
+    def test_signed_header_requests_cprofile(self):
+        """Test only a correctly signed token profiles a request"""
+        self.profiler.secret = 'shh'
+        self.profiler.mode = 'cprofile'
+
+        unsigned = self.client.get('/api/rosters', headers={'X-Profile-Token': 'forged'})
+        signed = self.client.get('/api/rosters', headers={
+            'X-Profile-Token': sign_profile_request('shh', 'GET', '/api/rosters')
+        })
+
+        self.assertNotIn('X-Profile', unsigned.headers)
+        self.assertTrue((self.profile_dir / signed.headers['X-Profile']).name.endswith('.prof'))
+
+    def test_expired_token_ignored(self):
+        """Test a token past its expiry no longer profiles the request"""
+        self.profiler.secret = 'shh'
+        token = sign_profile_request('shh', 'GET', '/api/rosters', now=time.time() - 600)
+
+        response = self.client.get('/api/rosters', headers={'X-Profile-Token': token})
+
+        self.assertNotIn('X-Profile', response.headers)
+
+    def test_profile_directory_capped(self):
+        """Test only the newest max_profiles profiles are kept"""
+        self.profiler.sample_rate = 1.0
+        self.profiler.max_profiles = 2
+
+        names = [self.client.get('/api/rosters').headers['X-Profile'] for _ in range(4)]
+
+        self.assertEqual(sorted(p.name for p in self.profile_dir.iterdir()), names[2:])
+
+class TestProfilingPrimitives(unittest.TestCase):
+    def test_token_bound_to_request_and_expiry(self):
+        """Test a token only verifies for its own request, before it expires"""
+        token = sign_profile_request('shh', 'GET', '/api/rosters', ttl=60, now=1000)
+
+        self.assertTrue(verify_profile_token('shh', token, 'GET', '/api/rosters', now=1050))
+        self.assertFalse(verify_profile_token('shh', token, 'GET', '/api/rosters', now=1061))
+        self.assertFalse(verify_profile_token('shh', token, 'GET', '/api/roster/x', now=1050))
+        expires, _, digest = token.partition('.')
+        forged = f'{int(expires) + 3600}.{digest}'
+        self.assertFalse(verify_profile_token('shh', forged, 'GET', '/api/rosters', now=1050))
+
+    def test_phase_outside_request_is_noop(self):
+        """Test phase costs nothing and records nothing without a request"""
+        with phase('storage'):
+            pass
+
+    def test_stack_sampler(self):
+        """Test the sampler sees the sampled thread's current function"""
+        def busy_wait():
+            end = time.perf_counter() + 0.05
+            while time.perf_counter() < end:
+                pass
+
+        sampler = StackSampler(threading.get_ident(), interval=0.001)
+        sampler.start()
+        busy_wait()
+        counts = sampler.stop()
+
+        self.assertTrue(any('busy_wait' in stack.rsplit(';', 1)[-1] for stack in counts))
+
+if __name__ == '__main__':
+    unittest.main()
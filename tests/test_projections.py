@@ -0,0 +1,130 @@
+import unittest
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+import pandas as pd
+from data_import.playoff_roster_generator import PlayoffRosterGenerator
+from data_import.projections import ProjectionError, ProjectionModel, ProjectionStage, read_game_logs
+from scoring import get_scoring
+
+def game(player_id, position, team, opponent, week, **stats):
+    return dict(player_id=player_id, position=position, team=team, opponent=opponent,
+                season=2024, week=week, **stats)
+
+LOGS = [
+    game('wr_a', 'WR', 'KC', 'BUF', 1, rec_yd=100),
+    game('wr_a', 'WR', 'KC', 'BAL', 2, rec_yd=50),
+    game('wr_b', 'WR', 'BUF', 'KC', 1, rec_yd=80),
+    game('wr_b', 'WR', 'BUF', 'BAL', 2, rec_yd=80),
+    game('qb_a', 'QB', 'KC', 'BUF', 1, pass_yd=250, pass_td=2),
+    game('qb_a', 'QB', 'KC', 'BAL', 2, pass_yd=300, pass_td=3),
+]
+
+class TestProjectionModel(unittest.TestCase):
+    def setUp(self):
+        self.logs = pd.DataFrame(LOGS)
+
+    def test_recency_weighted_average(self):
+        """Test recent games count more without opponent adjustment"""
+        model = ProjectionModel(get_scoring('standard'), decay=0.5, prior_games=1e9)
+
+        projections = model.project(self.logs)
+
+        # week 2 (5 points) weighs 1, week 1 (10 points) weighs 0.5
+        self.assertAlmostEqual(projections.loc['wr_a', 'projected_points'], 6.67)
+        self.assertAlmostEqual(projections.loc['wr_b', 'projected_points'], 8.0)
+        self.assertEqual(projections.loc['qb_a', 'games'], 2)
+        self.assertEqual(list(projections.index), ['qb_a', 'wr_a', 'wr_b'])
+
+    def test_opponent_adjustment(self):
+        """Test a stingy next opponent lowers a projection"""
+        model = ProjectionModel(get_scoring('standard'), decay=1.0, prior_games=0)
+
+        neutral = model.project(self.logs)
+        against_bal = model.project(self.logs, opponents={'BUF': 'BAL'})
+
+        self.assertLess(against_bal.loc['wr_b', 'projected_points'],
+                        neutral.loc['wr_b', 'projected_points'])
+
+    def test_only_requested_players(self):
+        """Test player_ids limits which players are projected"""
+        model = ProjectionModel(get_scoring('standard'))
+
+        projections = model.project(self.logs, player_ids=['wr_b'])
+
+        self.assertEqual(list(projections.index), ['wr_b'])
+
+class TestProjectionStage(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.stage = ProjectionStage(str(self.data_dir), ProjectionModel(get_scoring('standard')))
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def _write_logs(self, rows):
+        pd.DataFrame(rows).to_csv(self.stage.logs_file, index=False)
+
+    def test_skipped_without_game_logs(self):
+        """Test the stage is a no-op until game logs exist"""
+        self.assertTrue(self.stage.run()['skipped'])
+        self.assertFalse(self.stage.cache_file.exists())
+
+    def test_cached_by_stats_version(self):
+        """Test unchanged logs reuse every projection"""
+        self._write_logs(LOGS)
+        first = self.stage.run()
+
+        with patch.object(ProjectionModel, 'project') as project:
+            second = self.stage.run()
+
+        self.assertEqual(first['projected'], 3)
+        self.assertEqual(second, dict(first, projected=0, reused=3))
+        project.assert_not_called()
+
+    def test_recomputes_changed_players_only(self):
+        """Test a new QB game reprojects the QB but not the receivers"""
+        self._write_logs(LOGS)
+        self.stage.run()
+
+        self._write_logs(LOGS + [game('qb_a', 'QB', 'KC', 'BUF', 3, pass_yd=100)])
+        with patch.object(ProjectionModel, 'project', wraps=self.stage.model.project) as project:
+            summary = self.stage.run()
+
+        self.assertEqual(project.call_args.kwargs['player_ids'], {'qb_a'})
+        self.assertEqual((summary['projected'], summary['reused']), (1, 2))
+        cache = json.loads(self.stage.cache_file.read_text())
+        self.assertEqual(sorted(cache['projections']), ['qb_a', 'wr_a', 'wr_b'])
+
+    def test_projections_applied_to_catalog(self):
+        """Test the generator publishes projected points for players with logs"""
+        generator = PlayoffRosterGenerator(str(self.data_dir))
+        players = generator._generate_sample_players()
+        first_id = next(iter(players))
+        self._write_logs([game(first_id, 'QB', 'KC', 'BUF', 1, pass_yd=250)])
+        self.stage.run()
+
+        published = generator.apply_projections(players)
+
+        self.assertEqual(published[first_id]['projected_points'], 10.0)
+
+    def test_disabled_by_default(self):
+        """Test the pipeline leaves projections off until enabled in config"""
+        config = self.data_dir / 'config.yml'
+        config.write_text('projections:\n  decay: 0.9\n')
+        self.assertFalse(ProjectionStage.enabled(config))
+
+        config.write_text('projections:\n  enabled: true\n')
+        self.assertTrue(ProjectionStage.enabled(config))
+        self.assertFalse(ProjectionStage.enabled())
+
+    def test_missing_columns(self):
+        """Test logs without the key columns are rejected"""
+        pd.DataFrame([{'player_id': 'x', 'rec_yd': 10}]).to_csv(self.stage.logs_file, index=False)
+        with self.assertRaises(ProjectionError):
+            read_game_logs(self.stage.logs_file)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import unittest
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from data_import.api.providers import (
+    Cancellation, ESPNProvider, HedgedFetcher, NFLProvider, Provider, ProviderConfig, ProviderError
+)
+
+ESPN_TEAMS = {'sports': [{'leagues': [{'teams': [
+    {'team': {'id': '12', 'displayName': 'Kansas City Chiefs', 'abbreviation': 'KC',
+              'record': {'wins': 11, 'losses': 6}}}
+]}]}]}
+ESPN_ROSTER = {'athletes': [
+    {'position': 'offense', 'items': [
+        {'id': '3139477', 'fullName': 'Patrick Mahomes', 'jersey': '15',
+         'position': {'abbreviation': 'QB'}, 'experience': {'years': 7}},
+        {'id': '1', 'fullName': 'Some Tackle', 'position': {'abbreviation': 'OT'}}
+    ]},
+    {'position': 'specialTeam', 'items': [
+        {'id': '2', 'fullName': 'Harrison Butker', 'position': {'abbreviation': 'PK'}}
+    ]}
+]}
+NFL_TEAMS = {'teams': [{'id': 'nfl-kc', 'name': 'Kansas City Chiefs', 'abbreviation': 'KC'}]}
+NFL_ROSTER = {'players': [{'id': 'nfl-15', 'fullName': 'Patrick Mahomes', 'position': 'qb'}]}
+
+def stub_server(routes, delay=0.0, status=200):
+    """Serve fixed JSON documents by path on localhost, after an optional delay"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            body = json.dumps(routes.get(self.path.split('?')[0], {})).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+class TestProviders(unittest.TestCase):
+    def setUp(self):
+        self.servers = []
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def _provider(self, provider_type, name, routes, max_in_flight=4, **server_options):
+        server = stub_server(routes, **server_options)
+        self.servers.append(server)
+        return provider_type(ProviderConfig(
+            name=name, base_url=f'http://127.0.0.1:{server.server_address[1]}', timeout=5,
+            max_in_flight=max_in_flight
+        ))
+
+    def _espn(self, **options):
+        return self._provider(ESPNProvider, 'espn', {
+            '/teams': ESPN_TEAMS, '/teams/kc/roster': ESPN_ROSTER
+        }, **options)
+
+    def _nfl(self, **options):
+        return self._provider(NFLProvider, 'nfl', {
+            '/teams': NFL_TEAMS, '/teams/KC/roster': NFL_ROSTER
+        }, **options)
+
+    def test_schemas_map_to_same_records(self):
+        """Test both upstream schemas normalize to the same fields"""
+        espn_roster = self._espn().fetch_roster('KC')
+        nfl_roster = self._nfl().fetch_roster('KC')
+
+        self.assertTrue(espn_roster.ok)
+        self.assertEqual([(p['name'], p['position']) for p in espn_roster.records], [
+            ('Patrick Mahomes', 'QB'), ('Harrison Butker', 'K')
+        ])
+        self.assertEqual(espn_roster.records[0]['jersey_number'], 15)
+        self.assertEqual(nfl_roster.records[0]['position'], 'QB')
+        self.assertEqual(espn_roster.records[0].keys(), nfl_roster.records[0].keys())
+        self.assertEqual(self._espn().fetch_teams().records[0]['win_loss_record']['wins'], 11)
+
+    def test_fast_primary_needs_no_hedge(self):
+        """Test a healthy primary answers alone"""
+        espn, nfl = self._espn(), self._nfl()
+        fetcher = HedgedFetcher([espn, nfl], default_hedge_delay=2.0)
+
+        report = fetcher.fetch_roster('KC')
+
+        self.assertEqual(report.records[0]['id'], '3139477')
+        self.assertEqual(fetcher.stats()['espn']['wins'], 1)
+        self.assertEqual(nfl.stats.requests, 0)
+        fetcher.close()
+
+    def test_slow_primary_is_hedged(self):
+        """Test the second provider wins when the first exceeds its hedge delay"""
+        espn, nfl = self._espn(delay=1.0), self._nfl()
+        fetcher = HedgedFetcher([espn, nfl], default_hedge_delay=0.05)
+
+        start = time.perf_counter()
+        report = fetcher.fetch_roster('KC')
+
+        self.assertLess(time.perf_counter() - start, 0.8)
+        self.assertEqual(report.records[0]['id'], 'nfl-15')
+        self.assertEqual(fetcher.stats()['nfl']['wins'], 1)
+        fetcher.close()
+
+    def test_failing_primary_falls_back(self):
+        """Test an error from the first provider goes straight to the next"""
+        espn, nfl = self._espn(status=503), self._nfl()
+        fetcher = HedgedFetcher([espn, nfl], default_hedge_delay=2.0)
+
+        start = time.perf_counter()
+        report = fetcher.fetch_teams()
+
+        self.assertLess(time.perf_counter() - start, 1.5)
+        self.assertEqual(report.records[0]['id'], 'nfl-kc')
+        self.assertEqual(fetcher.stats()['espn']['errors'], 1)
+        fetcher.close()
+
+    def test_all_providers_failing(self):
+        """Test ProviderError is raised once every provider has failed"""
+        fetcher = HedgedFetcher([self._espn(status=500), self._nfl(status=500)])
+        with self.assertRaises(ProviderError):
+            fetcher.fetch_teams()
+        fetcher.close()
+
+    def test_saturated_provider_is_not_hedged_to(self):
+        """Test a hedge skips a provider whose workers are all busy instead of queueing"""
+        espn, nfl = self._espn(delay=0.4), self._nfl(delay=1.0, max_in_flight=1)
+        fetcher = HedgedFetcher([espn, nfl], default_hedge_delay=0.05)
+        first = threading.Thread(target=fetcher.fetch_roster, args=('KC',))
+        first.start()
+        time.sleep(0.2)
+
+        report = fetcher.fetch_roster('KC')
+
+        self.assertEqual(report.records[0]['id'], '3139477')
+        self.assertEqual(fetcher.stats()['nfl']['skipped'], 1)
+        first.join()
+        fetcher.close()
+
+    def test_cancel_closes_response(self):
+        """Test cancelling closes the response being read, even one attached late"""
+        class Response:
+            closed = False
+
+            def close(self):
+                self.closed = True
+
+        cancelled, reading, late = Cancellation(), Response(), Response()
+        cancelled.attach(reading)
+        cancelled.set()
+        cancelled.attach(late)
+
+        self.assertTrue(cancelled.is_set())
+        self.assertTrue(reading.closed)
+        self.assertTrue(late.closed)
+
+    def test_provider_is_abstract(self):
+        """Test a provider without the schema mapping cannot be built"""
+        with self.assertRaises(TypeError):
+            Provider(ProviderConfig(name='bare', base_url='http://127.0.0.1'))
+
+    def test_hedge_delay_follows_latency_percentile(self):
+        """Test the hedge delay tracks the primary's recent latency"""
+        espn = self._espn()
+        fetcher = HedgedFetcher([espn], default_hedge_delay=3.0, min_samples=3, hedge_percentile=0.5)
+        self.assertEqual(fetcher.hedge_delay(espn), 3.0)
+        for latency in (0.1, 0.2, 0.3):
+            espn.stats.record(latency)
+        self.assertEqual(fetcher.hedge_delay(espn), 0.2)
+        fetcher.close()
+
+    def test_from_config(self):
+        """Test both configured providers are built in file order"""
+        fetcher = HedgedFetcher.from_config()
+        self.assertEqual([p.name for p in fetcher.providers], ['espn', 'nfl'])
+        fetcher.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+import requests
+from benchmarks.replay_pipeline import replay_runs
+from data_import.api.recording import ARCHIVE_FORMAT, RecordingSession, ReplaySession, traffic_session
+from tests.test_providers import ESPN_ROSTER, ESPN_TEAMS, stub_server
+
+ESPN_URL = 'https://site.api.espn.com/apis/site/v2/sports/football/nfl'
+
+def write_archive(path, entries):
+    """Write a traffic archive by hand, as record mode would"""
+    with gzip.open(path, 'wt', encoding='utf-8') as f:
+        f.write(json.dumps({'format': ARCHIVE_FORMAT}) + '\n')
+        for key, body, latency in entries:
+            f.write(json.dumps({
+                'key': key, 'status': 200, 'latency': latency,
+                'headers': {'Content-Type': 'application/json'}, 'text': json.dumps(body)
+            }) + '\n')
+
+class TestRecordReplay(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.archive = os.path.join(self.temp_dir, 'traffic.ndjson.gz')
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_record_then_replay(self):
+        """Test recorded responses are served back without the network"""
+        server = stub_server({'/teams': ESPN_TEAMS}, delay=0.05)
+        url = f'http://127.0.0.1:{server.server_address[1]}/teams'
+        try:
+            recorder = RecordingSession(self.archive)
+            recorded = recorder.get(url, params={'filter': 'playoff'}).json()
+            recorder.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        replay = ReplaySession(self.archive)
+        response = replay.get(url, params={'filter': 'playoff'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), recorded)
+        with self.assertRaises(requests.ConnectionError):
+            replay.get(url)
+
+    def test_replay_with_recorded_latency(self):
+        """Test realtime replay waits as long as the original response took"""
+        write_archive(self.archive, [(f'GET {ESPN_URL}/teams', ESPN_TEAMS, 0.2)])
+
+        start = time.perf_counter()
+        ReplaySession(self.archive).get(f'{ESPN_URL}/teams')
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+        start = time.perf_counter()
+        ReplaySession(self.archive, realtime=True).get(f'{ESPN_URL}/teams')
+        self.assertGreaterEqual(time.perf_counter() - start, 0.2)
+
+    def test_traffic_session_from_environment(self):
+        """Test API_TRAFFIC_MODE selects a shared replay session"""
+        write_archive(self.archive, [])
+        env = {'API_TRAFFIC_MODE': 'replay', 'API_TRAFFIC_ARCHIVE': self.archive}
+        with patch.dict(os.environ, env):
+            self.assertIsInstance(traffic_session(), ReplaySession)
+            self.assertIs(traffic_session(), traffic_session())
+        with patch.dict(os.environ, {'API_TRAFFIC_MODE': ''}):
+            self.assertNotIsInstance(traffic_session(), ReplaySession)
+
+    def test_pipeline_replays_offline(self):
+        """Test a full pipeline run succeeds from an archive alone"""
+        write_archive(self.archive, [
+            (f'GET {ESPN_URL}/teams', ESPN_TEAMS, 0.01),
+            (f'GET {ESPN_URL}/teams/kc/roster', ESPN_ROSTER, 0.01)
+        ])
+
+        with patch.dict(os.environ, {}):
+            report = replay_runs(self.archive, runs=2)
+
+        self.assertEqual(report['runs'], 2)
+        self.assertEqual(report['failures'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import unittest
+import csv
+import gzip
+import importlib.util
+import io
+import json
+import shutil
+import tempfile
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+import app as app_module
+from league_registry import LeagueRegistry
+from response_cache import ResponseCache
+from roster_export import ExportError, check_format, export_columns, export_rosters, main
+from roster_manager import RosterManager
+from tests.fixtures import build_roster_data, seed_players
+
+HAS_PYARROW = importlib.util.find_spec('pyarrow') is not None
+
+class TestRosterExport(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+        self.manager = RosterManager(self.data_dir, durable=False)
+        self.rosters = [
+            self.manager.create_roster(f'user_{i}', build_roster_data(self.players, offset=i))
+            for i in range(3)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def _csv_rows(self, body: bytes):
+        return list(csv.DictReader(io.StringIO(gzip.decompress(body).decode('utf-8'))))
+
+    def test_csv_flattens_slots(self):
+        """Test each roster becomes one gzipped CSV row with per-slot columns"""
+        body = b''.join(export_rosters(self.manager, 'csv', chunk_size=2))
+
+        rows = self._csv_rows(body)
+        by_id = {row['roster_id']: row for row in rows}
+        roster = self.rosters[0]
+        row = by_id[roster.id]
+
+        self.assertEqual(list(rows[0]), export_columns(self.manager.format.slots))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(row['qb_name'], roster.qb.name)
+        self.assertEqual(row['defense_team'], roster.defense.team)
+        self.assertAlmostEqual(float(row['total_points']), sum(p.projected_points for p in roster.players))
+
+    def test_ndjson_uncompressed(self):
+        """Test gzip can be turned off and NDJSON rows carry the same fields"""
+        body = b''.join(export_rosters(self.manager, 'ndjson', compress=False))
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual({row['roster_id'] for row in rows}, {r.id for r in self.rosters})
+        self.assertEqual(sorted(rows[0]), sorted(export_columns(self.manager.format.slots)))
+
+    def test_empty_league_has_header_only(self):
+        """Test a league without rosters still exports a header line"""
+        manager = RosterManager(tempfile.mkdtemp(dir=self.data_dir), durable=False)
+
+        body = b''.join(export_rosters(manager, 'csv'))
+
+        self.assertEqual(gzip.decompress(body).decode().strip(), ','.join(export_columns(manager.format.slots)))
+
+    def test_memory_bounded_by_chunk(self):
+        """Test export memory does not grow with the number of rosters"""
+        def peak(count: int) -> int:
+            payload = self.manager.get_roster_payload(self.rosters[0].id)
+            self.manager.iter_roster_payloads = lambda season=None: (payload for _ in range(count))
+            tracemalloc.start()
+            for _ in export_rosters(self.manager, 'csv', chunk_size=100):
+                pass
+            result = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return result
+
+        self.assertLess(peak(5000), peak(500) * 2)
+
+    def test_unknown_format(self):
+        """Test unsupported formats are rejected before streaming starts"""
+        with self.assertRaises(ExportError):
+            export_rosters(self.manager, 'xlsx')
+
+    @unittest.skipIf(HAS_PYARROW, 'pyarrow is installed')
+    def test_parquet_needs_pyarrow(self):
+        """Test parquet export explains the missing optional dependency"""
+        with self.assertRaises(ExportError):
+            check_format('parquet')
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+    def test_parquet_round_trip(self):
+        """Test parquet output reads back with one row per roster"""
+        import pyarrow.parquet as pq
+
+        body = b''.join(export_rosters(self.manager, 'parquet', chunk_size=2))
+
+        table = pq.read_table(io.BytesIO(body))
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.column_names, export_columns(self.manager.format.slots))
+
+    def test_cli_writes_file(self):
+        """Test the CLI exports a league to a gzipped file"""
+        output = Path(self.data_dir) / 'rosters.csv.gz'
+
+        code = main(['--data-dir', self.data_dir, '--format', 'csv', '-o', str(output)])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(len(self._csv_rows(output.read_bytes())), 3)
+        self.assertEqual(main(['--data-dir', self.data_dir, '--league', 'missing']), 1)
+
+    def test_cli_reads_files_without_manager(self):
+        """Test the CLI streams stored and logged-only rosters without loading the league"""
+        logged = self.rosters[2]
+        roster_file = self.manager.rosters_dir / f'{logged.id}.json'
+        self.manager.wal.append(roster_file.read_bytes())
+        roster_file.unlink()
+        output = Path(self.data_dir) / 'rosters.ndjson'
+
+        with patch('league_registry.RosterManager', side_effect=AssertionError('manager built')):
+            code = main(['--data-dir', self.data_dir, '--format', 'ndjson', '--no-gzip', '-o', str(output)])
+
+        self.assertEqual(code, 0)
+        rows = [json.loads(line) for line in output.read_bytes().splitlines()]
+        self.assertEqual({row['roster_id'] for row in rows}, {r.id for r in self.rosters})
+
+class TestExportEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+        app_module.leagues = LeagueRegistry(self.data_dir)
+        app_module.roster_manager = RosterManager(self.data_dir)
+        app_module.response_cache = ResponseCache(max_entries=8)
+        app_module.fragment_cache = ResponseCache(max_entries=8)
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_export_download(self):
+        """Test the endpoint streams a gzipped CSV attachment for the league"""
+        app_module.leagues.create('office')
+        self.client.post('/api/submit-roster?league=office', json=build_roster_data(self.players))
+
+        response = self.client.get('/api/export/rosters?league=office')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.mimetype, 'application/gzip')
+        self.assertIn('rosters-office.csv.gz', response.headers['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.data).decode())))
+        self.assertEqual([row['league_id'] for row in rows], ['office'])
+
+    def test_bad_format(self):
+        """Test an unknown format is a 400"""
+        self.assertEqual(self.client.get('/api/export/rosters?format=xlsx').status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,254 @@
+import unittest
+import dataclasses
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+import roster_serialization
+from player_catalog import PlayerCatalog
+from roster_manager import RosterManager, RosterValidationError
+from seasons import LEGACY_SEASON
+from data_import.playoff_roster_generator import PlayoffRosterGenerator
+from tests.fixtures import build_roster_data, seed_players
+
+# A slice of data/2023_playoff_players.csv; the pipeline tests remove data/
+PLAYERS_2023_CSV = '''name,position,team,projected_points
+Kansas City Chiefs,DEF,KC,
+San Francisco 49ers,DEF,SF,9.1
+Harrison Butker,K,KC,
+Patrick Mahomes,QB,KC,24.9
+Brock Purdy,QB,SF,22.3
+Christian McCaffrey,RB,SF,23.5
+Travis Kelce,TE,KC,16.8
+Deebo Samuel,WR,SF,17.4
+'''
+
+class TestRosterManager(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+        self.manager = RosterManager(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_loaded_rosters_share_player_records(self):
+        """Test rosters reference interned catalog players instead of copies"""
+        first = self.manager.create_roster('user_a', build_roster_data(self.players))
+        second = self.manager.create_roster('user_b', build_roster_data(self.players))
+
+        loaded_first = self.manager.get_roster(first.id)
+        loaded_second = self.manager.get_roster(second.id)
+
+        self.assertIs(loaded_first.qb, loaded_second.qb)
+        self.assertIs(loaded_first.qb, self.manager.catalog[first.qb.id])
+
+    def test_superseded_players_released(self):
+        """Test the catalog forgets old player records once no roster holds them"""
+        catalog = PlayerCatalog()
+        catalog.load({'p1': {'name': 'Old Name', 'position': 'QB', 'team': 'KC'}})
+        held = catalog['p1']
+        catalog.load({'p1': {'name': 'New Name', 'position': 'QB', 'team': 'KC'}})
+
+        self.assertEqual(len(catalog._interned), 2)
+        del held
+        self.assertEqual(len(catalog._interned), 1)
+        self.assertEqual(catalog.index_of('p1'), 0)
+
+    def test_player_records_are_immutable(self):
+        """Test shared players cannot be modified through one roster"""
+        roster = self.manager.create_roster('user_a', build_roster_data(self.players))
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            roster.qb.projected_points = 0.0
+        self.assertFalse(hasattr(roster.qb, '__dict__'))
+
+    def test_unknown_player_rejected(self):
+        """Test roster creation fails for players missing from the catalog"""
+        roster_data = build_roster_data(self.players)
+        roster_data['qb'] = 'missing'
+
+        with self.assertRaises(RosterValidationError):
+            self.manager.create_roster('user_a', roster_data)
+
+    def test_ownership_rebuilt_on_startup(self):
+        """Test ownership counters are rebuilt from the stored rosters"""
+        for offset in range(3):
+            self.manager.create_roster('user_a', build_roster_data(self.players, offset))
+
+        snapshot = RosterManager(self.data_dir).ownership.snapshot()
+
+        self.assertEqual(snapshot['total_rosters'], 3)
+        self.assertEqual(sum(team['count'] for team in snapshot['teams']), 33)
+
+    def test_rosters_of_other_formats_skipped(self):
+        """Test rosters stored under another league format are skipped instead of failing startup"""
+        self.manager.create_roster('user_a', build_roster_data(self.players))
+
+        with self.assertLogs('RosterManager', level='ERROR') as logs:
+            manager = RosterManager(self.data_dir, league_format='two_flex_no_kicker')
+            table = manager.build_roster_table()
+
+        self.assertIn('two_flex_no_kicker', logs.output[0])
+        self.assertEqual(manager.ownership.snapshot()['total_rosters'], 0)
+        self.assertEqual(len(table), 0)
+
+    def test_ownership_counted_on_create(self):
+        """Test new rosters update the counters at once and the snapshot only when refreshed"""
+        ownership = self.manager.ownership
+        ownership.refresh_interval = 3600
+        ownership.refresh(force=True)
+
+        for offset in range(3):
+            self.manager.create_roster('user_a', build_roster_data(self.players, offset))
+
+        self.assertEqual(ownership._total, 3)
+        self.assertEqual(ownership.snapshot()['total_rosters'], 0)
+        ownership.refresh(force=True)
+        self.assertEqual(ownership.snapshot()['total_rosters'], 3)
+
+    def test_identical_lineups_share_hash(self):
+        """Test swapping interchangeable slots gives the same lineup hash"""
+        roster_data = build_roster_data(self.players)
+        swapped = dict(roster_data, rb1=roster_data['rb2'], rb2=roster_data['rb1'])
+
+        first = self.manager.create_roster('user_a', roster_data)
+        second = self.manager.create_roster('user_b', swapped)
+        other = self.manager.create_roster('user_c', build_roster_data(self.players, 1))
+
+        lineup = self.manager.lineup_hash(first)
+        self.assertEqual(lineup, self.manager.lineup_hash(second))
+        self.assertEqual(self.manager.lineups.count(lineup), 2)
+        self.assertEqual(self.manager.lineups.count(self.manager.lineup_hash(other)), 1)
+        self.assertEqual(len(self.manager.lineups), 2)
+
+        reloaded = RosterManager(self.data_dir)
+        self.assertEqual(sorted(reloaded.lineups.roster_ids(lineup)), sorted([first.id, second.id]))
+
+    def test_duplicate_lineups_rejected(self):
+        """Test duplicate lineups are refused when the league disallows them"""
+        manager = RosterManager(self.data_dir, allow_duplicate_lineups=False)
+        manager.create_roster('user_a', build_roster_data(self.players))
+
+        with self.assertRaises(RosterValidationError):
+            manager.create_roster('user_b', build_roster_data(self.players))
+        self.assertEqual(len(list(manager.iter_rosters())), 1)
+
+    def test_catalog_loaded_from_snapshot(self):
+        """Test the pipeline's snapshot is used while it matches players.json"""
+        generator = PlayoffRosterGenerator(self.data_dir)
+        generator.run_full_update()
+        self.assertTrue(generator.snapshot_file.exists())
+
+        with patch('roster_manager.json.load') as json_load:
+            catalog = RosterManager(self.data_dir).load_catalog()
+        json_load.assert_not_called()
+        self.assertEqual(len(catalog), len(self.players))
+
+    def test_stale_snapshot_ignored(self):
+        """Test a snapshot older than players.json is not used"""
+        generator = PlayoffRosterGenerator(self.data_dir)
+        generator.run_full_update()
+        players = dict(self.players)
+        players['extra'] = dict(players['1'], id='extra', name='Late Signing')
+        with open(generator.players_file, 'w') as f:
+            json.dump(players, f)
+
+        catalog = RosterManager(self.data_dir).load_catalog()
+
+        self.assertEqual(catalog['extra'].name, 'Late Signing')
+
+    def test_app_import_does_not_load_pandas(self):
+        """Test web workers start without importing pandas or numpy or starting logging"""
+        code = (
+            "import sys, app, logging_setup; "
+            "sys.exit('pandas' in sys.modules or 'numpy' in sys.modules or bool(logging_setup._state))"
+        )
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ, DATA_DIR=self.data_dir)
+
+        result = subprocess.run([sys.executable, '-c', code], cwd=repo_root, env=env)
+
+        self.assertEqual(result.returncode, 0)
+
+    def test_build_roster_table(self):
+        """Test the roster table stores one int32 row per roster"""
+        rosters = [
+            self.manager.create_roster('user_a', build_roster_data(self.players, offset))
+            for offset in range(3)
+        ]
+
+        table = self.manager.build_roster_table()
+
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table.nbytes, 3 * 11 * 4)
+        position = table.roster_ids.index(rosters[1].id)
+        catalog = self.manager.catalog
+        self.assertEqual(
+            [catalog.id_at(index) for index in table.row(position)],
+            [getattr(rosters[1], slot).id for slot in table.slots]
+        )
+        self.assertEqual(table.to_numpy().shape, (3, 11))
+
+    def test_rosters_carry_their_season(self):
+        """Test stored rosters record the season they were created for"""
+        roster = self.manager.create_roster('user_a', build_roster_data(self.players))
+        payload = self.manager.get_roster_payload(roster.id)
+
+        self.assertEqual(roster.season, self.manager.season)
+        self.assertEqual(roster_serialization.payload_season(payload), self.manager.season)
+        self.assertEqual(self.manager.get_roster(roster.id).season, self.manager.season)
+
+    def test_legacy_rosters_default_to_legacy_season(self):
+        """Test records written before seasons were tracked are upgraded"""
+        roster = self.manager.create_roster('user_a', build_roster_data(self.players))
+        data = json.loads(self.manager.get_roster_bytes(roster.id))
+        del data['schema_version'], data['season']
+        (self.manager.rosters_dir / f'{roster.id}.json').write_text(json.dumps(data))
+
+        payload = self.manager.get_roster_payload(roster.id)
+
+        self.assertEqual(roster_serialization.payload_season(payload), LEGACY_SEASON)
+
+    def test_other_seasons_use_their_own_catalog(self):
+        """Test old contests are interned outside the current catalog and evicted"""
+        roster = self.manager.create_roster('user_a', build_roster_data(self.players))
+        data = json.loads(self.manager.get_roster_bytes(roster.id))
+        for season in (2019, 2020, 2021):
+            old = dict(data, id=f'old-{season}', season=season)
+            (self.manager.rosters_dir / f'old-{season}.json').write_bytes(roster_serialization.dumps(old))
+
+        manager = RosterManager(self.data_dir, active_seasons=2)
+        current_size = manager.catalog.size
+        old_rosters = [manager.get_roster(f'old-{season}') for season in (2019, 2020, 2021)]
+
+        self.assertEqual(manager.catalog.size, current_size)
+        self.assertEqual([r.season for r in old_rosters], [2019, 2020, 2021])
+        self.assertIsNot(old_rosters[0].qb, manager.get_roster(roster.id).qb)
+        self.assertFalse(manager.seasons.is_loaded(2019))
+        self.assertTrue(manager.seasons.is_loaded(2021))
+        self.assertEqual(manager.ownership.snapshot()['total_rosters'], 1)
+        self.assertEqual(len(list(manager.iter_rosters(2020))), 1)
+
+    def test_season_archive_loaded_lazily(self):
+        """Test a past season's archived catalog is only read when first used"""
+        csv_path = os.path.join(self.data_dir, '2023_playoff_players.csv')
+        with open(csv_path, 'w') as f:
+            f.write(PLAYERS_2023_CSV)
+        generator = PlayoffRosterGenerator(self.data_dir, season=2023)
+        players = generator.load_players_csv(csv_path)
+        generator.seasons.publish(2023, players)
+        manager = RosterManager(self.data_dir, season=2024)
+
+        self.assertFalse(manager.seasons.is_loaded(2023))
+        catalog = manager.catalog_for(2023)
+
+        self.assertEqual(catalog['KC_QB1'].name, 'Patrick Mahomes')
+        self.assertEqual(catalog['SF_DEF'].position, 'DEF')
+        self.assertIn(2023, manager.seasons.seasons())
+
+if __name__ == '__main__':
+    unittest.main()
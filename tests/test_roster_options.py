@@ -0,0 +1,137 @@
+import unittest
+import random
+import shutil
+import tempfile
+import time
+import app as app_module
+from league_rules import LeagueFormat, SlotRule, get_format
+from player_catalog import Player
+from roster_manager import RosterManager
+from roster_options import RosterOptionsIndex, perfect_matching
+from tests.fixtures import build_roster_data, seed_players
+
+SMALL_FORMAT = LeagueFormat('small', [
+    SlotRule('qb', 'QB', ('QB',)),
+    SlotRule('rb', 'RB', ('RB',)),
+    SlotRule('flex', 'FLEX', ('RB', 'WR')),
+    SlotRule('wr', 'WR', ('WR',))
+])
+
+def completable(league_format, players, picks):
+    """Brute-force check that picks (slot -> Player) can be finished legally"""
+    open_slots = [slot for slot in league_format.slots if slot not in picks]
+    if not open_slots:
+        return True
+    slot = open_slots[0]
+    teams = {p.team for p in picks.values()}
+    for player in players:
+        if player in picks.values() or player.team in teams:
+            continue
+        if league_format.is_eligible(player.position, slot):
+            if completable(league_format, players, dict(picks, **{slot: player})):
+                return True
+    return False
+
+class TestRosterOptionsIndex(unittest.TestCase):
+    def test_perfect_matching(self):
+        """Test matching re-seats earlier slots when needed"""
+        self.assertIsNotNone(perfect_matching([0b011, 0b001]))
+        self.assertIsNone(perfect_matching([0b001, 0b001]))
+        self.assertEqual(perfect_matching([]), {})
+
+    def test_matches_brute_force(self):
+        """Test options equal an exhaustive search on small random catalogs"""
+        rng = random.Random(7)
+        for _ in range(40):
+            players = [
+                Player(str(i), f'P{i}', rng.choice(['QB', 'RB', 'WR']), rng.choice('ABCDE'))
+                for i in range(rng.randint(4, 9))
+            ]
+            index = RosterOptionsIndex(SMALL_FORMAT, players)
+            first = rng.choice(players)
+            slot = next((s for s in SMALL_FORMAT.slots if SMALL_FORMAT.is_eligible(first.position, s)))
+            picks = {slot: first}
+
+            result = index.options({slot: first.id})
+
+            self.assertEqual(result['feasible'], completable(SMALL_FORMAT, players, picks))
+            for open_slot, player_ids in result['options'].items():
+                expected = [
+                    p.id for p in index.slot_players[SMALL_FORMAT.slot_index[open_slot]]
+                    if p is not first and p.team != first.team
+                    and completable(SMALL_FORMAT, players, dict(picks, **{open_slot: p}))
+                ]
+                self.assertEqual(player_ids, expected)
+
+    def test_pick_that_strands_a_slot(self):
+        """Test a pick is excluded when it takes the last team able to fill another slot"""
+        players = [
+            Player('q1', 'QB A', 'QB', 'A'),
+            Player('r1', 'RB A', 'RB', 'A'),
+            Player('r2', 'RB B', 'RB', 'B'),
+            Player('w1', 'WR C', 'WR', 'C'),
+            Player('w2', 'WR B', 'WR', 'B'),
+            Player('w3', 'WR D', 'WR', 'D'),
+        ]
+        index = RosterOptionsIndex(SMALL_FORMAT, players)
+
+        result = index.options({'qb': 'q1'})
+
+        self.assertTrue(result['feasible'])
+        # With A taken, RB must be B, so neither FLEX nor WR can use B
+        self.assertEqual(result['options']['rb'], ['r2'])
+        self.assertEqual(result['options']['flex'], ['w1', 'w3'])
+        self.assertEqual(result['options']['wr'], ['w1', 'w3'])
+
+    def test_invalid_partial(self):
+        """Test picks that already break a rule are rejected"""
+        index = RosterOptionsIndex(SMALL_FORMAT, [Player('r1', 'RB A', 'RB', 'A')])
+        with self.assertRaises(ValueError):
+            index.options({'qb': 'r1'})
+
+    def test_options_speed(self):
+        """Test a full-size catalog answers within a few milliseconds"""
+        from benchmarks.load_test import generate_players, random_roster
+        players = generate_players(700)
+        index = RosterOptionsIndex(get_format(), [Player(**p) for p in players.values()])
+        roster = random_roster(players, random.Random(1))
+        partial = {slot: roster[slot] for slot in ('qb', 'rb1', 'wr1', 'flex')}
+
+        start = time.perf_counter()
+        result = index.options(partial)
+        self.assertLess(time.perf_counter() - start, 0.02)
+        self.assertTrue(result['feasible'])
+
+class TestRosterOptionsEndpoint(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+        app_module.roster_manager = RosterManager(self.data_dir)
+        self.client = app_module.app.test_client()
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_options_endpoint(self):
+        """Test open slots list players and picked teams are excluded"""
+        roster_data = build_roster_data(self.players)
+        qb = self.players[roster_data['qb']]
+
+        response = self.client.post('/api/roster/options', json={'qb': qb['id'], 'rb1': ''})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertTrue(data['feasible'])
+        self.assertNotIn('qb', data['options'])
+        for player_ids in data['options'].values():
+            self.assertTrue(player_ids)
+            self.assertNotIn(qb['team'], {self.players[p]['team'] for p in player_ids})
+
+    def test_options_endpoint_rejects_invalid_pick(self):
+        """Test an ineligible pick returns 400"""
+        roster_data = build_roster_data(self.players)
+        response = self.client.post('/api/roster/options', json={'qb': roster_data['kicker']})
+        self.assertEqual(response.status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
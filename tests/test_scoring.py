@@ -0,0 +1,211 @@
+import unittest
+import shutil
+import tempfile
+import time
+import numpy as np
+import app as app_module
+from event_hub import EventHub
+from player_catalog import PlayerCatalog, RosterTable
+from roster_manager import RosterManager
+from roster_serialization import DEFAULT_LEAGUE
+from response_cache import ResponseCache
+from scoring import (
+    STAT_CATEGORIES, RosterScorer, ScoringError, StatMatrix, compile_scoring, get_scoring
+)
+from tests.fixtures import build_roster_data, seed_players
+from tests.test_event_hub import parse_event
+
+LINE = {'rec': 8, 'rec_yd': 112, 'rec_td': 1, 'fumble_lost': 1}
+
+class TestScoringSettings(unittest.TestCase):
+    def test_reception_weights(self):
+        """Test the same stat line scores differently under each setting"""
+        points = {name: get_scoring(name).points(LINE) for name in ('standard', 'half_ppr', 'ppr')}
+
+        self.assertAlmostEqual(points['standard'], 15.2)
+        self.assertAlmostEqual(points['half_ppr'], 19.2)
+        self.assertAlmostEqual(points['ppr'], 23.2)
+        self.assertEqual(len(get_scoring('ppr').vector), len(STAT_CATEGORIES))
+
+    def test_malformed_settings(self):
+        """Test unknown categories, cycles and unknown names raise ScoringError"""
+        with self.assertRaises(ScoringError):
+            compile_scoring({'scoring_settings': {'odd': {'tackles': 1}}})
+        with self.assertRaises(ScoringError):
+            compile_scoring({'scoring_settings': {'a': {'extends': 'b'}, 'b': {'extends': 'a'}}})
+        with self.assertRaises(ScoringError):
+            get_scoring('missing')
+
+class TestRosterScorer(unittest.TestCase):
+    def _random_table(self, players: int, rosters: int):
+        rng = np.random.default_rng(0)
+        catalog = PlayerCatalog()
+        for i in range(players):
+            catalog.index_of(f'p{i}')
+        table = RosterTable(catalog)
+        for i in range(rosters):
+            table.append(f'r{i}', [f'p{j}' for j in rng.integers(0, players, size=table.width)])
+        stats = StatMatrix(catalog, rng.integers(0, 50, size=(players, len(STAT_CATEGORIES))).astype(float))
+        return table, stats
+
+    def test_matches_per_player_scoring(self):
+        """Test matrix totals equal summing each player's stat line"""
+        table, stats = self._random_table(40, 25)
+        settings = get_scoring('half_ppr')
+
+        totals = RosterScorer(table, settings).score(stats)
+
+        for position in (0, 12, 24):
+            expected = sum(
+                settings.points(stats.get(table.catalog.id_at(index)))
+                for index in table.row(position)
+            )
+            self.assertAlmostEqual(totals[position], expected)
+
+    def test_correction_reports_changed_rosters(self):
+        """Test a stat correction returns only rosters holding the player"""
+        table, stats = self._random_table(40, 200)
+        scorer = RosterScorer(table, get_scoring('ppr'))
+        scorer.score(stats)
+        before = scorer.scores()
+
+        changed = scorer.apply_correction(stats, {'p3': {'rec': stats.get('p3')['rec'] + 2}})
+
+        holders = {
+            table.roster_ids[i] for i in range(len(table))
+            if table.catalog.index_of('p3') in table.row(i)
+        }
+        self.assertEqual(set(changed), holders)
+        for roster_id, total in changed.items():
+            self.assertGreaterEqual(total - before[roster_id], 2 - 1e-6)
+
+    def test_new_players_score_zero(self):
+        """Test players indexed after the stat matrix was built score nothing"""
+        table, stats = self._random_table(10, 5)
+        table.append('late', ['new_player'] * table.width)
+
+        totals = RosterScorer(table, get_scoring()).score(stats)
+
+        self.assertEqual(totals[-1], 0.0)
+
+    def test_full_rescore_100k_rosters(self):
+        """Test rescoring 100k rosters after a correction takes well under a second"""
+        table, stats = self._random_table(700, 100000)
+        scorer = RosterScorer(table, get_scoring('ppr'))
+        scorer.score(stats)
+
+        start = time.perf_counter()
+        scorer.apply_correction(stats, {'p1': {'pass_td': 9}})
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+class TestManagerScoring(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_roster_scorer_uses_league_settings(self):
+        """Test a manager scores its stored rosters with its scoring settings"""
+        manager = RosterManager(self.data_dir, durable=False, scoring='ppr')
+        roster = manager.create_roster('user_a', build_roster_data(self.players))
+        stats = StatMatrix.from_records(manager.catalog, [dict(LINE, player_id=roster.wr1.id)])
+
+        scorer = manager.roster_scorer()
+        scorer.score(stats)
+
+        self.assertEqual(scorer.scores(), {roster.id: 23.2})
+
+class TestLiveScoreStream(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+        app_module.roster_manager = RosterManager(self.data_dir)
+        app_module.response_cache = ResponseCache(max_entries=8)
+        app_module.fragment_cache = ResponseCache(max_entries=8)
+        self.saved_hub = app_module.event_hub
+        app_module.event_hub = EventHub(tick=3600, heartbeat=0.01)
+        app_module._live_scores.clear()
+        self.saved_key = app_module.STATS_API_KEY
+        app_module.STATS_API_KEY = 'feed-key'
+        self.client = app_module.app.test_client()
+        self.roster = app_module.roster_manager.create_roster('user_a', build_roster_data(self.players))
+
+    def tearDown(self):
+        app_module.STATS_API_KEY = self.saved_key
+        app_module.event_hub = self.saved_hub
+        app_module._live_scores.clear()
+        shutil.rmtree(self.data_dir)
+
+    def _post(self, records, key='feed-key'):
+        return self.client.post('/api/stats', json={'stats': records}, headers={'X-Stats-Key': key})
+
+    def _next_event(self, stream):
+        message = next(stream)
+        while not message.startswith('event:'):
+            message = next(stream)
+        return parse_event(message)
+
+    def test_correction_reaches_stream(self):
+        """Test posted stats and a later correction are pushed to stream subscribers"""
+        hub = app_module.event_hub
+        stream = hub.stream(hub.subscribe([self.roster.id], league_id=DEFAULT_LEAGUE))
+        wr1 = self.roster.wr1.id
+
+        response = self._post([dict(LINE, player_id=wr1)])
+        self.assertEqual(response.get_json()['changed'], 1)
+        hub.flush()
+        event, data = self._next_event(stream)
+        self.assertEqual(event, 'update')
+        self.assertEqual(data['scores'], {self.roster.id: 15.2})
+        self.assertEqual(data['ranks'][self.roster.id]['rank'], 1)
+
+        self._post([{'player_id': wr1, 'rec_td': 2}])
+        hub.flush()
+        event, data = self._next_event(stream)
+        self.assertEqual(data['scores'], {self.roster.id: 21.2})
+
+    def test_stream_unknown_league(self):
+        """Test subscribing to a league that does not exist is a 404"""
+        self.assertEqual(self.client.get('/api/stream?league=missing').status_code, 404)
+
+    def test_invalid_stats(self):
+        """Test malformed bodies and values are rejected"""
+        wr1 = self.roster.wr1.id
+        self.assertEqual(self._post([{'rec': 1}]).status_code, 400)
+        self.assertEqual(self._post([{'player_id': wr1, 'rec': 'many'}]).status_code, 400)
+        self.assertEqual(self._post([{'player_id': wr1, 'rec': 'nan'}]).status_code, 400)
+        self.assertEqual(self._post([{'player_id': wr1, 'rec_yd': float('inf')}]).status_code, 400)
+
+    def test_unknown_players_not_registered(self):
+        """Test made-up player ids are refused without growing the catalog"""
+        catalog = app_module.roster_manager.catalog
+        size = catalog.size
+
+        response = self._post([{'player_id': f'fake-{i}', 'rec': 1} for i in range(50)])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(catalog.size, size)
+
+    def test_bad_record_leaves_batch_unapplied(self):
+        """Test one bad record rejects the whole batch, including valid records before it"""
+        wr1 = self.roster.wr1.id
+        self._post([dict(LINE, player_id=wr1)])
+
+        response = self._post([{'player_id': wr1, 'rec': 20}, {'player_id': wr1, 'rec_yd': 'nan'}])
+
+        self.assertEqual(response.status_code, 400)
+        live = app_module._live_scores[app_module.roster_manager.league_id]
+        self.assertEqual(live.stats.get(wr1)['rec'], LINE['rec'])
+
+    def test_key_required(self):
+        """Test posts are refused without a configured key or with a wrong one"""
+        record = [dict(LINE, player_id=self.roster.wr1.id)]
+        self.assertEqual(self._post(record, key='wrong').status_code, 403)
+
+        app_module.STATS_API_KEY = None
+        self.assertEqual(self._post(record).status_code, 403)
+
+if __name__ == '__main__':
+    unittest.main()
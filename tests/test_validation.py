@@ -0,0 +1,92 @@
+import unittest
+from data_import.api.validation import (
+    ValidationError, validate_player_data, validate_players, validate_teams
+)
+
+def player_record(i, position='wr'):
+    return {'id': str(i), 'fullName': f'Player {i}', 'position': position, 'teamId': 'KC', 'age': 25}
+
+class TestBatchValidation(unittest.TestCase):
+    def test_single_record_still_raises(self):
+        """Test the per-record validator keeps raising on bad input"""
+        with self.assertRaises(ValidationError):
+            validate_player_data(player_record(1, position='P'))
+
+    def test_bad_records_are_reported_not_raised(self):
+        """Test one bad record does not lose the rest of the batch"""
+        records = [player_record(1), {'id': '2', 'position': 'QB'}, player_record(3, 'P'), 'junk', player_record(4)]
+
+        report = validate_players(records)
+
+        self.assertFalse(report.ok)
+        self.assertEqual([r['id'] for r in report.records], ['1', '4'])
+        self.assertEqual([(e.index, e.record_id, e.field) for e in report.errors], [
+            (1, '2', 'fullName'), (2, '3', 'position'), (3, None, '')
+        ])
+
+    def test_one_timestamp_per_batch(self):
+        """Test every record of a batch shares last_updated"""
+        report = validate_players([player_record(i) for i in range(50)])
+        self.assertEqual(len({r['last_updated'] for r in report.records}), 1)
+        self.assertEqual(report.records[0]['position'], 'WR')
+
+    def test_columnar_result(self):
+        """Test columnar batches match the records and build a typed frame"""
+        report = validate_players([player_record(1), player_record(2, 'qb')], columnar=True)
+
+        self.assertEqual(report.columns['position'], ['WR', 'QB'])
+        self.assertEqual(report.columns['jersey_number'], [None, None])
+        frame = report.to_frame()
+        self.assertEqual(str(frame['position'].dtype), 'category')
+        self.assertEqual(str(frame['age'].dtype), 'Int64')
+
+    def test_team_columns_flatten_record(self):
+        """Test team columns carry wins, losses and ties"""
+        teams = [{'id': '1', 'name': 'Chiefs', 'abbreviation': 'KC', 'record': {'wins': 11, 'losses': 6}}]
+
+        report = validate_teams(teams, columnar=True)
+
+        self.assertEqual(report.records[0]['win_loss_record']['wins'], 11)
+        self.assertEqual(report.columns['losses'], [6])
+        self.assertEqual(report.to_frame()['ties'].tolist(), [0])
+        self.assertEqual(validate_teams(teams).to_frame()['wins'].tolist(), [11])
+
+    def test_wrongly_typed_fields_are_reported(self):
+        """Test fields of the wrong type reject their record, not the batch"""
+        players = [player_record(1), dict(player_record(2), position=7), player_record(3)]
+        team = {'id': '1', 'name': 'Chiefs', 'abbreviation': 'KC'}
+        teams = [
+            dict(team, venue='Arrowhead'), dict(team, id='2', headCoach=['Reid']),
+            dict(team, id='3', record=[11, 6]), dict(team, id='4', venue={'name': 'Arrowhead'})
+        ]
+
+        player_report = validate_players(players)
+        team_report = validate_teams(teams, columnar=True)
+
+        self.assertEqual([r['id'] for r in player_report.records], ['1', '3'])
+        self.assertEqual([(e.record_id, e.field) for e in player_report.errors], [('2', 'position')])
+        self.assertEqual([r['venue'] for r in team_report.records], ['Arrowhead'])
+        self.assertEqual([(e.record_id, e.field) for e in team_report.errors], [
+            ('1', 'venue'), ('2', 'headCoach'), ('3', 'record')
+        ])
+
+    def test_unexpected_errors_are_reported(self):
+        """Test a record whose values break normalization is reported with the rest kept"""
+        teams = [
+            {'id': '1', 'name': 'Chiefs', 'abbreviation': 'KC', 'record': {'wins': 11}},
+            {'id': '2', 'name': 'Bills', 'abbreviation': 'BUF', 'record': {'wins': 11}}
+        ]
+
+        class Exploding(dict):
+            def get(self, *args):
+                raise TypeError('bad value')
+
+        teams[0]['record'] = Exploding(wins=1)
+        report = validate_teams(teams)
+
+        self.assertEqual([r['id'] for r in report.records], ['2'])
+        self.assertEqual(report.errors[0].record_id, '1')
+        self.assertIn('bad value', report.errors[0].message)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+import roster_serialization
+from roster_manager import RosterManager
+from write_ahead_log import WriteAheadLog, WriteAheadLogError
+from tests.fixtures import build_roster_data, seed_players
+
+class TestWriteAheadLog(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.wal_path = Path(self.data_dir) / 'test.wal'
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_concurrent_appends_share_fsyncs(self):
+        """Test group commit batches fsyncs across concurrent writers"""
+        wal = WriteAheadLog(self.wal_path)
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            threading.Event().wait(0.005)
+            real_fsync(fd)
+
+        with patch('write_ahead_log.os.fsync', side_effect=slow_fsync) as fsync:
+            threads = [
+                threading.Thread(target=wal.append, args=(b'{"n":%d}' % i,))
+                for i in range(50)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(list(wal.replay())), 50)
+        self.assertLess(fsync.call_count, 50)
+
+    def test_torn_tail_ignored(self):
+        """Test a partially written last record is not replayed"""
+        wal = WriteAheadLog(self.wal_path)
+        wal.append(b'{"n":1}')
+        wal.append(b'{"n":2}')
+        wal.close()
+        with open(self.wal_path, 'ab') as f:
+            f.write(b'0000abcd {"n":')
+
+        records = list(WriteAheadLog(self.wal_path).replay())
+
+        self.assertEqual(records, [b'{"n":1}', b'{"n":2}'])
+
+    def test_append_after_torn_tail(self):
+        """Test records appended after a torn write replay with the ones before it"""
+        wal = WriteAheadLog(self.wal_path)
+        wal.append(b'{"n":1}')
+        wal.append(b'{"n":2}')
+        wal.close()
+        os.truncate(self.wal_path, self.wal_path.stat().st_size - 4)
+
+        wal = WriteAheadLog(self.wal_path)
+        wal.append(b'{"n":3}')
+
+        self.assertEqual(list(wal.replay()), [b'{"n":1}', b'{"n":3}'])
+
+    def test_failed_write_rolled_back(self):
+        """Test a batch whose write fails leaves nothing behind for later appends"""
+        wal = WriteAheadLog(self.wal_path)
+        wal.append(b'{"n":1}')
+
+        with patch('write_ahead_log.os.fsync', side_effect=OSError('disk full')):
+            with self.assertRaises(WriteAheadLogError):
+                wal.append(b'{"n":2}')
+        wal.append(b'{"n":3}')
+
+        self.assertEqual(list(wal.replay()), [b'{"n":1}', b'{"n":3}'])
+
+class TestRosterRecovery(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.players = seed_players(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_logged_roster_restored_on_startup(self):
+        """Test a roster logged before a crash is written on the next start"""
+        manager = RosterManager(self.data_dir)
+        roster = manager.create_roster('user_a', build_roster_data(self.players))
+        roster_file = manager.rosters_dir / f'{roster.id}.json'
+        payload = roster_file.read_bytes()
+
+        # Simulate a crash after the log append but before the file write
+        roster_file.unlink()
+        manager.wal.append(payload)
+        (manager.rosters_dir / f'.{roster.id}.json.1.1.tmp').write_bytes(payload[:20])
+
+        recovered = RosterManager(self.data_dir)
+
+        self.assertEqual(recovered.get_roster_bytes(roster.id), payload)
+        self.assertEqual(recovered.ownership.snapshot()['total_rosters'], 1)
+        self.assertEqual(list(recovered.rosters_dir.glob('.*.tmp')), [])
+        self.assertEqual(recovered.wal.size, 0)
+
+    def test_unreadable_roster_skipped(self):
+        """Test a corrupt legacy file does not break listing other rosters"""
+        manager = RosterManager(self.data_dir)
+        manager.create_roster('user_a', build_roster_data(self.players))
+        (manager.rosters_dir / 'torn.json').write_text('{"id": "torn", "play')
+
+        payloads = list(manager.iter_roster_payloads())
+
+        self.assertEqual(len(payloads), 1)
+        self.assertEqual(roster_serialization.loads(payloads[0])['user_id'], 'user_a')
+
+    def test_torn_roster_file_rewritten(self):
+        """Test a roster file left empty or torn by a crash is restored from the log"""
+        manager = RosterManager(self.data_dir)
+        first = manager.create_roster('user_a', build_roster_data(self.players))
+        second = manager.create_roster('user_b', build_roster_data(self.players, offset=1))
+        files = [manager.rosters_dir / f'{roster.id}.json' for roster in (first, second)]
+        payloads = [path.read_bytes() for path in files]
+
+        files[0].write_bytes(b'')
+        files[1].write_bytes(payloads[1][:30])
+
+        recovered = RosterManager(self.data_dir)
+
+        self.assertEqual([path.read_bytes() for path in files], payloads)
+        self.assertEqual(recovered.ownership.snapshot()['total_rosters'], 2)
+
+    def test_roster_files_synced_before_rename(self):
+        """Test a durable store fsyncs each roster file as well as the log"""
+        manager = RosterManager(self.data_dir)
+        with patch('os.fsync') as fsync:
+            manager.create_roster('user_a', build_roster_data(self.players))
+        # One for the log record, one for the roster file
+        self.assertEqual(fsync.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+class WriteAheadLogError(Exception):
+    pass
+
+class _Batch:
+    __slots__ = ('records', 'done', 'error')
+
+    def __init__(self):
+        self.records: List[bytes] = []
+        self.done = False
+        self.error = None
+
+def read_records(path) -> List[bytes]:
+    """Intact records of the log at path, without opening it for writing"""
+    try:
+        with open(path, 'rb') as f:
+            return WriteAheadLog._scan(f.read())[0]
+    except FileNotFoundError:
+        return []
+
+class WriteAheadLog:
+    """Append-only, checksummed record log with group commit
+
+    Each record is one line: an 8-digit hex CRC32, a space, the payload and a
+    newline. Concurrent appenders are batched: the first waiting thread writes
+    every queued record and issues a single fsync for the whole batch, and the
+    others return once their batch is durable. An flock serializes writers in
+    other processes sharing the same log.
+
+    A write that fails part way is cut off again, and a torn tail left by a
+    crash is cut off on open, so later appends always follow the last
+    intact record.
+    """
+
+    def __init__(self, path, sync: bool = True):
+        self.path = Path(path)
+        self.sync = sync
+        self._cond = threading.Condition()
+        self._batch = _Batch()
+        self._flushing = False
+        # Unbuffered, so bytes of a failed write cannot be flushed later
+        self._file = open(self.path, 'ab', buffering=0)
+        self._lock_file()
+        try:
+            with open(self.path, 'rb') as f:
+                data = f.read()
+            end = self._scan(data)[1]
+            if end < len(data):
+                self._file.truncate(end)
+        finally:
+            self._unlock_file()
+
+    @staticmethod
+    def _encode(payload: bytes) -> bytes:
+        if b'\n' in payload:
+            raise WriteAheadLogError('Records must not contain newlines')
+        return b'%08x %s\n' % (zlib.crc32(payload), payload)
+
+    def append(self, payload: bytes):
+        """Append a record and return once it is durable"""
+        line = self._encode(payload)
+        with self._cond:
+            batch = self._batch
+            batch.records.append(line)
+            while not batch.done:
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                # Become the leader and commit everything queued so far
+                self._flushing = True
+                leading, self._batch = self._batch, _Batch()
+                self._cond.release()
+                try:
+                    self._commit(leading.records)
+                except OSError as e:
+                    leading.error = e
+                finally:
+                    self._cond.acquire()
+                    leading.done = True
+                    self._flushing = False
+                    self._cond.notify_all()
+        if batch.error is not None:
+            raise WriteAheadLogError(f'Failed to write log: {batch.error}')
+
+    def _lock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _commit(self, records: List[bytes]):
+        self._lock_file()
+        try:
+            start = os.fstat(self._file.fileno()).st_size
+            try:
+                view = memoryview(b''.join(records))
+                while view:
+                    view = view[self._file.write(view):]
+                if self.sync:
+                    os.fsync(self._file.fileno())
+            except OSError:
+                # None of the batch was acknowledged; drop whatever part of it landed
+                try:
+                    self._file.truncate(start)
+                except OSError:
+                    pass
+                raise
+        finally:
+            self._unlock_file()
+
+    @staticmethod
+    def _scan(data: bytes) -> Tuple[List[bytes], int]:
+        """Intact records at the start of data, and the offset just past the last one"""
+        records = []
+        end = 0
+        for line in data.split(b'\n')[:-1]:
+            checksum, _, payload = line.partition(b' ')
+            try:
+                valid = int(checksum, 16) == zlib.crc32(payload)
+            except ValueError:
+                valid = False
+            if not valid:
+                # A torn write can only be the tail; nothing after it was acknowledged
+                break
+            records.append(payload)
+            end += len(line) + 1
+        return records, end
+
+    def _read_records(self) -> List[bytes]:
+        return read_records(self.path)
+
+    def replay(self) -> Iterator[bytes]:
+        """Yield every intact record in append order"""
+        return iter(self._read_records())
+
+    @property
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+    def checkpoint(self, apply):
+        """Apply every logged record, make the results durable, then empty the log
+
+        apply is called with the list of record payloads and must leave each
+        one materialized; it may be called for records already applied.
+        """
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self._flushing = True
+        try:
+            self._lock_file()
+            try:
+                records = self._read_records()
+                if records:
+                    apply(records)
+                    if self.sync and hasattr(os, 'sync'):
+                        os.sync()
+                self._file.truncate(0)
+            finally:
+                self._unlock_file()
+        finally:
+            with self._cond:
+                self._flushing = False
+                self._cond.notify_all()
+
+    def close(self):
+        self._file.close()